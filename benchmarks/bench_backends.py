@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк реализаций пакетной генерации: чистый Python и NumPy.
+
+Пример использования:
+    python benchmarks/bench_backends.py --count 1000000 --length 16
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from passgen import numpy_backend  # noqa: E402
+from passgen.generator import PasswordGenerator  # noqa: E402
+from passgen.policy import get_policy  # noqa: E402
+
+
+def main():
+    """Запускает бенчмарк и печатает результаты."""
+    parser = argparse.ArgumentParser(description='Бенчмарк реализаций')
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--length', type=int, default=16)
+    parser.add_argument('--min-digits', type=int, default=None)
+    args = parser.parse_args()
+
+    policy = get_policy(args.length, min_digits=args.min_digits)
+    backends = ['python']
+    if numpy_backend.is_available():
+        backends.append('numpy')
+    else:
+        print("NumPy не установлен, измеряется только python")
+
+    for backend in backends:
+        generator = PasswordGenerator(backend=backend)
+        start = time.perf_counter()
+        total = sum(len(batch) for batch in
+                    generator.iter_batches(args.count, policy=policy))
+        rate = total / (time.perf_counter() - start)
+        print(f"{backend:>7}: {rate:>12,.0f} паролей/с")
+
+
+if __name__ == '__main__':
+    main()
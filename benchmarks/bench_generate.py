@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пакетной генерации паролей.
+
+Сравнивает скорость generate_password в цикле и generate_batch.
+
+Пример использования:
+    python benchmarks/bench_generate.py --count 200000 --length 16
+    python benchmarks/bench_generate.py --seed 42
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from passgen.generator import PasswordGenerator  # noqa: E402
+from passgen.random_source import SeededRandomSource  # noqa: E402
+
+
+def measure(func, count):
+    """Возвращает количество паролей в секунду для функции.
+
+    Args:
+        func (callable): Функция, генерирующая count паролей.
+        count (int): Количество паролей.
+
+    Returns:
+        float: Паролей в секунду.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def main():
+    """Запускает бенчмарк и печатает результаты."""
+    parser = argparse.ArgumentParser(description='Бенчмарк генерации')
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--length', type=int, default=16)
+    parser.add_argument('--seed',
+                        type=int,
+                        help='Зерно детерминированного источника для '
+                             'воспроизводимых прогонов'
+                        )
+    args = parser.parse_args()
+
+    source = None
+    if args.seed is not None:
+        source = SeededRandomSource(args.seed)
+    generator = PasswordGenerator(source=source)
+    single_count = min(args.count, 20000)
+
+    single = measure(
+        lambda: [generator.generate_password(length=args.length)
+                 for _ in range(single_count)],
+        single_count
+    )
+    batch = measure(
+        lambda: generator.generate_batch(args.count, length=args.length),
+        args.count
+    )
+
+    print(f"generate_password: {single:,.0f} паролей/с")
+    print(f"generate_batch:    {batch:,.0f} паролей/с")
+
+
+if __name__ == '__main__':
+    main()
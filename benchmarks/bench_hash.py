@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пакетного хэширования паролей.
+
+Сравнивает последовательный цикл hash_password с hash_many для 1..N
+потоков.
+
+Пример использования:
+    python benchmarks/bench_hash.py --count 64 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from passgen.kdf import get_kdf  # noqa: E402
+from passgen.utils import hash_many, hash_password  # noqa: E402
+
+
+def main():
+    """Запускает бенчмарк и печатает кривую масштабирования."""
+    parser = argparse.ArgumentParser(description='Бенчмарк хэширования')
+    parser.add_argument('--count', type=int, default=64)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    kdf = get_kdf()
+    passwords = [f"password_{i}" for i in range(args.count)]
+
+    start = time.perf_counter()
+    for password in passwords:
+        hash_password(password, kdf)
+    baseline = args.count / (time.perf_counter() - start)
+    print(f"{kdf!r}\nцикл:          {baseline:>10,.1f} хэшей/с")
+
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        hash_many(passwords, workers=workers, kdf=kdf)
+        rate = args.count / (time.perf_counter() - start)
+        print(f"{workers:>3} потоков:   {rate:>10,.1f} хэшей/с "
+              f"(x{rate / baseline:.2f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк масштабирования параллельной генерации паролей.
+
+Измеряет скорость iter_batches_parallel для 1..N процессов.
+
+Пример использования:
+    python benchmarks/bench_parallel.py --count 2000000 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from passgen.parallel import iter_batches_parallel  # noqa: E402
+
+
+def main():
+    """Запускает бенчмарк и печатает кривую масштабирования."""
+    parser = argparse.ArgumentParser(description='Бенчмарк процессов')
+    parser.add_argument('--count', type=int, default=2000000)
+    parser.add_argument('--length', type=int, default=16)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        total = sum(len(batch) for batch in iter_batches_parallel(
+            args.count, workers=workers, length=args.length
+        ))
+        rate = total / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{workers:>3} процессов: {rate:>12,.0f} паролей/с "
+              f"(x{rate / baseline:.2f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,19 +7,46 @@
 в модуль commands.
 
 Примеры использования:
+    python main.py migrate
     python main.py generate --length 16
+    python main.py generate --length 16 --min-digits 3 --min-special 2
+    python main.py generate --min-entropy 80 --score
+    python main.py generate --length 16 --exclude-ambiguous
+    python main.py generate --length 32 --alphabet 0123456789abcdef
+    python main.py generate --length 16 --count 1000
+    python main.py generate --passphrase --words 6 --wordlist words.txt
+    python main.py generate --pronounceable --length 14
+    python main.py generate --pattern "Cvcc-dddd-ssss" --count 100
+    python main.py generate --token 256 --encoding z85 --count 1000
+    python main.py generate --count 1000000 --output pass.csv --format csv
+    python main.py generate --count 10000000 --output pass.txt --workers 8
+    python main.py generate --count 10000000 --output pass.txt --backend numpy
+    python main.py generate --length 6 --count 100000 --unique
     python main.py generate --save --service gmail --username user@example.com
+    python main.py import --format csv accounts.csv
+    python main.py import --format jsonl --batch-size 5000 accounts.jsonl
+    python main.py export --format csv --output accounts.csv
     python main.py find --service gmail
+    python main.py find --username user@example.com --match exact
     python main.py list
     python main.py verify --service gmail --username user --password "pass123"
     python main.py delete --service gmail --username user
+    python main.py calibrate --target-ms 50
+    python main.py stats
+    python main.py rehash-migrate --batch-size 10000
 
 Доступные команды:
+    migrate   - Применить миграции схемы базы данных
     generate  - Генерация нового пароля
+    import    - Импорт паролей из файла
+    export    - Выгрузка записей в файл
     find      - Поиск сохраненных паролей
     list      - Показать все пароли
     verify    - Проверить пароль
     delete    - Удалить пароль
+    calibrate - Подобрать параметры хэширования
+    stats     - Статистика хранилища
+    rehash-migrate - Поставить устаревшие хэши в очередь на смену
 """
 
 import argparse
@@ -29,8 +56,21 @@ from passgen.commands import (
     handle_find,
     handle_list,
     handle_verify,
-    handle_delete
+    handle_delete,
+    handle_calibrate,
+    handle_stats,
+    handle_rehash_migrate,
+    handle_migrate,
+    handle_import,
+    handle_export
 )
+from passgen.dedupe import DEFAULT_EXACT_LIMIT
+from passgen.generator import BACKENDS
+from passgen.kdf import KDF_BACKENDS
+from passgen.output import OUTPUT_FORMATS
+from passgen.records import IMPORT_BATCH_SIZE, RECORD_FORMATS
+from passgen.storage import MATCH_MODES, REHASH_BATCH_SIZE
+from passgen.tokens import TOKEN_ENCODINGS
 
 
 def main():
@@ -48,11 +88,31 @@ def main():
         epilog="""
 Примеры использования:
   python main.py generate --length 16 --no-special --no-digits --no-uppercase
+  python main.py generate --length 16 --min-digits 3 --min-special 2
+  python main.py generate --min-entropy 80 --score
+  python main.py generate --length 16 --exclude-ambiguous
+  python main.py generate --length 32 --alphabet 0123456789abcdef
+  python main.py generate --length 16 --count 1000
+  python main.py generate --passphrase --words 6 --wordlist words.txt
+  python main.py generate --pronounceable --length 14
+  python main.py generate --pattern "Cvcc-dddd-ssss" --count 100
+  python main.py generate --token 256 --encoding z85 --count 1000
+  python main.py generate --count 1000000 --output pass.csv --format csv
+  python main.py generate --count 10000000 --output pass.txt --workers 8
+  python main.py generate --count 10000000 --output pass.txt --backend numpy
+  python main.py generate --length 6 --count 100000 --unique
   python main.py generate --length 12 --save --service gmail --username user
+  python main.py import --format jsonl --batch-size 5000 accounts.jsonl
+  python main.py export --format csv --output accounts.csv
   python main.py find --service gmail
+  python main.py find --username user@example.com --match exact
   python main.py list
   python main.py verify --service gmail --username user --password "my_pass"
   python main.py delete --service gmail --username user
+  python main.py calibrate --target-ms 50 --kdf pbkdf2 --write
+  python main.py stats
+  python main.py rehash-migrate --batch-size 10000
+  python main.py migrate --status
         """
     )
 
@@ -69,6 +129,42 @@ def main():
                                  default=12,
                                  help='Длина пароля (по умолчанию: 12)'
                                  )
+    generate_parser.add_argument('--count',
+                                 type=int,
+                                 default=1,
+                                 help='Количество паролей (по умолчанию: 1)'
+                                 )
+    generate_parser.add_argument('--output',
+                                 type=str,
+                                 help='Файл для потоковой записи паролей'
+                                 )
+    generate_parser.add_argument('--format',
+                                 dest='output_format',
+                                 choices=OUTPUT_FORMATS,
+                                 default='lines',
+                                 help='Формат вывода (по умолчанию: lines)'
+                                 )
+    generate_parser.add_argument('--workers',
+                                 type=int,
+                                 default=1,
+                                 help='Количество процессов (по умолчанию: 1)'
+                                 )
+    generate_parser.add_argument('--unique',
+                                 action='store_true',
+                                 help='Гарантировать отсутствие повторов'
+                                 )
+    generate_parser.add_argument('--exact-limit',
+                                 type=int,
+                                 default=DEFAULT_EXACT_LIMIT,
+                                 help='Размер точного фильтра повторов, '
+                                      'дальше используется фильтр Блума'
+                                 )
+    generate_parser.add_argument('--backend',
+                                 choices=BACKENDS,
+                                 default='python',
+                                 help='Реализация пакетной генерации '
+                                      '(numpy требует установленный NumPy)'
+                                 )
     generate_parser.add_argument('--no-uppercase',
                                  dest='uppercase',
                                  action='store_false',
@@ -84,6 +180,86 @@ def main():
                                  action='store_false',
                                  help='Не использовать специальные символы'
                                  )
+    generate_parser.add_argument('--min-entropy',
+                                 type=float,
+                                 help='Минимальная энтропия в битах; длина '
+                                      'подбирается автоматически'
+                                 )
+    generate_parser.add_argument('--score',
+                                 action='store_true',
+                                 help='Показать энтропию и оценку надежности'
+                                 )
+    generate_parser.add_argument('--min-lowercase',
+                                 type=int,
+                                 help='Минимум строчных букв (по умолчанию: 0)'
+                                 )
+    generate_parser.add_argument('--min-uppercase',
+                                 type=int,
+                                 help='Минимум заглавных (по умолчанию: 1)'
+                                 )
+    generate_parser.add_argument('--min-digits',
+                                 type=int,
+                                 help='Минимум цифр (по умолчанию: 1)'
+                                 )
+    generate_parser.add_argument('--min-special',
+                                 type=int,
+                                 help='Минимум спецсимволов (по умолчанию: 1)'
+                                 )
+    generate_parser.add_argument('--alphabet',
+                                 help='Собственный алфавит вместо классов'
+                                 )
+    generate_parser.add_argument('--lowercase-chars',
+                                 help='Набор строчных букв'
+                                 )
+    generate_parser.add_argument('--uppercase-chars',
+                                 help='Набор заглавных букв'
+                                 )
+    generate_parser.add_argument('--digit-chars',
+                                 help='Набор цифр'
+                                 )
+    generate_parser.add_argument('--special-chars',
+                                 help='Набор спецсимволов'
+                                 )
+    generate_parser.add_argument('--exclude-ambiguous',
+                                 action='store_true',
+                                 help='Исключить похожие символы (0/O, 1/l/I)'
+                                 )
+    generate_parser.add_argument('--pattern',
+                                 help='Шаблон пароля, например Cvcc-dddd-ssss'
+                                 )
+    generate_parser.add_argument('--pronounceable',
+                                 action='store_true',
+                                 help='Произносимый пароль из слогов'
+                                 )
+    generate_parser.add_argument('--token',
+                                 type=int,
+                                 metavar='BYTES',
+                                 help='Секретный токен из BYTES случайных байт'
+                                 )
+    generate_parser.add_argument('--encoding',
+                                 choices=TOKEN_ENCODINGS,
+                                 default='base64url',
+                                 help='Кодировка токена (по умолчанию: '
+                                      'base64url)'
+                                 )
+    generate_parser.add_argument('--passphrase',
+                                 action='store_true',
+                                 help='Парольная фраза из словаря (diceware)'
+                                 )
+    generate_parser.add_argument('--words',
+                                 type=int,
+                                 default=6,
+                                 help='Количество слов (по умолчанию: 6)'
+                                 )
+    generate_parser.add_argument('--wordlist',
+                                 type=str,
+                                 help='Файл словаря для парольной фразы'
+                                 )
+    generate_parser.add_argument('--separator',
+                                 type=str,
+                                 default='-',
+                                 help='Разделитель слов (по умолчанию: -)'
+                                 )
     generate_parser.add_argument('--save',
                                  action='store_true',
                                  help='Сохранить пароль в базу данных'
@@ -106,6 +282,55 @@ def main():
                                  special=True
                                  )
 
+    # Команда import
+    import_parser = subparsers.add_parser('import',
+                                          help='Импортировать пароли из файла'
+                                          )
+    import_parser.add_argument('file',
+                               help='Файл с полями service, username, '
+                                    'password и description'
+                               )
+    import_parser.add_argument('--format',
+                               dest='input_format',
+                               choices=RECORD_FORMATS,
+                               default='csv',
+                               help='Формат файла (по умолчанию: csv)'
+                               )
+    import_parser.add_argument('--batch-size',
+                               type=int,
+                               default=IMPORT_BATCH_SIZE,
+                               help='Записей в одной транзакции '
+                                    f'(по умолчанию: {IMPORT_BATCH_SIZE})'
+                               )
+    import_parser.add_argument('--workers',
+                               type=int,
+                               help='Потоки хэширования (по умолчанию: '
+                                    'число ядер)'
+                               )
+
+    # Команда export
+    export_parser = subparsers.add_parser('export',
+                                          help='Выгрузить записи в файл'
+                                          )
+    export_parser.add_argument('--format',
+                               dest='output_format',
+                               choices=RECORD_FORMATS,
+                               default='csv',
+                               help='Формат выгрузки (по умолчанию: csv)'
+                               )
+    export_parser.add_argument('--output',
+                               type=str,
+                               help='Файл для выгрузки (по умолчанию: stdout)'
+                               )
+    export_parser.add_argument('--service',
+                               type=str,
+                               help='Фильтр по названию сервиса'
+                               )
+    export_parser.add_argument('--username',
+                               type=str,
+                               help='Фильтр по имени пользователя'
+                               )
+
     # Команда find
     find_parser = subparsers.add_parser('find',
                                         help='Найти сохраненные пароли'
@@ -118,6 +343,13 @@ def main():
                              type=str,
                              help='Фильтр по имени пользователя'
                              )
+    find_parser.add_argument('--match',
+                             choices=MATCH_MODES,
+                             default='substring',
+                             help='Режим поиска: точное совпадение, начало '
+                                  'строки или подстрока (по умолчанию: '
+                                  'substring)'
+                             )
 
     # Команда list
     subparsers.add_parser('list',
@@ -157,6 +389,69 @@ def main():
                                help='Имя пользователя'
                                )
 
+    # Команда stats
+    subparsers.add_parser('stats',
+                          help='Показать статистику хранилища'
+                          )
+
+    # Команда rehash-migrate
+    rehash_parser = subparsers.add_parser(
+        'rehash-migrate',
+        help='Поставить записи с устаревшими хэшами в очередь на смену'
+    )
+    rehash_parser.add_argument('--batch-size',
+                               type=int,
+                               default=REHASH_BATCH_SIZE,
+                               help='Записей в одной транзакции '
+                                    f'(по умолчанию: {REHASH_BATCH_SIZE})'
+                               )
+    rehash_parser.add_argument('--restart',
+                               action='store_true',
+                               help='Начать обход заново, без контрольной '
+                                    'точки'
+                               )
+
+    # Команда migrate
+    migrate_parser = subparsers.add_parser(
+        'migrate',
+        help='Применить миграции схемы базы данных'
+    )
+    migrate_parser.add_argument('--status',
+                                action='store_true',
+                                help='Только показать версию схемы'
+                                )
+
+    # Команда calibrate
+    calibrate_parser = subparsers.add_parser(
+        'calibrate',
+        help='Подобрать параметры хэширования под время проверки'
+    )
+    calibrate_parser.add_argument('--target-ms',
+                                  type=float,
+                                  default=50,
+                                  help='Целевое время проверки пароля в мс '
+                                       '(по умолчанию: 50)'
+                                  )
+    calibrate_parser.add_argument('--kdf',
+                                  choices=sorted(KDF_BACKENDS),
+                                  help='Алгоритм (по умолчанию: все)'
+                                  )
+    calibrate_parser.add_argument('--threads',
+                                  type=int,
+                                  help='Количество потоков для замера '
+                                       '(по умолчанию: число ядер)'
+                                  )
+    calibrate_parser.add_argument('--write',
+                                  action='store_true',
+                                  help='Записать параметры в файл '
+                                       'конфигурации'
+                                  )
+    calibrate_parser.add_argument('--env-file',
+                                  default='.env',
+                                  help='Файл конфигурации (по умолчанию: '
+                                       '.env)'
+                                  )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -166,6 +461,10 @@ def main():
     try:
         if args.command == 'generate':
             handle_generate(args)
+        elif args.command == 'import':
+            handle_import(args)
+        elif args.command == 'export':
+            handle_export(args)
         elif args.command == 'find':
             handle_find(args)
         elif args.command == 'list':
@@ -174,6 +473,14 @@ def main():
             handle_verify(args)
         elif args.command == 'delete':
             handle_delete(args)
+        elif args.command == 'calibrate':
+            handle_calibrate(args)
+        elif args.command == 'stats':
+            handle_stats(args)
+        elif args.command == 'rehash-migrate':
+            handle_rehash_migrate(args)
+        elif args.command == 'migrate':
+            handle_migrate(args)
 
     except KeyboardInterrupt:
         print("\nПрограмма прервана пользователем")
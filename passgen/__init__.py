@@ -3,31 +3,72 @@
 
 Модули:
     generator - Генерация паролей
+    policy - Политики генерации паролей
+    random_source - Источники случайных данных
+    wordlist - Словари для парольных фраз
+    markov - Модель для произносимых паролей
+    pool - Пул готовых паролей
+    dedupe - Отсев повторяющихся паролей
+    tokens - Кодирование секретных токенов
+    kdf - Функции формирования ключа для хэширования
+    calibrate - Подбор параметров хэширования
     storage - Работа с базой данных
+    database - Подключение к базе данных и пул подключений
+    migrations - Версионированные миграции схемы
     utils - Вспомогательные функции
     commands - Обработчики команд CLI
+    output - Потоковая запись паролей
+    records - Импорт и экспорт записей хранилища
+    parallel - Параллельная генерация паролей
+    numpy_backend - Векторизованная генерация на NumPy
 """
 
 from .generator import PasswordGenerator
+from .policy import PasswordPolicy, get_policy
+from .pool import PasswordPool
+from .random_source import SystemRandomSource, SeededRandomSource
 from .storage import PasswordStorage
-from .utils import hash_password, verify_password, validate_length
+from .utils import (
+    hash_password,
+    verify_password,
+    validate_length,
+    score_passwords
+)
 from .commands import (
     handle_generate,
     handle_find,
     handle_list,
     handle_verify,
-    handle_delete
+    handle_delete,
+    handle_calibrate,
+    handle_stats,
+    handle_rehash_migrate,
+    handle_migrate,
+    handle_import,
+    handle_export
 )
 
 __all__ = [
     'PasswordGenerator',
+    'PasswordPolicy',
+    'get_policy',
+    'PasswordPool',
+    'SystemRandomSource',
+    'SeededRandomSource',
     'PasswordStorage',
     'hash_password',
     'verify_password',
     'validate_length',
+    'score_passwords',
     'handle_generate',
     'handle_find',
     'handle_list',
     'handle_verify',
-    'handle_delete'
+    'handle_delete',
+    'handle_calibrate',
+    'handle_stats',
+    'handle_rehash_migrate',
+    'handle_migrate',
+    'handle_import',
+    'handle_export'
 ]
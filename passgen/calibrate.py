@@ -0,0 +1,147 @@
+"""
+Модуль для подбора параметров KDF под целевое время проверки пароля.
+
+Содержит функции замера времени и пропускной способности KDF на текущей
+машине и записи подобранных параметров в файл конфигурации .env.
+"""
+
+import math
+import os
+import time
+from .kdf import (
+    Pbkdf2KDF,
+    ScryptKDF,
+    DEFAULT_SCRYPT_R,
+    DEFAULT_SCRYPT_P,
+    MAX_PBKDF2_ITERATIONS
+)
+from .utils import hash_many
+
+# Пароль и соль для замеров
+SAMPLE_PASSWORD = b'calibration-password'
+SAMPLE_SALT = bytes(16)
+
+# Нижние границы параметров, ниже которых хэш считается слабым
+MIN_PBKDF2_ITERATIONS = 10000
+MIN_SCRYPT_LN = 10
+
+
+def measure(kdf, rounds=3):
+    """Замеряет время одного вычисления KDF.
+
+    Берется лучший из нескольких замеров, чтобы не учитывать случайные
+    задержки.
+
+    Args:
+        kdf (KDF): Функция формирования ключа.
+        rounds (int): Количество замеров. По умолчанию 3.
+
+    Returns:
+        float: Время в секундах.
+    """
+    best = math.inf
+    for _ in range(rounds):
+        start = time.perf_counter()
+        kdf.derive(SAMPLE_PASSWORD, SAMPLE_SALT)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_pbkdf2(target):
+    """Подбирает число итераций PBKDF2 под целевое время.
+
+    Время PBKDF2 линейно зависит от числа итераций, поэтому оценка по
+    замеру уточняется одним повторным замером.
+
+    Args:
+        target (float): Целевое время проверки в секундах.
+
+    Returns:
+        Pbkdf2KDF: PBKDF2 с подобранным числом итераций (кратным 1000,
+        не больше MAX_PBKDF2_ITERATIONS).
+    """
+    iterations = MIN_PBKDF2_ITERATIONS
+    for _ in range(2):
+        elapsed = measure(Pbkdf2KDF(iterations))
+        iterations = int(iterations * target / elapsed)
+        iterations = min(MAX_PBKDF2_ITERATIONS,
+                         max(MIN_PBKDF2_ITERATIONS, round(iterations, -3)))
+    return Pbkdf2KDF(iterations)
+
+
+def calibrate_scrypt(target, r=DEFAULT_SCRYPT_R, p=DEFAULT_SCRYPT_P):
+    """Подбирает параметр стоимости scrypt под целевое время.
+
+    С каждым шагом ln время и память удваиваются, поэтому выбирается
+    наибольший ln, при котором время не превышает целевое.
+
+    Args:
+        target (float): Целевое время проверки в секундах.
+        r (int): Размер блока. По умолчанию DEFAULT_SCRYPT_R.
+        p (int): Параллельность. По умолчанию DEFAULT_SCRYPT_P.
+
+    Returns:
+        ScryptKDF: scrypt с подобранным ln (не меньше MIN_SCRYPT_LN).
+    """
+    best = ScryptKDF(MIN_SCRYPT_LN, r, p)
+    elapsed = measure(best)
+    while elapsed * 2 <= target:
+        try:
+            candidate = ScryptKDF(best.ln + 1, r, p)
+        except ValueError:
+            # Следующий шаг превышает допустимую память
+            break
+        elapsed = measure(candidate)
+        if elapsed > target:
+            break
+        best = candidate
+    return best
+
+
+# Функции подбора по имени алгоритма
+CALIBRATORS = {
+    'pbkdf2': calibrate_pbkdf2,
+    'scrypt': calibrate_scrypt,
+}
+
+
+def throughput(kdf, threads=1, count=None):
+    """Замеряет пропускную способность KDF в нескольких потоках.
+
+    Хэширование выполняется через hash_many, как при массовых операциях.
+
+    Args:
+        kdf (KDF): Функция формирования ключа.
+        threads (int): Количество потоков. По умолчанию 1.
+        count (int): Количество вычислений. По умолчанию 4 на поток.
+
+    Returns:
+        float: Количество хэшей в секунду.
+    """
+    count = count or threads * 4
+    start = time.perf_counter()
+    hash_many(['calibration-password'] * count, workers=threads, kdf=kdf)
+    return count / (time.perf_counter() - start)
+
+
+def update_env_file(path, values):
+    """Записывает значения в файл .env, сохраняя остальные строки.
+
+    Args:
+        path (str): Путь к файлу .env.
+        values (dict): Переменные и их значения.
+    """
+    lines = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    pending = dict(values)
+    for index, line in enumerate(lines):
+        name = line.split('=', 1)[0].strip()
+        if '=' in line and name in pending:
+            lines[index] = f"{name}={pending.pop(name)}"
+    lines.extend(f"{name}={value}" for name, value in pending.items())
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
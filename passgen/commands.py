@@ -4,7 +4,28 @@
 Содержит функции для обработки аргументов командной строки.
 """
 
+import os
+import sys
+from .calibrate import CALIBRATORS, measure, throughput, update_env_file
+from .database import get_db_connection
+from .dedupe import (
+    bloom_parameters,
+    collision_probability,
+    expected_duplicates,
+    DEFAULT_ERROR_RATE
+)
 from .generator import PasswordGenerator
+from .kdf import get_kdf, MAX_PBKDF2_ITERATIONS
+from .migrations import LATEST_VERSION, apply_migrations, current_version
+from .output import open_output, write_passwords
+from .parallel import iter_batches_parallel
+from .policy import get_policy, get_policy_for_entropy
+from .records import (
+    iter_record_chunks,
+    open_input,
+    write_records
+)
+from .utils import score_passwords
 from .storage import PasswordStorage
 
 
@@ -18,20 +39,167 @@ def handle_generate(args):
         >>> args = type('Args', (), {
         ...     'length': 12, 'uppercase': True, 'digits': True,
         ...     'special': True, 'save': False, 'service': None,
-        ...     'username': None, 'description': ''
+        ...     'username': None, 'description': '', 'count': 1,
+        ...     'output': None, 'output_format': 'lines', 'workers': 1,
+        ...     'min_lowercase': None, 'min_uppercase': None,
+        ...     'min_digits': None, 'min_special': None,
+        ...     'passphrase': False, 'words': 6, 'wordlist': None,
+        ...     'separator': '-', 'min_entropy': None, 'score': False,
+        ...     'pronounceable': False, 'backend': 'python',
+        ...     'unique': False, 'exact_limit': 1000000, 'token': None,
+        ...     'encoding': 'base64url', 'alphabet': None,
+        ...     'lowercase_chars': None, 'uppercase_chars': None,
+        ...     'digit_chars': None, 'special_chars': None,
+        ...     'exclude_ambiguous': False, 'pattern': None
         ... })()
         >>> handle_generate(args)  # Выведет сгенерированный пароль
     """
     try:
-        generator = PasswordGenerator()
-        password = generator.generate_password(
-            length=args.length,
-            use_uppercase=args.uppercase,
-            use_digits=args.digits,
-            use_special=args.special
+        if args.count < 1:
+            raise ValueError("Количество паролей должно быть не менее 1")
+        char_sets = {
+            name: chars for name, chars in (
+                ('lowercase', args.lowercase_chars),
+                ('uppercase', args.uppercase_chars),
+                ('digits', args.digit_chars),
+                ('special', args.special_chars)
+            ) if chars
+        }
+        generator = PasswordGenerator(
+            backend=args.backend,
+            char_sets=char_sets or None,
+            exclude_ambiguous=args.exclude_ambiguous
         )
 
+        if args.token is not None:
+            def make_batches():
+                return generator.iter_token_batches(args.count,
+                                                    nbytes=args.token,
+                                                    encoding=args.encoding
+                                                    )
+
+            def make_one():
+                return generator.generate_token(nbytes=args.token,
+                                                encoding=args.encoding
+                                                )
+        elif args.pattern:
+            def make_batches():
+                return generator.iter_pattern_batches(args.count,
+                                                      args.pattern
+                                                      )
+
+            def make_one():
+                return generator.generate_from_pattern(args.pattern)
+        elif args.passphrase:
+            def make_batches():
+                return generator.iter_passphrase_batches(
+                    args.count,
+                    words=args.words,
+                    wordlist=args.wordlist,
+                    separator=args.separator
+                )
+
+            def make_one():
+                return generator.generate_passphrase(
+                    words=args.words,
+                    wordlist=args.wordlist,
+                    separator=args.separator
+                )
+        else:
+            custom = args.alphabet or char_sets or args.exclude_ambiguous
+            if args.pronounceable and custom:
+                print("Свои наборы символов недоступны для произносимых "
+                      "паролей")
+                return
+            # Буквы идут из марковской модели и несут меньше энтропии,
+            # чем равномерный алфавит, по которому подбирается длина
+            if args.pronounceable and args.min_entropy:
+                print("--min-entropy недоступен для произносимых паролей")
+                return
+            classes = {
+                'use_uppercase': args.uppercase,
+                'use_digits': args.digits,
+                'use_special': args.special,
+                'min_lowercase': args.min_lowercase or 0,
+                'min_uppercase': args.min_uppercase,
+                'min_digits': args.min_digits,
+                'min_special': args.min_special,
+                'alphabet': args.alphabet,
+                'char_sets': char_sets,
+                'exclude_ambiguous': args.exclude_ambiguous
+            }
+            # Политика компилируется один раз на весь запуск
+            if args.min_entropy:
+                policy = get_policy_for_entropy(args.min_entropy, **classes)
+            else:
+                policy = get_policy(args.length, **classes)
+
+            def make_batches():
+                if args.pronounceable:
+                    return generator.iter_pronounceable_batches(
+                        args.count, policy=policy
+                    )
+                unique = {}
+                if args.unique:
+                    unique = {'unique': True,
+                              'exact_limit': args.exact_limit}
+                if args.workers > 1:
+                    return iter_batches_parallel(args.count,
+                                                 workers=args.workers,
+                                                 policy=policy,
+                                                 backend=args.backend,
+                                                 **unique
+                                                 )
+                return generator.iter_batches(args.count,
+                                              policy=policy,
+                                              **unique
+                                              )
+
+            def make_one():
+                if args.pronounceable:
+                    return generator.generate_pronounceable(policy=policy)
+                return generator.generate_password(policy=policy)
+
+        if args.count > 1 or args.output:
+            if args.save:
+                print("Сохранение в базу недоступно при пакетной генерации")
+                return
+            special_mode = (args.passphrase or args.pronounceable
+                            or args.token is not None or args.pattern)
+            if args.workers > 1 and special_mode:
+                print("--workers доступен только для обычных паролей")
+                return
+            if args.unique:
+                if special_mode:
+                    print("--unique доступен только для обычных паролей")
+                    return
+                # Отчет пишем в stderr, если пароли идут в stdout
+                report = sys.stdout if args.output else sys.stderr
+                print(_collision_report(policy, args.count, args.exact_limit),
+                      file=report)
+            if args.output:
+                with open_output(args.output) as stream:
+                    written = write_passwords(stream,
+                                              make_batches(),
+                                              args.output_format,
+                                              with_scores=args.score
+                                              )
+                print(f"Записано паролей: {written} в {args.output}")
+            else:
+                write_passwords(sys.stdout,
+                                make_batches(),
+                                args.output_format,
+                                with_scores=args.score
+                                )
+            return
+
+        password = make_one()
+
         print(f"Сгенерирован пароль: {password}")
+        if args.score:
+            strength = score_passwords([password])[0]
+            print(f"Энтропия: {strength['effective_entropy']:.1f} бит, "
+                  f"оценка: {strength['score']}/4")
 
         if args.save:
             storage = PasswordStorage()
@@ -58,6 +226,27 @@ def handle_generate(args):
         print(f"Ошибка при генерации: {e}")
 
 
+def _collision_report(policy, count, exact_limit):
+    """Формирует отчет об ожидаемых коллизиях перед пакетной генерацией.
+
+    Args:
+        policy (PasswordPolicy): Политика генерации.
+        count (int): Количество паролей.
+        exact_limit (int): Размер точного множества фильтра повторов.
+
+    Returns:
+        str: Текст отчета.
+    """
+    space = policy.space_size
+    report = (f"Вероятность повтора: "
+              f"{collision_probability(count, space):.3g}, "
+              f"ожидаемых повторов: {expected_duplicates(count, space):.3g}")
+    if count > exact_limit:
+        bits, _ = bloom_parameters(count, DEFAULT_ERROR_RATE)
+        report += f", фильтр Блума: ~{bits // 8 // 2 ** 20} МиБ"
+    return report
+
+
 def handle_find(args):
     """Обрабатывает команду поиска паролей.
 
@@ -65,25 +254,30 @@ def handle_find(args):
         args: Аргументы командной строки.
 
     Example:
-        >>> args = type('Args', (), {'service': 'gmail', 'username': None})()
+        >>> args = type('Args', (), {
+        ...     'service': 'gmail', 'username': None, 'match': 'prefix'
+        ... })()
         >>> handle_find(args)  # Выведет найденные пароли
     """
     try:
         storage = PasswordStorage()
-        results = storage.find_passwords(args.service, args.username)
-
-        if not results:
-            print("Пароли не найдены")
-            return
-
-        print(f"Найдено записей: {len(results)}")
-        for i, item in enumerate(results, 1):
-            print(f"{i}. Сервис: {item['service']}")
+        found = 0
+        # Записи выводятся по мере чтения с сервера, без загрузки всех
+        for found, item in enumerate(
+            storage.iter_passwords(args.service, args.username, args.match), 1
+        ):
+            print(f"{found}. Сервис: {item['service']}")
             print(f"   Пользователь: {item['username']}")
             if item['description']:
                 print(f"   Описание: {item['description']}")
             print()
 
+        if not found:
+            print("Пароли не найдены")
+            return
+
+        print(f"Найдено записей: {found}")
+
     except Exception as e:
         print(f"Ошибка при поиске: {e}")
 
@@ -97,7 +291,9 @@ def handle_list(args):
     Example:
         >>> handle_list(None)  # Выведет все пароли
     """
-    handle_find(type('Args', (), {'service': None, 'username': None})())
+    handle_find(type('Args', (), {
+        'service': None, 'username': None, 'match': 'substring'
+    })())
 
 
 def handle_verify(args):
@@ -149,3 +345,218 @@ def handle_delete(args):
 
     except Exception as e:
         print(f"Ошибка при удалении: {e}")
+
+
+def handle_import(args):
+    """Обрабатывает команду импорта паролей из файла.
+
+    Файл читается порциями, каждая порция сохраняется одной транзакцией
+    через save_passwords_bulk. Существующие записи пропускаются с
+    сообщением по каждой строке, поэтому прерванный импорт можно
+    запустить повторно.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Example:
+        >>> args = type('Args', (), {
+        ...     'file': 'accounts.csv', 'input_format': 'csv',
+        ...     'batch_size': 1000, 'workers': None
+        ... })()
+        >>> handle_import(args)  # Выведет итоги импорта
+    """
+    imported = skipped = 0
+    try:
+        storage = PasswordStorage()
+        with open_input(args.file) as stream:
+            for chunk in iter_record_chunks(stream, args.input_format,
+                                            args.batch_size):
+                ids = storage.save_passwords_bulk(
+                    (record[1:] for record in chunk), args.workers
+                )
+                for (line_no, service, username, _, _), record_id in zip(
+                    chunk, ids
+                ):
+                    if record_id is None:
+                        skipped += 1
+                        print(f"Строка {line_no}: запись {service}/"
+                              f"{username} уже существует, пропущена")
+                    else:
+                        imported += 1
+
+    except Exception as e:
+        print(f"Ошибка при импорте: {e}")
+    print(f"Импортировано записей: {imported}, пропущено: {skipped}")
+
+
+def handle_export(args):
+    """Обрабатывает команду выгрузки записей хранилища.
+
+    Записи читаются серверным курсором и записываются в файл по мере
+    поступления, поэтому память не зависит от размера таблицы.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Example:
+        >>> args = type('Args', (), {
+        ...     'output': 'accounts.csv', 'output_format': 'csv',
+        ...     'service': None, 'username': None
+        ... })()
+        >>> handle_export(args)  # Выгрузит записи в файл
+    """
+    try:
+        storage = PasswordStorage()
+        records = storage.iter_passwords(args.service, args.username)
+
+        if args.output:
+            with open_output(args.output) as stream:
+                written = write_records(stream, records, args.output_format)
+            print(f"Выгружено записей: {written} в {args.output}")
+        else:
+            write_records(sys.stdout, records, args.output_format)
+
+    except Exception as e:
+        print(f"Ошибка при выгрузке: {e}")
+
+
+def handle_stats(args):
+    """Обрабатывает команду статистики хранилища.
+
+    Показывает, сколько записей еще хранят хэши на устаревших параметрах.
+    Такие хэши обновляются при успешной проверке пароля.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Example:
+        >>> handle_stats(type('Args', (), {})())  # Выведет статистику
+    """
+    try:
+        storage = PasswordStorage()
+        total, outdated = storage.count_outdated_hashes()
+
+        print(f"Всего записей: {total}")
+        print(f"Хэшей на устаревших параметрах: {outdated} "
+              f"(текущие: {get_kdf().prefix})")
+
+    except Exception as e:
+        print(f"Ошибка при получении статистики: {e}")
+
+
+def handle_rehash_migrate(args):
+    """Обрабатывает команду обхода устаревших хэшей.
+
+    Записи с хэшами на устаревших параметрах ставятся в очередь на
+    принудительную смену пароля. Обход можно прервать и продолжить.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Example:
+        >>> args = type('Args', (), {'batch_size': 10000, 'restart': False})()
+        >>> handle_rehash_migrate(args)  # Выведет ход обхода
+    """
+    try:
+        storage = PasswordStorage()
+        total_scanned = total_queued = 0
+        for last_id, scanned, queued in storage.queue_outdated_hashes(
+            batch_size=args.batch_size, restart=args.restart
+        ):
+            total_scanned += scanned
+            total_queued += queued
+            print(f"До id {last_id}: просмотрено {total_scanned}, "
+                  f"в очереди на смену {total_queued}")
+
+        print(f"Обход завершен: просмотрено {total_scanned}, "
+              f"поставлено в очередь {total_queued}")
+
+    except Exception as e:
+        print(f"Ошибка при обходе хэшей: {e}")
+
+
+def handle_migrate(args):
+    """Обрабатывает команду применения миграций схемы.
+
+    Применяет недостающие миграции по порядку. С флагом status только
+    показывает текущую и последнюю версии схемы.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Example:
+        >>> args = type('Args', (), {'status': False})()
+        >>> handle_migrate(args)  # Применит недостающие миграции
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if args.status:
+            print(f"Версия схемы: {current_version(conn)} "
+                  f"(последняя: {LATEST_VERSION})")
+            return
+
+        applied = apply_migrations(conn)
+        for number, description, reason in applied:
+            if reason:
+                print(f"Пропущена миграция {number}: {description}. "
+                      f"{reason}")
+            else:
+                print(f"Применена миграция {number}: {description}")
+        if not applied:
+            print(f"Схема актуальна (версия {LATEST_VERSION})")
+
+    except Exception as e:
+        print(f"Ошибка при применении миграций: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def handle_calibrate(args):
+    """Обрабатывает команду подбора параметров хэширования.
+
+    Для каждого алгоритма подбирает параметры под целевое время проверки,
+    выводит пропускную способность в 1 и N потоках и при необходимости
+    записывает параметры в файл конфигурации.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Example:
+        >>> args = type('Args', (), {
+        ...     'target_ms': 50, 'kdf': None, 'threads': None,
+        ...     'write': False, 'env_file': '.env'
+        ... })()
+        >>> handle_calibrate(args)  # Выведет рекомендуемые параметры
+    """
+    try:
+        if args.target_ms <= 0:
+            print("Целевое время должно быть больше 0")
+            return
+        target = args.target_ms / 1000
+        threads = args.threads or os.cpu_count() or 1
+        names = [args.kdf] if args.kdf else list(CALIBRATORS)
+
+        results = {}
+        for name in names:
+            kdf = CALIBRATORS[name](target)
+            results[name] = kdf
+            print(f"{name}: {kdf.params}, проверка "
+                  f"{measure(kdf) * 1000:.1f} мс")
+            if (name == 'pbkdf2' and
+                    kdf.iterations == MAX_PBKDF2_ITERATIONS):
+                print(f"  Внимание: достигнут предел {MAX_PBKDF2_ITERATIONS} "
+                      "итераций, целевое время не достигнуто")
+            print(f"  потоков 1: {throughput(kdf, 1):.1f} хэшей/с, "
+                  f"потоков {threads}: {throughput(kdf, threads):.1f} "
+                  f"хэшей/с")
+
+        if args.write:
+            # Без --kdf записываем параметры текущего алгоритма
+            name = args.kdf or get_kdf().name
+            update_env_file(args.env_file, results[name].to_config())
+            print(f"Параметры {name} записаны в {args.env_file}")
+
+    except Exception as e:
+        print(f"Ошибка при подборе параметров: {e}")
@@ -1,18 +1,37 @@
 """
 Модуль для работы с базой данных PostgreSQL.
 
-Содержит функции для подключения к БД и создания таблиц.
+Содержит функцию подключения к БД и общий для процесса пул подключений
+ConnectionPool.
 """
 
+import collections
+import threading
+import time
 import psycopg2
 import os
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from dotenv import load_dotenv
+from .migrations import check_schema_version
 
 load_dotenv()
 
+# Параметры пула по умолчанию, если они не заданы в конфигурации
+DEFAULT_POOL_MIN = 1
+DEFAULT_POOL_MAX = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 300
+DEFAULT_POOL_TIMEOUT = 30
+
+# Подключение, простоявшее дольше этого времени (в секундах), перед
+# выдачей проверяется запросом SELECT 1
+HEALTH_CHECK_INTERVAL = 30
+
 
 def get_db_connection():
-    """Создает подключение к PostgreSQL и гарантирует существование таблицы.
+    """Создает подключение к PostgreSQL.
+
+    Схема базы данных создается командой migrate (см. passgen.migrations),
+    а не при каждом подключении.
 
     Returns:
         psycopg2.connection: Объект подключения к базе данных.
@@ -26,29 +45,266 @@ def get_db_connection():
         0
     """
     try:
-        conn = psycopg2.connect(
+        return psycopg2.connect(
             host=os.getenv('DB_HOST', 'localhost'),
             port=os.getenv('DB_PORT', '5432'),
             dbname=os.getenv('DB_NAME', 'password_generator'),
             user=os.getenv('DB_USER', 'postgres'),
             password=os.getenv('DB_PASSWORD', '')
         )
-
-        # Создаем таблицу если не существует
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS passwords (
-                id SERIAL PRIMARY KEY,
-                service VARCHAR(255) NOT NULL,
-                username VARCHAR(255) NOT NULL,
-                password_hash TEXT NOT NULL,
-                description TEXT,
-                UNIQUE(service, username)
-            )
-        """)
-        conn.commit()
-        cur.close()
-
-        return conn
     except Exception as e:
         raise Exception(f"Ошибка подключения к базе данных: {str(e)}")
+
+
+def _connect_checked():
+    """Создает подключение для пула и проверяет версию схемы.
+
+    Версия проверяется только для первого подключения процесса.
+    """
+    conn = get_db_connection()
+    try:
+        check_schema_version(conn)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+class ConnectionPool:
+    """Потокобезопасный пул подключений к PostgreSQL.
+
+    Свободные подключения выдаются в порядке LIFO, чтобы редко
+    используемые простаивали и закрывались по idle_timeout. Перед выдачей
+    подключение проверяется: закрытые отбрасываются, а простоявшие дольше
+    HEALTH_CHECK_INTERVAL проверяются запросом SELECT 1. После fork пул
+    не использует подключения родительского процесса.
+
+    Attributes:
+        minconn (int): Количество подключений, которые не закрываются
+            по простою.
+        maxconn (int): Максимальное количество подключений.
+        idle_timeout (float): Время простоя в секундах, после которого
+            лишнее подключение закрывается.
+        timeout (float): Время ожидания свободного подключения в секундах.
+    """
+
+    def __init__(self,
+                 minconn=DEFAULT_POOL_MIN,
+                 maxconn=DEFAULT_POOL_MAX,
+                 idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+                 timeout=DEFAULT_POOL_TIMEOUT,
+                 connect=None
+                 ):
+        """Создает пустой пул.
+
+        Args:
+            minconn (int): Минимум подключений. По умолчанию
+                DEFAULT_POOL_MIN.
+            maxconn (int): Максимум подключений. По умолчанию
+                DEFAULT_POOL_MAX.
+            idle_timeout (float): Время простоя до закрытия в секундах.
+                По умолчанию DEFAULT_POOL_IDLE_TIMEOUT.
+            timeout (float): Время ожидания свободного подключения.
+                По умолчанию DEFAULT_POOL_TIMEOUT.
+            connect (callable): Функция создания подключения.
+                По умолчанию get_db_connection с проверкой версии схемы.
+
+        Raises:
+            ValueError: Если размеры пула некорректны.
+        """
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Некорректные размеры пула подключений")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._connect = connect or _connect_checked
+        self._condition = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        """Сбрасывает состояние пула для текущего процесса."""
+        self._pid = os.getpid()
+        # Свободные подключения: (подключение, время возврата)
+        self._idle = collections.deque()
+        self._size = 0
+
+    def getconn(self):
+        """Выдает подключение из пула.
+
+        Returns:
+            psycopg2.connection: Рабочее подключение.
+
+        Raises:
+            Exception: Если свободное подключение не появилось за timeout
+                или не удалось подключиться к базе.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            with self._condition:
+                if self._pid != os.getpid():
+                    self._reset()
+                self._evict_idle()
+
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Exception("Нет свободных подключений в пуле")
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    conn, released = self._idle.pop()
+                else:
+                    # Место занимаем до подключения, чтобы не превысить
+                    # максимум при одновременных запросах
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+            # Проверка выполняется без блокировки пула
+            if self._is_healthy(conn, released):
+                return conn
+            with self._condition:
+                self._discard(conn)
+                self._condition.notify()
+
+    def putconn(self, conn, discard=False):
+        """Возвращает подключение в пул.
+
+        Незавершенная транзакция откатывается. Закрытые и сломанные
+        подключения не возвращаются.
+
+        Args:
+            conn (psycopg2.connection): Подключение из getconn.
+            discard (bool): Закрыть подключение вместо возврата.
+                По умолчанию False.
+        """
+        if self._pid != os.getpid():
+            # Подключение другого процесса не трогаем
+            return
+        if not discard and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._condition:
+            if discard or conn.closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def closeall(self):
+        """Закрывает все свободные подключения."""
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+
+    def stats(self):
+        """Возвращает состояние пула.
+
+        Returns:
+            dict: Всего подключений, свободных и выданных.
+        """
+        with self._condition:
+            return {'size': self._size,
+                    'idle': len(self._idle),
+                    'in_use': self._size - len(self._idle)}
+
+    def _evict_idle(self):
+        """Закрывает подключения, простоявшие дольше idle_timeout."""
+        now = time.monotonic()
+        # Самые старые подключения в начале очереди
+        while (self._idle and self._size > self.minconn
+               and now - self._idle[0][1] > self.idle_timeout):
+            self._discard(self._idle.popleft()[0])
+
+    def _is_healthy(self, conn, released):
+        """Проверяет подключение перед выдачей."""
+        if conn.closed:
+            return False
+        if time.monotonic() - released < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        """Закрывает подключение и освобождает место в пуле."""
+        self._size -= 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Возвращает общий для процесса пул подключений.
+
+    Размеры пула берутся из переменных DB_POOL_MIN, DB_POOL_MAX,
+    DB_POOL_IDLE_TIMEOUT и DB_POOL_TIMEOUT.
+
+    Returns:
+        ConnectionPool: Пул подключений.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    minconn=int(os.getenv('DB_POOL_MIN', DEFAULT_POOL_MIN)),
+                    maxconn=int(os.getenv('DB_POOL_MAX', DEFAULT_POOL_MAX)),
+                    idle_timeout=float(os.getenv('DB_POOL_IDLE_TIMEOUT',
+                                                 DEFAULT_POOL_IDLE_TIMEOUT)),
+                    timeout=float(os.getenv('DB_POOL_TIMEOUT',
+                                            DEFAULT_POOL_TIMEOUT))
+                )
+    return _pool
+
+
+def borrow_connection():
+    """Берет подключение из общего пула.
+
+    Подключение нужно вернуть через release_connection, обычно в finally.
+
+    Returns:
+        psycopg2.connection: Подключение к базе данных.
+
+    Example:
+        >>> conn = borrow_connection()
+        >>> try:
+        ...     conn.cursor().execute("SELECT 1")
+        ... finally:
+        ...     release_connection(conn)
+    """
+    return get_pool().getconn()
+
+
+def release_connection(conn):
+    """Возвращает подключение в общий пул.
+
+    Args:
+        conn (psycopg2.connection): Подключение из borrow_connection.
+    """
+    get_pool().putconn(conn)
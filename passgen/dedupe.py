@@ -0,0 +1,385 @@
+"""
+Модуль для отсева повторяющихся паролей при пакетной генерации.
+
+Содержит точный фильтр на основе множества, масштабируемый фильтр Блума
+и функции оценки вероятности коллизий.
+"""
+
+import hashlib
+import math
+
+# Размер точного множества по умолчанию, после которого фильтр
+# переключается на фильтр Блума
+DEFAULT_EXACT_LIMIT = 1000000
+
+# Допустимая доля ложных срабатываний фильтра Блума по умолчанию
+DEFAULT_ERROR_RATE = 1e-6
+
+# Сколько порций подряд без новых паролей допускается при отсеве повторов,
+# прежде чем генерация считается исчерпавшей пространство паролей
+MAX_STALLED_CHUNKS = 100
+
+_MASK64 = (1 << 64) - 1
+
+
+def collision_probability(count, space_size):
+    """Оценивает вероятность хотя бы одного повтора (задача о днях рождения).
+
+    Args:
+        count (int): Количество паролей.
+        space_size (int): Количество возможных паролей.
+
+    Returns:
+        float: Вероятность от 0 до 1.
+
+    Example:
+        >>> round(collision_probability(10 ** 6, 62 ** 8), 6)
+        0.002287
+    """
+    if count < 2:
+        return 0.0
+    if count > space_size:
+        return 1.0
+    return -math.expm1(-count * (count - 1) / (2 * space_size))
+
+
+def expected_duplicates(count, space_size):
+    """Оценивает ожидаемое количество повторяющихся пар.
+
+    Args:
+        count (int): Количество паролей.
+        space_size (int): Количество возможных паролей.
+
+    Returns:
+        float: Ожидаемое количество пар-повторов.
+    """
+    return count * (count - 1) / (2 * space_size)
+
+
+def bloom_parameters(capacity, error_rate):
+    """Вычисляет размер фильтра Блума и число хэш-функций.
+
+    Args:
+        capacity (int): Ожидаемое количество элементов.
+        error_rate (float): Допустимая доля ложных срабатываний.
+
+    Returns:
+        tuple: Количество бит и количество хэш-функций.
+    """
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def _item_hashes(item):
+    """Возвращает пару 64-битных хэшей элемента для двойного хэширования.
+
+    Args:
+        item (str): Элемент.
+
+    Returns:
+        tuple: Первый хэш и нечетный второй хэш (шаг).
+    """
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+    return (int.from_bytes(digest[:8], 'little'),
+            int.from_bytes(digest[8:], 'little') | 1)
+
+
+class BloomFilter:
+    """Фильтр Блума фиксированного размера.
+
+    Индексы бит получаются двойным хэшированием одного blake2b.
+
+    Attributes:
+        capacity (int): Рассчетное количество элементов.
+        error_rate (float): Доля ложных срабатываний при заполнении.
+        count (int): Количество добавленных элементов.
+    """
+
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE):
+        """Создает пустой фильтр.
+
+        Args:
+            capacity (int): Рассчетное количество элементов.
+            error_rate (float): Доля ложных срабатываний.
+
+        Raises:
+            ValueError: Если параметры некорректны.
+        """
+        if capacity < 1:
+            raise ValueError("Емкость фильтра должна быть не менее 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("Доля ошибок должна быть от 0 до 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+        self._size, self._hashes = bloom_parameters(capacity, error_rate)
+        self._bits = bytearray((self._size + 7) // 8)
+
+    @property
+    def nbytes(self):
+        """int: Размер битового массива в байтах."""
+        return len(self._bits)
+
+    def _has(self, first, second):
+        """Проверяет биты элемента по паре его хэшей.
+
+        Проверка останавливается на первом нулевом бите, поэтому для
+        новых элементов обычно вычисляется одна-две позиции.
+        """
+        bits = self._bits
+        size = self._size
+        for i in range(self._hashes):
+            pos = ((first + i * second) & _MASK64) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def _set(self, first, second):
+        """Устанавливает биты элемента по паре его хэшей.
+
+        Returns:
+            bool: True если хотя бы один бит был сброшен.
+        """
+        bits = self._bits
+        size = self._size
+        new = False
+        for pos in [((first + i * second) & _MASK64) % size
+                    for i in range(self._hashes)]:
+            byte = bits[pos >> 3]
+            bit = 1 << (pos & 7)
+            if not byte & bit:
+                bits[pos >> 3] = byte | bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def _insert(self, first, second):
+        """Устанавливает биты элемента, которого заведомо нет в фильтре."""
+        bits = self._bits
+        size = self._size
+        for pos in [((first + i * second) & _MASK64) % size
+                    for i in range(self._hashes)]:
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return self._has(*_item_hashes(item))
+
+    def add(self, item):
+        """Добавляет элемент.
+
+        Args:
+            item (str): Элемент.
+
+        Returns:
+            bool: True если элемента (вероятно) не было в фильтре.
+        """
+        return self._set(*_item_hashes(item))
+
+
+class ScalableBloomFilter:
+    """Масштабируемый фильтр Блума.
+
+    Когда текущий фильтр заполнен, добавляется новый вдвое большей
+    емкости с вдвое меньшей долей ошибок, поэтому суммарная доля
+    ложных срабатываний остается не больше 2 * error_rate.
+
+    Attributes:
+        error_rate (float): Доля ложных срабатываний первого фильтра.
+    """
+
+    def __init__(self, initial_capacity, error_rate=DEFAULT_ERROR_RATE):
+        """Создает фильтр с одним слоем.
+
+        Args:
+            initial_capacity (int): Емкость первого слоя.
+            error_rate (float): Доля ложных срабатываний первого слоя.
+        """
+        self.error_rate = error_rate
+        self._filters = [BloomFilter(initial_capacity, error_rate)]
+
+    @property
+    def nbytes(self):
+        """int: Суммарный размер битовых массивов в байтах."""
+        return sum(layer.nbytes for layer in self._filters)
+
+    def __len__(self):
+        return sum(layer.count for layer in self._filters)
+
+    def __contains__(self, item):
+        first, second = _item_hashes(item)
+        return any(layer._has(first, second) for layer in self._filters)
+
+    def add(self, item):
+        """Добавляет элемент.
+
+        Элемент хэшируется один раз, и пара хэшей используется и для
+        проверки всех слоев, и для записи в текущий слой.
+
+        Args:
+            item (str): Элемент.
+
+        Returns:
+            bool: True если элемента (вероятно) не было в фильтре.
+        """
+        first, second = _item_hashes(item)
+        for layer in self._filters:
+            if layer._has(first, second):
+                return False
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(current.capacity * 2,
+                                  current.error_rate / 2
+                                  )
+            self._filters.append(current)
+        current._insert(first, second)
+        return True
+
+    def filter(self, items):
+        """Возвращает только новые элементы, запоминая их.
+
+        То же, что add для каждого элемента, но проверка слоев и запись
+        выполняются в одном цикле без вызовов методов на каждый бит.
+
+        Args:
+            items (iterable): Элементы.
+
+        Returns:
+            list: Новые (вероятно) элементы в исходном порядке.
+        """
+        blake2b = hashlib.blake2b
+        from_bytes = int.from_bytes
+        layers = [(layer._bits, layer._size, layer._hashes)
+                  for layer in self._filters]
+        current = self._filters[-1]
+        new_items = []
+        for item in items:
+            digest = blake2b(item.encode('utf-8'), digest_size=16).digest()
+            first = from_bytes(digest[:8], 'little')
+            second = from_bytes(digest[8:], 'little') | 1
+
+            seen = False
+            for bits, size, hashes in layers:
+                position = first
+                for _ in range(hashes):
+                    pos = position % size
+                    if not bits[pos >> 3] & (1 << (pos & 7)):
+                        break
+                    position = (position + second) & _MASK64
+                else:
+                    seen = True
+                    break
+            if seen:
+                continue
+
+            if current.count >= current.capacity:
+                current = BloomFilter(current.capacity * 2,
+                                      current.error_rate / 2
+                                      )
+                self._filters.append(current)
+                layers.append((current._bits, current._size,
+                               current._hashes))
+            bits, size, hashes = layers[-1]
+            position = first
+            for _ in range(hashes):
+                pos = position % size
+                bits[pos >> 3] |= 1 << (pos & 7)
+                position = (position + second) & _MASK64
+            current.count += 1
+            new_items.append(item)
+        return new_items
+
+
+class DedupeFilter:
+    """Фильтр повторов: точное множество, затем фильтр Блума.
+
+    Пока элементов не больше exact_limit, используется обычное множество.
+    После этого элементы переносятся в масштабируемый фильтр Блума, и
+    память растет примерно на -ln(error_rate) / ln(2)^2 бит на элемент.
+    Ложное срабатывание означает лишь, что уникальный пароль будет
+    отброшен и сгенерирован заново; повтор не пропускается никогда.
+
+    Example:
+        >>> seen = DedupeFilter(exact_limit=2)
+        >>> [seen.add(item) for item in ('a', 'b', 'a', 'c', 'b')]
+        [True, True, False, True, False]
+    """
+
+    def __init__(self,
+                 exact_limit=DEFAULT_EXACT_LIMIT,
+                 error_rate=DEFAULT_ERROR_RATE,
+                 capacity=None
+                 ):
+        """Создает пустой фильтр.
+
+        Args:
+            exact_limit (int): Максимальный размер точного множества.
+            error_rate (float): Доля ложных срабатываний фильтра Блума.
+            capacity (int): Ожидаемое количество элементов. Если указано,
+                фильтр Блума сразу создается на это количество, и каждый
+                элемент проверяется в одном слое, а не в нескольких.
+
+        Raises:
+            ValueError: Если exact_limit меньше 1.
+        """
+        if exact_limit < 1:
+            raise ValueError("Размер точного множества должен быть не менее 1")
+        self.exact_limit = exact_limit
+        self.error_rate = error_rate
+        self.capacity = capacity
+        self._exact = set()
+        self._bloom = None
+
+    @property
+    def is_exact(self):
+        """bool: True пока используется точное множество."""
+        return self._bloom is None
+
+    def add(self, item):
+        """Добавляет элемент.
+
+        Args:
+            item (str): Элемент.
+
+        Returns:
+            bool: True если элемент новый.
+        """
+        if self._bloom is not None:
+            return self._bloom.add(item)
+
+        if item in self._exact:
+            return False
+        self._exact.add(item)
+        if len(self._exact) > self.exact_limit:
+            self._switch_to_bloom()
+        return True
+
+    def _switch_to_bloom(self):
+        """Переносит элементы множества в фильтр Блума."""
+        self._bloom = ScalableBloomFilter(
+            max(len(self._exact) * 2, self.capacity or 0),
+            self.error_rate
+        )
+        self._bloom.filter(self._exact)
+        self._exact = set()
+
+    def filter(self, items):
+        """Возвращает только новые элементы, запоминая их.
+
+        Args:
+            items (iterable): Элементы.
+
+        Returns:
+            list: Новые элементы в исходном порядке.
+        """
+        items = list(items)
+        new_items = []
+        for index, item in enumerate(items):
+            if self._bloom is not None:
+                return new_items + self._bloom.filter(items[index:])
+            if self.add(item):
+                new_items.append(item)
+        return new_items
@@ -4,9 +4,124 @@
 Содержит класс PasswordGenerator для создания паролей с различными параметрами.
 """
 
-import random as rn
-import string
-from .utils import validate_length
+import functools
+from .policy import CHAR_SETS, get_policy, compile_alphabet, _build_translation
+from . import numpy_backend
+from .dedupe import DedupeFilter, DEFAULT_EXACT_LIMIT, MAX_STALLED_CHUNKS
+from .markov import load_markov_model
+from .random_source import SystemRandomSource
+from .tokens import encode_token, encode_tokens
+from .utils import validate_length, validate_token_length
+from .wordlist import load_wordlist
+
+# Количество паролей в одной порции при потоковой генерации
+BATCH_CHUNK_SIZE = 10000
+
+# Доступные реализации пакетной генерации
+BACKENDS = ('python', 'numpy')
+
+# Допустимое количество слов в парольной фразе
+MIN_PASSPHRASE_WORDS = 3
+MAX_PASSPHRASE_WORDS = 64
+
+# Гласные для заполнителей v/V и c/C шаблонов
+VOWELS = 'aeiouy'
+
+# Заполнители шаблонов: символ -> функция набора по наборам классов
+PATTERN_PLACEHOLDERS = {
+    'l': lambda sets: sets['lowercase'],
+    'u': lambda sets: sets['uppercase'],
+    'L': lambda sets: sets['lowercase'] + sets['uppercase'],
+    'v': lambda sets: _vowels(sets['lowercase'], VOWELS),
+    'V': lambda sets: _vowels(sets['uppercase'], VOWELS.upper()),
+    'c': lambda sets: _consonants(sets['lowercase'], VOWELS),
+    'C': lambda sets: _consonants(sets['uppercase'], VOWELS.upper()),
+    'd': lambda sets: sets['digits'],
+    's': lambda sets: sets['special'],
+    'a': lambda sets: (sets['lowercase'] + sets['uppercase']
+                       + sets['digits']),
+    '*': lambda sets: ''.join(sets[name] for name in CHAR_SETS),
+}
+
+
+def _vowels(chars, vowels):
+    return ''.join(c for c in chars if c in vowels)
+
+
+def _consonants(chars, vowels):
+    return ''.join(c for c in chars if c.isalpha() and c not in vowels)
+
+
+def compile_pattern(pattern, char_sets=None, exclude_ambiguous=False):
+    """Разбирает шаблон пароля в план генерации.
+
+    Заполнители: l/u - строчная/заглавная буква, L - любая буква,
+    v/V - гласная, c/C - согласная, d - цифра, s - спецсимвол,
+    a - буква или цифра, * - любой символ. После заполнителя можно указать
+    количество повторов в фигурных скобках: d{4}. Остальные символы
+    выводятся как есть, '\\' экранирует следующий символ.
+
+    Соседние одинаковые элементы объединяются, поэтому план - это плоский
+    кортеж сегментов (алфавит, количество). Сегмент с алфавитом из одного
+    символа - постоянный текст. Разобранные шаблоны кэшируются.
+
+    Args:
+        pattern (str): Шаблон, например 'Cvcc-dddd-ssss'.
+        char_sets (dict): Наборы символов для отдельных классов.
+        exclude_ambiguous (bool): Исключить похожие символы.
+            По умолчанию False.
+
+    Returns:
+        tuple: Сегменты (алфавит, количество).
+
+    Raises:
+        ValueError: Если шаблон некорректен или длина пароля недопустима.
+
+    Example:
+        >>> compile_pattern('dd-d{2}')
+        (('0123456789', 2), ('-', 1), ('0123456789', 2))
+    """
+    return _compile_pattern(pattern,
+                            tuple(sorted(dict(char_sets or {}).items())),
+                            bool(exclude_ambiguous)
+                            )
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern, char_sets, exclude_ambiguous):
+    """Разбирает шаблон; результат кэшируется по параметрам."""
+    sets = dict(CHAR_SETS, **dict(char_sets))
+    plan = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        index += 1
+        if char == '\\':
+            if index == len(pattern):
+                raise ValueError("Шаблон заканчивается символом '\\'")
+            alphabet = compile_alphabet(pattern[index])
+            index += 1
+        elif char in PATTERN_PLACEHOLDERS:
+            alphabet = compile_alphabet(PATTERN_PLACEHOLDERS[char](sets),
+                                        exclude_ambiguous)
+        else:
+            alphabet = compile_alphabet(char)
+
+        count = 1
+        if pattern.startswith('{', index):
+            end = pattern.find('}', index)
+            if end < 0 or not pattern[index + 1:end].isdigit():
+                raise ValueError("Некорректное количество повторов в шаблоне")
+            count = int(pattern[index + 1:end])
+            index = end + 1
+
+        if plan and plan[-1][0] == alphabet:
+            plan[-1] = (alphabet, plan[-1][1] + count)
+        elif count:
+            plan.append((alphabet, count))
+
+    validate_length(sum(count for _, count in plan))
+    return tuple(plan)
 
 
 class PasswordGenerator:
@@ -14,30 +129,67 @@ class PasswordGenerator:
 
     Attributes:
         char_sets (dict): Словарь с наборами символов для паролей.
+        exclude_ambiguous (bool): Исключать похожие символы (0/O, 1/l/I).
+        source (RandomSource): Источник случайных байт.
+        backend (str): Используемая реализация пакетной генерации.
     """
 
-    def __init__(self):
-        """Инициализирует генератор с наборами символов."""
-        self.char_sets = {
-            'lowercase': string.ascii_lowercase,
-            'uppercase': string.ascii_uppercase,
-            'digits': string.digits,
-            'special': '!@#$%^&*()_+-=[]{}|;:,.<>?'
-        }
+    def __init__(self,
+                 source=None,
+                 backend='python',
+                 char_sets=None,
+                 exclude_ambiguous=False
+                 ):
+        """Инициализирует генератор с наборами символов.
+
+        Args:
+            source (RandomSource): Источник случайных байт. По умолчанию
+                криптостойкий SystemRandomSource. SeededRandomSource
+                допустим только в тестах и бенчмарках.
+            backend (str): 'python' или 'numpy'. Если NumPy не
+                установлен, используется 'python'. По умолчанию 'python'.
+            char_sets (dict): Наборы символов для отдельных классов
+                ('lowercase', 'uppercase', 'digits', 'special'),
+                заменяющие наборы по умолчанию.
+            exclude_ambiguous (bool): Исключать похожие символы.
+                По умолчанию False.
+
+        Raises:
+            ValueError: Если реализация или набор символов некорректны.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Неизвестная реализация генерации: {backend}")
+        if backend == 'numpy' and not numpy_backend.is_available():
+            backend = 'python'
+
+        # Проверяем наборы сразу, а не при первой генерации
+        get_policy(char_sets=char_sets, exclude_ambiguous=exclude_ambiguous)
+
+        self.char_sets = dict(CHAR_SETS, **(char_sets or {}))
+        self.exclude_ambiguous = exclude_ambiguous
+        self.source = source or SystemRandomSource()
+        self.backend = backend
+        self._custom_sets = char_sets
 
     def generate_password(self,
                           length=12,
                           use_uppercase=True,
                           use_digits=True,
-                          use_special=True
+                          use_special=True,
+                          policy=None
                           ):
         """Генерирует пароль с заданными параметрами.
 
+        Каждый выбранный тип символов представлен в пароле не меньше
+        заданного в политике количества раз (по умолчанию один).
+
         Args:
             length (int): Длина пароля. По умолчанию 12.
             use_uppercase (bool): Заглавные буквы. По умолчанию True.
             use_digits (bool): Цифры. По умолчанию True.
             use_special (bool): Специальные символы. По умолчанию True.
+            policy (PasswordPolicy): Готовая политика. Если указана,
+                остальные параметры игнорируются.
 
         Returns:
             str: Сгенерированный пароль.
@@ -47,71 +199,626 @@ class PasswordGenerator:
             Exception: При ошибках генерации.
         """
         try:
-            validate_length(length)
+            policy = policy or self._get_policy(length,
+                                                use_uppercase,
+                                                use_digits,
+                                                use_special
+                                                )
+            return self._generate_chunk(1, policy)[0]
 
-            # Базовый набор символов (всегда есть строчные буквы)
-            characters = self.char_sets['lowercase']
+        except Exception as e:
+            raise Exception(f"Ошибка при генерации пароля: {str(e)}")
 
-            # Добавляем дополнительные наборы символов
-            if use_uppercase:
-                characters += self.char_sets['uppercase']
-            if use_digits:
-                characters += self.char_sets['digits']
-            if use_special:
-                characters += self.char_sets['special']
+    def generate_from_pattern(self, pattern):
+        """Генерирует пароль по шаблону.
 
-            # Проверяем, что есть хотя бы один набор символов
-            if not characters:
-                raise ValueError("Выберите хотя бы один тип символов")
+        Args:
+            pattern (str): Шаблон, см. compile_pattern.
 
-            # Генерируем пароль
-            password = ''.join(rn.choice(characters) for _ in range(length))
+        Returns:
+            str: Сгенерированный пароль.
 
-            # Гарантируем, что пароль содержит выбранные типы символов
-            password = self._ensure_character_types(
-                password, use_uppercase, use_digits, use_special
-            )
+        Raises:
+            Exception: При некорректном шаблоне.
+
+        Example:
+            >>> PasswordGenerator().generate_from_pattern('Cvcc-dddd')
+            'Boqx-4821'
+        """
+        try:
+            return self._run_plan(self._compile(pattern), 1)[0]
+        except Exception as e:
+            raise Exception(f"Ошибка при генерации по шаблону: {str(e)}")
+
+    def iter_pattern_batches(self,
+                             count,
+                             pattern,
+                             chunk_size=BATCH_CHUNK_SIZE
+                             ):
+        """Лениво генерирует пароли по шаблону порциями.
+
+        Шаблон разбирается один раз, дальше каждая порция выполняется по
+        готовому плану.
+
+        Args:
+            count (int): Общее количество паролей.
+            pattern (str): Шаблон, см. compile_pattern.
+            chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+
+        Yields:
+            list: Очередная порция паролей.
 
-            return password
+        Raises:
+            Exception: При некорректном шаблоне.
+        """
+        try:
+            plan = self._compile(pattern)
+        except Exception as e:
+            raise Exception(f"Ошибка при генерации по шаблону: {str(e)}")
+
+        remaining = count
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield self._run_plan(plan, size)
+            remaining -= size
+
+    def generate_passphrase(self, words=6, wordlist=None, separator='-'):
+        """Генерирует парольную фразу в стиле diceware.
+
+        Слова выбираются равномерно из словаря, отображенного в память,
+        поэтому выбор каждого слова стоит O(1) без загрузки словаря.
+
+        Args:
+            words (int): Количество слов. По умолчанию 6.
+            wordlist: Путь к словарю (текстовому или скомпилированному)
+                или уже открытый Wordlist.
+            separator (str): Разделитель слов. По умолчанию '-'.
+
+        Returns:
+            str: Сгенерированная парольная фраза.
+
+        Raises:
+            Exception: При некорректных параметрах или ошибках словаря.
+
+        Example:
+            >>> generator = PasswordGenerator()
+            >>> generator.generate_passphrase(4, 'eff_large_wordlist.txt')
+            'abacus-unfold-rebel-pacify'
+        """
+        try:
+            if not MIN_PASSPHRASE_WORDS <= words <= MAX_PASSPHRASE_WORDS:
+                raise ValueError(
+                    f"Количество слов должно быть от {MIN_PASSPHRASE_WORDS} "
+                    f"до {MAX_PASSPHRASE_WORDS}"
+                )
+            if wordlist is None:
+                raise ValueError("Не указан файл словаря")
+            if isinstance(wordlist, str):
+                wordlist = load_wordlist(wordlist)
+
+            size = len(wordlist)
+            return separator.join(wordlist[self.source.randbelow(size)]
+                                  for _ in range(words))
 
         except Exception as e:
-            raise Exception(f"Ошибка при генерации пароля: {str(e)}")
+            raise Exception(f"Ошибка при генерации парольной фразы: {str(e)}")
 
-    def _ensure_character_types(self,
-                                password,
-                                use_uppercase,
-                                use_digits,
-                                use_special
+    def iter_passphrase_batches(self,
+                                count,
+                                words=6,
+                                wordlist=None,
+                                separator='-',
+                                chunk_size=BATCH_CHUNK_SIZE
                                 ):
-        """Гарантирует, что пароль содержит все выбранные типы символов.
+        """Лениво генерирует парольные фразы порциями.
 
         Args:
-            password (str): Исходный пароль.
-            use_uppercase (bool): Нужны ли заглавные буквы.
-            use_digits (bool): Нужны ли цифры.
-            use_special (bool): Нужны ли спецсимволы.
+            count (int): Общее количество фраз.
+            words (int): Количество слов. По умолчанию 6.
+            wordlist: Путь к словарю или открытый Wordlist.
+            separator (str): Разделитель слов. По умолчанию '-'.
+            chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+
+        Yields:
+            list: Очередная порция парольных фраз.
+        """
+        if isinstance(wordlist, str):
+            try:
+                wordlist = load_wordlist(wordlist)
+            except Exception as e:
+                raise Exception(
+                    f"Ошибка при генерации парольной фразы: {str(e)}"
+                )
+
+        remaining = count
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield [self.generate_passphrase(words, wordlist, separator)
+                   for _ in range(size)]
+            remaining -= size
+
+    def generate_pronounceable(self,
+                               length=12,
+                               use_uppercase=True,
+                               use_digits=True,
+                               use_special=True,
+                               policy=None
+                               ):
+        """Генерирует произносимый пароль по марковской модели.
+
+        Буквенная часть строится по тройкам букв встроенного корпуса.
+        Минимумы политики соблюдаются так: нужное количество случайных
+        букв делается заглавными, а обязательные цифры и спецсимволы
+        добавляются в конец в случайном порядке, чтобы не ломать слоги.
+
+        Args:
+            length (int): Длина пароля. По умолчанию 12.
+            use_uppercase (bool): Заглавные буквы. По умолчанию True.
+            use_digits (bool): Цифры. По умолчанию True.
+            use_special (bool): Специальные символы. По умолчанию True.
+            policy (PasswordPolicy): Готовая политика. Если указана,
+                остальные параметры игнорируются.
 
         Returns:
-            str: Пароль с гарантированными типами символов.
+            str: Сгенерированный пароль.
+
+        Raises:
+            ValueError: Если у генератора или политики заданы свои наборы
+                символов, алфавит или исключение похожих символов: буквы
+                модели берутся из встроенного корпуса и их не учитывают.
+            Exception: При некорректных параметрах или ошибках генерации.
+
+        Example:
+            >>> PasswordGenerator().generate_pronounceable(12)
+            'Vantorel#4ba'
         """
-        password_list = list(password)
+        self._check_pronounceable(policy)
+        try:
+            policy = policy or self._get_policy(length,
+                                                use_uppercase,
+                                                use_digits,
+                                                use_special
+                                                )
+            minimums = dict(zip((name for name, _ in policy.classes),
+                                policy.min_counts))
+
+            class_chars = dict(policy.classes)
+            suffix = []
+            for name in ('digits', 'special'):
+                chars = class_chars.get(name, '')
+                suffix.extend(chars[self.source.randbelow(len(chars))]
+                              for _ in range(minimums.get(name, 0)))
+            for i in range(len(suffix) - 1, 0, -1):
+                j = self.source.randbelow(i + 1)
+                suffix[i], suffix[j] = suffix[j], suffix[i]
 
-        if use_uppercase and not any(c in self.char_sets['uppercase']
-                                     for c in password
-                                     ):
-            index = rn.randint(0, len(password_list) - 1)
-            password_list[index] = rn.choice(self.char_sets['uppercase'])
+            letters = list(load_markov_model().generate(
+                policy.length - len(suffix), self.source
+            ))
+            # Делаем заглавными нужное количество разных позиций
+            positions = list(range(len(letters)))
+            for _ in range(min(minimums.get('uppercase', 0), len(letters))):
+                index = positions.pop(self.source.randbelow(len(positions)))
+                letters[index] = letters[index].upper()
 
-        if use_digits and not any(c in self.char_sets['digits']
-                                  for c in password
-                                  ):
-            index = rn.randint(0, len(password_list) - 1)
-            password_list[index] = rn.choice(self.char_sets['digits'])
+            return ''.join(letters + suffix)
 
-        if use_special and not any(c in self.char_sets['special']
-                                   for c in password
+        except Exception as e:
+            raise Exception(
+                f"Ошибка при генерации произносимого пароля: {str(e)}"
+            )
+
+    def _check_pronounceable(self, policy):
+        """Проверяет, что наборы символов совместимы с произносимым режимом.
+
+        Args:
+            policy (PasswordPolicy): Готовая политика или None.
+
+        Raises:
+            ValueError: Если заданы свои наборы символов, алфавит или
+                исключение похожих символов.
+        """
+        custom = (self._custom_sets or self.exclude_ambiguous or
+                  (policy is not None and (policy.custom_alphabet or
+                                           policy.char_sets or
+                                           policy.exclude_ambiguous)))
+        if custom:
+            raise ValueError("Свои наборы символов и исключение похожих "
+                             "символов недоступны для произносимых паролей")
+
+    def iter_pronounceable_batches(self,
+                                   count,
+                                   length=12,
+                                   use_uppercase=True,
+                                   use_digits=True,
+                                   use_special=True,
+                                   policy=None,
+                                   chunk_size=BATCH_CHUNK_SIZE
                                    ):
-            index = rn.randint(0, len(password_list) - 1)
-            password_list[index] = rn.choice(self.char_sets['special'])
+        """Лениво генерирует произносимые пароли порциями.
+
+        Args:
+            count (int): Общее количество паролей.
+            length (int): Длина пароля. По умолчанию 12.
+            use_uppercase (bool): Заглавные буквы. По умолчанию True.
+            use_digits (bool): Цифры. По умолчанию True.
+            use_special (bool): Специальные символы. По умолчанию True.
+            policy (PasswordPolicy): Готовая политика. Если указана,
+                остальные параметры игнорируются.
+            chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+
+        Yields:
+            list: Очередная порция паролей.
+        """
+        self._check_pronounceable(policy)
+        policy = policy or self._get_policy(length,
+                                            use_uppercase,
+                                            use_digits,
+                                            use_special
+                                            )
+        remaining = count
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield [self.generate_pronounceable(policy=policy)
+                   for _ in range(size)]
+            remaining -= size
+
+    def generate_token(self, nbytes=32, encoding='base64url'):
+        """Генерирует секретный токен из случайных байт.
+
+        Байты берутся из источника и кодируются целиком, без выбора
+        отдельных символов, поэтому длина ограничена validate_token_length,
+        а не validate_length.
+
+        Args:
+            nbytes (int): Количество случайных байт. По умолчанию 32.
+            encoding (str): 'hex', 'base32', 'base64url' или 'z85'.
+                По умолчанию 'base64url'.
+
+        Returns:
+            str: Закодированный токен.
+
+        Raises:
+            Exception: При некорректных параметрах.
+
+        Example:
+            >>> len(PasswordGenerator().generate_token(32, 'hex'))
+            64
+        """
+        try:
+            validate_token_length(nbytes)
+            return encode_token(self.source.read(nbytes), encoding)
+        except Exception as e:
+            raise Exception(f"Ошибка при генерации токена: {str(e)}")
+
+    def iter_token_batches(self,
+                           count,
+                           nbytes=32,
+                           encoding='base64url',
+                           chunk_size=BATCH_CHUNK_SIZE
+                           ):
+        """Лениво генерирует секретные токены порциями.
+
+        Байты каждой порции читаются одним блоком и кодируются одним
+        вызовом, если размер токена кратен группе кодировки.
+
+        Args:
+            count (int): Общее количество токенов.
+            nbytes (int): Количество случайных байт токена.
+            encoding (str): Кодировка токена.
+            chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+
+        Yields:
+            list: Очередная порция токенов.
+
+        Raises:
+            Exception: При некорректных параметрах.
+        """
+        try:
+            validate_token_length(nbytes)
+            # Проверяем кодировку до начала генерации
+            encode_token(bytes(nbytes), encoding)
+        except Exception as e:
+            raise Exception(f"Ошибка при генерации токена: {str(e)}")
+
+        # Порция ограничена и по байтам, чтобы длинные токены не
+        # занимали много памяти
+        chunk_size = max(1, min(chunk_size, (1 << 24) // nbytes))
+        remaining = count
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield encode_tokens(self.source.read(size * nbytes),
+                                nbytes,
+                                encoding
+                                )
+            remaining -= size
+
+    def generate_batch(self,
+                       count,
+                       length=12,
+                       use_uppercase=True,
+                       use_digits=True,
+                       use_special=True,
+                       policy=None,
+                       unique=False
+                       ):
+        """Генерирует сразу несколько паролей с одинаковыми параметрами.
+
+        Случайные байты берутся из буфера источника и переводятся в
+        символы алфавита одним вызовом bytes.translate. Байты, выходящие
+        за последний полный период алфавита, отбрасываются, поэтому
+        распределение символов равномерное.
+
+        Args:
+            count (int): Количество паролей.
+            length (int): Длина пароля. По умолчанию 12.
+            use_uppercase (bool): Заглавные буквы. По умолчанию True.
+            use_digits (bool): Цифры. По умолчанию True.
+            use_special (bool): Специальные символы. По умолчанию True.
+            policy (PasswordPolicy): Готовая политика. Если указана,
+                остальные параметры игнорируются.
+            unique (bool): Гарантировать отсутствие повторов.
+                По умолчанию False.
+
+        Returns:
+            list: Список сгенерированных паролей.
+
+        Raises:
+            Exception: При некорректных параметрах или ошибках генерации.
+
+        Example:
+            >>> generator = PasswordGenerator()
+            >>> len(generator.generate_batch(1000, length=16))
+            1000
+        """
+        passwords = []
+        for chunk in self.iter_batches(count,
+                                       length=length,
+                                       use_uppercase=use_uppercase,
+                                       use_digits=use_digits,
+                                       use_special=use_special,
+                                       policy=policy,
+                                       chunk_size=count,
+                                       unique=unique
+                                       ):
+            passwords.extend(chunk)
+        return passwords
+
+    def iter_passwords(self,
+                       count,
+                       length=12,
+                       use_uppercase=True,
+                       use_digits=True,
+                       use_special=True,
+                       policy=None,
+                       chunk_size=BATCH_CHUNK_SIZE,
+                       unique=False
+                       ):
+        """Лениво генерирует пароли по одному.
+
+        Пароли создаются порциями по chunk_size штук, поэтому в памяти
+        одновременно находится не больше одной порции, сколько бы паролей
+        ни было запрошено.
+
+        Args:
+            count (int): Количество паролей.
+            length (int): Длина пароля. По умолчанию 12.
+            use_uppercase (bool): Заглавные буквы. По умолчанию True.
+            use_digits (bool): Цифры. По умолчанию True.
+            use_special (bool): Специальные символы. По умолчанию True.
+            policy (PasswordPolicy): Готовая политика. Если указана,
+                остальные параметры игнорируются.
+            chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+            unique (bool): Гарантировать отсутствие повторов.
+                По умолчанию False.
+
+        Yields:
+            str: Очередной пароль.
+
+        Example:
+            >>> generator = PasswordGenerator()
+            >>> for password in generator.iter_passwords(3):
+            ...     print(password)
+        """
+        for chunk in self.iter_batches(count,
+                                       length=length,
+                                       use_uppercase=use_uppercase,
+                                       use_digits=use_digits,
+                                       use_special=use_special,
+                                       policy=policy,
+                                       chunk_size=chunk_size,
+                                       unique=unique
+                                       ):
+            yield from chunk
+
+    def iter_batches(self,
+                     count,
+                     length=12,
+                     use_uppercase=True,
+                     use_digits=True,
+                     use_special=True,
+                     policy=None,
+                     chunk_size=BATCH_CHUNK_SIZE,
+                     unique=False,
+                     exact_limit=DEFAULT_EXACT_LIMIT
+                     ):
+        """Лениво генерирует пароли порциями.
+
+        При unique=True повторы отсеиваются фильтром DedupeFilter и
+        заменяются новыми паролями, поэтому порции могут быть короче
+        chunk_size, но всего будет ровно count разных паролей.
+
+        Args:
+            count (int): Общее количество паролей.
+            length (int): Длина пароля. По умолчанию 12.
+            use_uppercase (bool): Заглавные буквы. По умолчанию True.
+            use_digits (bool): Цифры. По умолчанию True.
+            use_special (bool): Специальные символы. По умолчанию True.
+            policy (PasswordPolicy): Готовая политика. Если указана,
+                остальные параметры игнорируются.
+            chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+            unique (bool): Гарантировать отсутствие повторов.
+                По умолчанию False.
+            exact_limit (int): Размер точного множества фильтра повторов,
+                после которого используется фильтр Блума.
+
+        Yields:
+            list: Очередная порция паролей (не больше chunk_size штук).
+
+        Raises:
+            Exception: При некорректных параметрах или ошибках генерации.
+            ValueError: Если при unique новые пароли не появляются
+                MAX_STALLED_CHUNKS порций подряд (пространство исчерпано).
+        """
+        try:
+            policy = policy or self._get_policy(length,
+                                                use_uppercase,
+                                                use_digits,
+                                                use_special
+                                                )
+            if count < 1:
+                raise ValueError("Количество паролей должно быть не менее 1")
+            if chunk_size < 1:
+                raise ValueError("Размер порции должен быть не менее 1")
+            if unique and count > policy.space_size:
+                raise ValueError("Уникальных паролей меньше, чем запрошено")
+            seen = (DedupeFilter(exact_limit, capacity=count)
+                    if unique else None)
+        except Exception as e:
+            raise Exception(f"Ошибка при пакетной генерации паролей: {str(e)}")
+
+        remaining = count
+        stalled = 0
+        while remaining > 0:
+            if seen is None:
+                chunk = self._generate_chunk(min(chunk_size, remaining),
+                                             policy)
+            else:
+                # Порция всегда полная: ближе к исчерпанию пространства
+                # порция из нескольких паролей почти не дает новых
+                chunk = seen.filter(self._generate_chunk(chunk_size,
+                                                         policy))[:remaining]
+                if not chunk:
+                    stalled += 1
+                    if stalled >= MAX_STALLED_CHUNKS:
+                        raise ValueError(
+                            "Новые уникальные пароли не появляются "
+                            f"{MAX_STALLED_CHUNKS} порций подряд: получено "
+                            f"{count - remaining} из {count}"
+                        )
+                    continue
+                stalled = 0
+            yield chunk
+            remaining -= len(chunk)
+
+    def _get_policy(self, length, use_uppercase, use_digits, use_special):
+        """Возвращает политику с наборами символов генератора.
+
+        Args:
+            length (int): Длина пароля.
+            use_uppercase (bool): Заглавные буквы.
+            use_digits (bool): Цифры.
+            use_special (bool): Специальные символы.
+
+        Returns:
+            PasswordPolicy: Закэшированная политика.
+        """
+        return get_policy(length,
+                          use_uppercase,
+                          use_digits,
+                          use_special,
+                          char_sets=self._custom_sets,
+                          exclude_ambiguous=self.exclude_ambiguous
+                          )
+
+    def _compile(self, pattern):
+        """Возвращает план шаблона с наборами символов генератора."""
+        return compile_pattern(pattern,
+                               self._custom_sets,
+                               self.exclude_ambiguous
+                               )
+
+    def _run_plan(self, plan, count):
+        """Генерирует порцию паролей по плану шаблона.
+
+        Для каждого сегмента случайные символы всей порции берутся одним
+        блоком, после чего пароли собираются из столбцов.
+
+        Args:
+            plan (tuple): Сегменты (алфавит, количество).
+            count (int): Количество паролей.
+
+        Returns:
+            list: Список паролей.
+        """
+        columns = []
+        for alphabet, size in plan:
+            if len(alphabet) == 1:
+                columns.append((alphabet * size,) * count)
+                continue
+            table, rejected = _build_translation(alphabet.encode('ascii'))
+            text = self.source.sample(count * size,
+                                      table,
+                                      rejected
+                                      ).decode('ascii')
+            columns.append([text[start:start + size]
+                            for start in range(0, count * size, size)])
+        return [''.join(parts) for parts in zip(*columns)]
+
+    def _generate_chunk(self, count, policy):
+        """Генерирует порцию паролей по скомпилированной политике.
+
+        Генерация выполняется за один проход: сначала в каждый пароль
+        ставятся обязательные символы каждого класса, затем свободные
+        позиции заполняются символами всего алфавита, после чего пароль
+        перемешивается алгоритмом Фишера-Йетса. Повторных проверок и
+        перегенерации нет, стоимость O(length) при любых минимумах.
+
+        Args:
+            count (int): Количество паролей.
+            policy (PasswordPolicy): Политика генерации.
+
+        Returns:
+            list: Список паролей.
+        """
+        # Для одного пароля накладные расходы NumPy не окупаются
+        if self.backend == 'numpy' and count > 1:
+            return numpy_backend.generate_chunk(count, policy, self.source)
+
+        # Блоки случайных символов: по одному на класс и один общий
+        segments = []
+        for (table, rejected), minimum in zip(policy.class_tables,
+                                              policy.min_counts):
+            if minimum:
+                segments.append((minimum, self.source.sample(
+                    count * minimum, table, rejected
+                )))
+        if policy.free_count:
+            segments.append((policy.free_count, self.source.sample(
+                count * policy.free_count,
+                policy.translate_table,
+                policy.rejected
+            )))
+
+        if len(segments) == 1:
+            # Без обязательных классов символы уже независимы и равномерны
+            size, chars = segments[0]
+            return [chars[start:start + size].decode('ascii')
+                    for start in range(0, count * size, size)]
+
+        # Случайные индексы для каждого шага перемешивания
+        swaps = [(i, self.source.sample(count, table, rejected))
+                 for i, (table, rejected)
+                 in enumerate(policy.shuffle_tables)][:0:-1]
+
+        passwords = []
+        for index in range(count):
+            chars = bytearray()
+            for size, block in segments:
+                chars += block[index * size:(index + 1) * size]
+            for i, targets in swaps:
+                j = targets[index]
+                chars[i], chars[j] = chars[j], chars[i]
+            passwords.append(chars.decode('ascii'))
 
-        return ''.join(password_list)
+        return passwords
@@ -0,0 +1,401 @@
+"""
+Модуль с функциями формирования ключа (KDF) для хэширования паролей.
+
+Содержит реализации PBKDF2 и scrypt и самоописывающий формат хэша в стиле
+PHC, в котором вместе с солью хранятся алгоритм и его параметры:
+
+    $pbkdf2-sha256$i=100000$<соль>$<хэш>
+    $scrypt$ln=14,r=8,p=1$<соль>$<хэш>
+
+Алгоритм и параметры для новых хэшей задаются в конфигурации
+(переменные окружения или файл .env).
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Алгоритм по умолчанию и параметры, если они не заданы в конфигурации
+DEFAULT_KDF = 'pbkdf2'
+DEFAULT_PBKDF2_ITERATIONS = 100000
+DEFAULT_SCRYPT_LN = 14
+DEFAULT_SCRYPT_R = 8
+DEFAULT_SCRYPT_P = 1
+
+# Параметры старого формата "salt$hash"
+LEGACY_ITERATIONS = 100000
+
+# Размер соли и хэша в байтах
+SALT_SIZE = 16
+HASH_SIZE = 32
+
+# Пределы параметров: хэш из базы не должен заставить считать KDF
+# бесконечно долго или занять всю память
+MAX_PBKDF2_ITERATIONS = 100000000
+MAX_SCRYPT_LN = 24
+MAX_SCRYPT_MEMORY = 1 << 30
+
+
+def _b64encode(data):
+    """Кодирует байты в base64 без дополнения, как принято в PHC."""
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(text):
+    """Декодирует base64 без дополнения."""
+    return base64.b64decode(text + '=' * (-len(text) % 4), validate=True)
+
+
+def _parse_params(params):
+    """Разбирает строку параметров вида 'ln=14,r=8,p=1'.
+
+    Args:
+        params (str): Строка параметров.
+
+    Returns:
+        dict: Параметры с целыми значениями.
+
+    Raises:
+        ValueError: Если строка некорректна.
+    """
+    result = {}
+    for item in params.split(','):
+        name, _, value = item.partition('=')
+        if not name or not value.isdigit():
+            raise ValueError(f"Некорректный параметр KDF: {item}")
+        result[name] = int(value)
+    return result
+
+
+class KDF:
+    """Базовый класс функции формирования ключа.
+
+    Подклассы задают name, ident, params и derive. Экземпляры сравниваются
+    по алгоритму и параметрам, по ним же определяется, устарел ли хэш.
+
+    Attributes:
+        name (str): Имя алгоритма в конфигурации.
+    """
+
+    name = None
+
+    @property
+    def ident(self):
+        """str: Идентификатор алгоритма в формате PHC."""
+        raise NotImplementedError
+
+    @property
+    def params(self):
+        """str: Параметры алгоритма в формате PHC."""
+        raise NotImplementedError
+
+    @property
+    def prefix(self):
+        """str: Начало хэша с этими алгоритмом и параметрами."""
+        return f"${self.ident}${self.params}$"
+
+    def derive(self, password, salt, size=HASH_SIZE):
+        """Вычисляет ключ из пароля.
+
+        Args:
+            password (bytes): Пароль.
+            salt (bytes): Соль.
+            size (int): Длина ключа в байтах.
+
+        Returns:
+            bytes: Ключ.
+        """
+        raise NotImplementedError
+
+    def hash(self, password):
+        """Хэширует пароль со случайной солью.
+
+        Args:
+            password (str): Пароль.
+
+        Returns:
+            str: Хэш в формате PHC.
+        """
+        salt = os.urandom(SALT_SIZE)
+        digest = self.derive(password.encode('utf-8'), salt)
+        return f"{self.prefix}{_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password, salt, digest):
+        """Проверяет пароль по соли и сохраненному ключу.
+
+        Args:
+            password (str): Пароль.
+            salt (bytes): Соль.
+            digest (bytes): Сохраненный ключ.
+
+        Returns:
+            bool: True если пароль верный.
+        """
+        candidate = self.derive(password.encode('utf-8'), salt, len(digest))
+        return hmac.compare_digest(candidate, digest)
+
+    def __eq__(self, other):
+        if not isinstance(other, KDF):
+            return NotImplemented
+        return (self.ident, self.params) == (other.ident, other.params)
+
+    def __hash__(self):
+        return hash((self.ident, self.params))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.ident}, {self.params})"
+
+
+class Pbkdf2KDF(KDF):
+    """PBKDF2-HMAC из hashlib.
+
+    Attributes:
+        iterations (int): Количество итераций.
+        digest (str): Хэш-функция HMAC ('sha256' или 'sha512').
+    """
+
+    name = 'pbkdf2'
+
+    def __init__(self, iterations=DEFAULT_PBKDF2_ITERATIONS, digest='sha256'):
+        """Проверяет параметры PBKDF2.
+
+        Args:
+            iterations (int): Количество итераций.
+                По умолчанию DEFAULT_PBKDF2_ITERATIONS.
+            digest (str): Хэш-функция HMAC. По умолчанию 'sha256'.
+
+        Raises:
+            ValueError: Если параметры вне допустимых пределов.
+        """
+        if not 1 <= iterations <= MAX_PBKDF2_ITERATIONS:
+            raise ValueError(f"Недопустимое число итераций: {iterations}")
+        if digest not in ('sha256', 'sha512'):
+            raise ValueError(f"Недопустимая хэш-функция PBKDF2: {digest}")
+        self.iterations = iterations
+        self.digest = digest
+
+    @property
+    def ident(self):
+        return f"pbkdf2-{self.digest}"
+
+    @property
+    def params(self):
+        return f"i={self.iterations}"
+
+    def derive(self, password, salt, size=HASH_SIZE):
+        return hashlib.pbkdf2_hmac(self.digest,
+                                   password,
+                                   salt,
+                                   self.iterations,
+                                   size
+                                   )
+
+    @classmethod
+    def from_config(cls):
+        """Создает PBKDF2 с параметрами из конфигурации."""
+        return cls(int(os.getenv('PASSGEN_PBKDF2_ITERATIONS',
+                                 DEFAULT_PBKDF2_ITERATIONS)))
+
+    def to_config(self):
+        """Возвращает параметры в виде переменных конфигурации."""
+        return {'PASSGEN_KDF': self.name,
+                'PASSGEN_PBKDF2_ITERATIONS': str(self.iterations)}
+
+    @classmethod
+    def from_phc(cls, ident, params):
+        """Создает PBKDF2 по идентификатору и параметрам из хэша."""
+        return cls(_parse_params(params)['i'], ident[len('pbkdf2-'):])
+
+
+class ScryptKDF(KDF):
+    """scrypt из hashlib.
+
+    Attributes:
+        ln (int): log2 параметра стоимости N.
+        r (int): Размер блока.
+        p (int): Параллельность.
+    """
+
+    name = 'scrypt'
+
+    def __init__(self, ln=DEFAULT_SCRYPT_LN, r=DEFAULT_SCRYPT_R,
+                 p=DEFAULT_SCRYPT_P):
+        """Проверяет параметры scrypt.
+
+        Args:
+            ln (int): log2(N). По умолчанию DEFAULT_SCRYPT_LN.
+            r (int): Размер блока. По умолчанию DEFAULT_SCRYPT_R.
+            p (int): Параллельность. По умолчанию DEFAULT_SCRYPT_P.
+
+        Raises:
+            ValueError: Если параметры вне допустимых пределов.
+        """
+        if not 1 <= ln <= MAX_SCRYPT_LN or r < 1 or p < 1:
+            raise ValueError(f"Недопустимые параметры scrypt: {ln}, {r}, {p}")
+        if self._memory(ln, r, p) > MAX_SCRYPT_MEMORY:
+            raise ValueError("Параметры scrypt требуют слишком много памяти")
+        self.ln = ln
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def _memory(ln, r, p):
+        # Оценка памяти scrypt с запасом: 128 * r * (N + p + 2) байт
+        return 128 * r * ((1 << ln) + p + 2)
+
+    @property
+    def ident(self):
+        return 'scrypt'
+
+    @property
+    def params(self):
+        return f"ln={self.ln},r={self.r},p={self.p}"
+
+    def derive(self, password, salt, size=HASH_SIZE):
+        return hashlib.scrypt(password,
+                              salt=salt,
+                              n=1 << self.ln,
+                              r=self.r,
+                              p=self.p,
+                              maxmem=self._memory(self.ln, self.r, self.p)
+                              + (1 << 20),
+                              dklen=size
+                              )
+
+    @classmethod
+    def from_config(cls):
+        """Создает scrypt с параметрами из конфигурации."""
+        return cls(int(os.getenv('PASSGEN_SCRYPT_LN', DEFAULT_SCRYPT_LN)),
+                   int(os.getenv('PASSGEN_SCRYPT_R', DEFAULT_SCRYPT_R)),
+                   int(os.getenv('PASSGEN_SCRYPT_P', DEFAULT_SCRYPT_P)))
+
+    def to_config(self):
+        """Возвращает параметры в виде переменных конфигурации."""
+        return {'PASSGEN_KDF': self.name,
+                'PASSGEN_SCRYPT_LN': str(self.ln),
+                'PASSGEN_SCRYPT_R': str(self.r),
+                'PASSGEN_SCRYPT_P': str(self.p)}
+
+    @classmethod
+    def from_phc(cls, ident, params):
+        """Создает scrypt по идентификатору и параметрам из хэша."""
+        values = _parse_params(params)
+        return cls(values['ln'], values['r'], values['p'])
+
+
+# Реализации по имени в конфигурации
+KDF_BACKENDS = {
+    'pbkdf2': Pbkdf2KDF,
+    'scrypt': ScryptKDF,
+}
+
+# Реализации по идентификатору PHC
+_PHC_IDENTS = {
+    'pbkdf2-sha256': Pbkdf2KDF,
+    'pbkdf2-sha512': Pbkdf2KDF,
+    'scrypt': ScryptKDF,
+}
+
+
+def get_kdf(name=None):
+    """Возвращает KDF для новых хэшей.
+
+    Алгоритм берется из переменной PASSGEN_KDF, параметры - из
+    PASSGEN_PBKDF2_ITERATIONS или PASSGEN_SCRYPT_LN/R/P.
+
+    Args:
+        name (str): 'pbkdf2' или 'scrypt'. По умолчанию из конфигурации.
+
+    Returns:
+        KDF: Настроенная функция формирования ключа.
+
+    Raises:
+        ValueError: Если алгоритм неизвестен или параметры некорректны.
+
+    Example:
+        >>> get_kdf('scrypt').params
+        'ln=14,r=8,p=1'
+    """
+    name = name or os.getenv('PASSGEN_KDF', DEFAULT_KDF)
+    if name not in KDF_BACKENDS:
+        raise ValueError(f"Неизвестный алгоритм хэширования: {name}")
+    return KDF_BACKENDS[name].from_config()
+
+
+def needs_rehash(encoded, kdf=None):
+    """Проверяет, устарели ли алгоритм или параметры хэша.
+
+    Args:
+        encoded (str): Сохраненный хэш в любом поддерживаемом формате.
+        kdf (KDF): Текущая функция формирования ключа. По умолчанию из
+            конфигурации.
+
+    Returns:
+        bool: True если хэш старого формата или создан с другими
+        алгоритмом или параметрами.
+
+    Example:
+        >>> needs_rehash('c2FsdA==$aGFzaA==')
+        True
+    """
+    kdf = kdf or get_kdf()
+    return not encoded.startswith(kdf.prefix)
+
+
+def parse_hash(encoded):
+    """Разбирает хэш в формате PHC.
+
+    Args:
+        encoded (str): Хэш вида $<алгоритм>$<параметры>$<соль>$<хэш>.
+
+    Returns:
+        tuple: KDF, соль и ключ.
+
+    Raises:
+        ValueError: Если формат, алгоритм или параметры некорректны.
+    """
+    parts = encoded.split('$')
+    if len(parts) != 5 or parts[0]:
+        raise ValueError("Некорректный формат хэша")
+    _, ident, params, salt, digest = parts
+    if ident not in _PHC_IDENTS:
+        raise ValueError(f"Неизвестный алгоритм хэширования: {ident}")
+    try:
+        kdf = _PHC_IDENTS[ident].from_phc(ident, params)
+        salt, digest = _b64decode(salt), _b64decode(digest)
+    except (KeyError, binascii.Error) as e:
+        raise ValueError(f"Некорректные параметры хэша: {str(e)}")
+    if not salt or not digest:
+        raise ValueError("Пустая соль или хэш")
+    return kdf, salt, digest
+
+
+def verify_legacy(password, encoded):
+    """Проверяет пароль по хэшу старого формата "salt$hash".
+
+    В старом формате соль хранится строкой base64 и используется как есть,
+    алгоритм - PBKDF2-SHA256 с LEGACY_ITERATIONS итерациями.
+
+    Args:
+        password (str): Пароль.
+        encoded (str): Хэш вида "salt$hash".
+
+    Returns:
+        bool: True если пароль верный.
+    """
+    parts = encoded.split('$')
+    if len(parts) != 2 or not parts[0] or not parts[1]:
+        return False
+    salt, stored_hash = parts
+    new_hash = hashlib.pbkdf2_hmac('sha256',
+                                   password.encode('utf-8'),
+                                   salt.encode('utf-8'),
+                                   LEGACY_ITERATIONS
+                                   )
+    return hmac.compare_digest(base64.b64encode(new_hash).decode('utf-8'),
+                               stored_hash)
@@ -0,0 +1,198 @@
+"""
+Модуль с марковской моделью для произносимых паролей.
+
+Модель считает частоты троек букв (по двум предыдущим буквам выбирается
+следующая) на небольшом встроенном корпусе слов. Таблицы переходов
+хранятся в виде накопленных сумм, поэтому выбор каждой буквы - это один
+двоичный поиск. Готовая модель кэшируется на диске в JSON.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from bisect import bisect_right
+
+# Маркеры начала и конца слова
+START = '^'
+END = '$'
+
+# Встроенный корпус для обучения модели
+DEFAULT_CORPUS = """
+able about above access across action active actor adapt admin advance
+after again agent album alert alpha amber anchor angle animal answer
+apple april arena argue armor arrow artist atlas autumn avenue balance
+banana banner barrel basket battle beacon became before begin belong
+better beyond binary bishop blanket border bottle branch bridge bright
+broken bronze bucket budget butter button cabin camera camper candle
+canvas canyon carbon career carpet castle casual cattle celery center
+chapter charge cherry circle citizen clever climate closet cobalt coffee
+collect colony column combat comfort common copper corner cotton county
+credit crystal culture custom danger debate decade delta denim desert
+design detail dinner direct doctor dollar domain donor double dragon
+driver during eager easily editor effort eleven empire enable energy
+engine enough escape estate ever evening exact expert fabric falcon
+family famous farmer father feather fellow figure filter finger forest
+formal forward fossil frozen future galaxy garden garlic gather gentle
+giant ginger global golden gospel gravel guitar hammer handle harbor
+harvest helmet hidden history holiday honest hunter island jacket jungle
+kettle kitchen ladder lagoon lantern laser latin lemon lesson letter
+level liberty limit linen liquid little lizard lobster locker lumber
+magnet mammal manner marble market master meadow melody member mentor
+method middle mirror modern moment monkey mortal motion mountain museum
+napkin narrow nature nectar needle network never nickel noble normal
+number object ocean office olive onion open orange orbit organ origin
+oyster paddle palace panel paper parent parrot pastel pencil pepper
+period pillow pilot planet plastic pocket poem polar police potato
+powder public puzzle rabbit radar random rapid rather reason record
+relax remote repair rescue ribbon river rocket rubber saddle salmon
+sample season second secret select senior settle shadow silver simple
+sister socket solar spider spirit stable summer sunset system tablet
+talent target temple tender theory ticket timber tomato travel turtle
+tunnel united valley velvet vendor violin visual volume walnut wander
+winter wisdom wonder yellow zebra
+"""
+
+
+def cache_dir():
+    """Возвращает каталог кэша passgen.
+
+    Returns:
+        str: Путь из PASSGEN_CACHE_DIR, либо XDG_CACHE_HOME/passgen,
+        либо ~/.cache/passgen.
+    """
+    if os.getenv('PASSGEN_CACHE_DIR'):
+        return os.getenv('PASSGEN_CACHE_DIR')
+    base = os.getenv('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(base, 'passgen')
+
+
+class MarkovModel:
+    """Марковская модель на тройках букв.
+
+    Attributes:
+        transitions (dict): Для каждого контекста из двух символов пара
+            (следующие символы, накопленные частоты).
+    """
+
+    def __init__(self, transitions):
+        """Инициализирует модель готовыми таблицами.
+
+        Args:
+            transitions (dict): Контекст -> (символы, накопленные частоты).
+        """
+        self.transitions = transitions
+
+    @classmethod
+    def train(cls, words):
+        """Обучает модель на списке слов.
+
+        Args:
+            words (iterable): Слова из строчных латинских букв.
+
+        Returns:
+            MarkovModel: Обученная модель.
+        """
+        counts = {}
+        for word in words:
+            text = START * 2 + word + END
+            for i in range(len(text) - 2):
+                following = counts.setdefault(text[i:i + 2], {})
+                following[text[i + 2]] = following.get(text[i + 2], 0) + 1
+
+        transitions = {}
+        for context, following in counts.items():
+            chars = ''.join(sorted(following))
+            cumulative = []
+            total = 0
+            for char in chars:
+                total += following[char]
+                cumulative.append(total)
+            transitions[context] = (chars, cumulative)
+        return cls(transitions)
+
+    def next_char(self, context, source):
+        """Выбирает следующий символ для контекста.
+
+        Args:
+            context (str): Два предыдущих символа.
+            source (RandomSource): Источник случайных данных.
+
+        Returns:
+            str: Следующий символ или END.
+        """
+        chars, cumulative = self.transitions[context]
+        value = source.randbelow(cumulative[-1])
+        return chars[bisect_right(cumulative, value)]
+
+    def generate(self, length, source):
+        """Генерирует произносимую строку из строчных букв.
+
+        Если слово заканчивается раньше нужной длины, начинается
+        следующее слово.
+
+        Args:
+            length (int): Длина строки.
+            source (RandomSource): Источник случайных данных.
+
+        Returns:
+            str: Строка длиной length.
+        """
+        result = []
+        context = START * 2
+        while len(result) < length:
+            char = self.next_char(context, source)
+            if char == END:
+                context = START * 2
+                continue
+            result.append(char)
+            context = context[1] + char
+        return ''.join(result)
+
+    def to_json(self):
+        """Возвращает модель в виде JSON-совместимого словаря."""
+        return {context: [chars, cumulative]
+                for context, (chars, cumulative) in self.transitions.items()}
+
+    @classmethod
+    def from_json(cls, data):
+        """Восстанавливает модель из словаря to_json."""
+        return cls({context: (chars, cumulative)
+                    for context, (chars, cumulative) in data.items()})
+
+
+@functools.lru_cache(maxsize=4)
+def load_markov_model(corpus=DEFAULT_CORPUS):
+    """Возвращает модель для корпуса, используя кэш на диске.
+
+    Кэш-файл называется по хэшу корпуса, поэтому изменение корпуса
+    приводит к переобучению. Ошибки записи кэша не мешают генерации.
+
+    Args:
+        corpus (str): Слова через пробельные символы.
+
+    Returns:
+        MarkovModel: Обученная модель.
+    """
+    digest = hashlib.sha256(corpus.encode('utf-8')).hexdigest()[:16]
+    path = os.path.join(cache_dir(), f'markov-{digest}.json')
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            return MarkovModel.from_json(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+    model = MarkovModel.train(corpus.split())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(model.to_json(), f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+    return model
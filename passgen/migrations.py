@@ -0,0 +1,277 @@
+"""
+Модуль с версионированными миграциями схемы базы данных.
+
+Миграции применяются командой migrate по порядку, каждая в отдельной
+транзакции (построение индексов без блокировки - в режиме autocommit),
+а номера примененных миграций хранятся в таблице schema_version. При
+работе приложения проверяется только версия схемы, один раз на процесс.
+
+Необязательная миграция (триграммные индексы) при отсутствии нужного
+расширения записывается как пропущенная и повторяется при следующем
+запуске migrate; код работает и без нее.
+"""
+
+import threading
+import psycopg2
+import psycopg2.errors
+
+
+class MigrationSkipped(Exception):
+    """Необязательную миграцию нельзя применить на этом сервере."""
+
+
+def _create_trgm_extension(cur):
+    """Устанавливает расширение pg_trgm или пропускает миграцию.
+
+    Без расширения поиск по подстроке выполняется тем же ILIKE, но без
+    индекса, поэтому его отсутствие не мешает работе остальных команд.
+
+    Args:
+        cur (psycopg2.cursor): Курсор подключения.
+
+    Raises:
+        MigrationSkipped: Если расширение не установлено на сервере или
+            нет прав на его создание.
+    """
+    cur.execute(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )
+    if cur.fetchone() is None:
+        raise MigrationSkipped(
+            "Расширение pg_trgm недоступно на сервере PostgreSQL. "
+            "Установите пакет contrib (например, postgresql-contrib) "
+            "и повторите: python main.py migrate"
+        )
+    try:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except psycopg2.errors.InsufficientPrivilege:
+        raise MigrationSkipped(
+            "Нет прав на создание расширения pg_trgm. Выполните "
+            "CREATE EXTENSION pg_trgm от имени владельца базы или "
+            "суперпользователя и повторите: python main.py migrate"
+        )
+
+
+def _index_concurrently(name, definition):
+    """Возвращает шаг миграции, строящий индекс без блокировки записи.
+
+    CREATE INDEX CONCURRENTLY не выполняется внутри транзакции, поэтому
+    такие шаги используются только в миграциях без транзакции. Если
+    прошлая попытка прервалась и оставила недействительный индекс, он
+    удаляется и строится заново.
+
+    Args:
+        name (str): Имя индекса.
+        definition (str): Определение индекса после имени (ON ...).
+
+    Returns:
+        callable: Шаг миграции, принимающий курсор.
+    """
+    def step(cur):
+        cur.execute("""
+            SELECT i.indisvalid FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s
+        """, (name,))
+        row = cur.fetchone()
+        if row is not None and not row[0]:
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        cur.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"
+        )
+    return step
+
+
+# Миграции по порядку: (версия, описание, шаги, в транзакции ли).
+# Шаг - SQL-команда или функция, принимающая курсор. Миграции без
+# транзакции выполняются в режиме autocommit (например, для
+# CREATE INDEX CONCURRENTLY) и должны быть безопасны для повтора.
+# Шаг необязательной миграции может выбросить MigrationSkipped.
+MIGRATIONS = (
+    (1, 'Таблица паролей', (
+        """
+        CREATE TABLE IF NOT EXISTS passwords (
+            id SERIAL PRIMARY KEY,
+            service VARCHAR(255) NOT NULL,
+            username VARCHAR(255) NOT NULL,
+            password_hash TEXT NOT NULL,
+            description TEXT,
+            UNIQUE(service, username)
+        )
+        """,
+    ), True),
+    (2, 'Очередь смены паролей и контрольные точки обхода хэшей', (
+        """
+        CREATE TABLE IF NOT EXISTS rotation_queue (
+            password_id INTEGER PRIMARY KEY
+                REFERENCES passwords(id) ON DELETE CASCADE,
+            reason TEXT NOT NULL,
+            queued_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS rehash_checkpoint (
+            job TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            target TEXT NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+        """,
+    ), True),
+    (3, 'Триграммные индексы для поиска по подстроке', (
+        _create_trgm_extension,
+        _index_concurrently(
+            'passwords_service_trgm',
+            "ON passwords USING gin (service gin_trgm_ops)"
+        ),
+        _index_concurrently(
+            'passwords_username_trgm',
+            "ON passwords USING gin (username gin_trgm_ops)"
+        ),
+    ), False),
+)
+
+# Версия схемы, которую ожидает код
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Ключ блокировки, чтобы миграции не применялись одновременно
+MIGRATION_LOCK_ID = 0x70617373
+
+_checked = False
+_checked_lock = threading.Lock()
+
+
+def current_version(conn):
+    """Возвращает версию схемы базы данных.
+
+    Args:
+        conn (psycopg2.connection): Подключение к базе данных.
+
+    Returns:
+        int: Номер последней примененной (или пропущенной) миграции или
+        0, если миграции не применялись.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return 0
+        cur.execute("SELECT coalesce(max(version), 0) FROM schema_version")
+        return cur.fetchone()[0]
+    finally:
+        cur.close()
+        conn.rollback()
+
+
+def _skipped_versions(cur):
+    """Возвращает номера миграций, записанных как пропущенные."""
+    cur.execute("SELECT version FROM schema_version WHERE skipped")
+    return {row[0] for row in cur.fetchall()}
+
+
+def apply_migrations(conn):
+    """Применяет недостающие миграции по порядку.
+
+    Каждая миграция выполняется в своей транзакции вместе с записью в
+    schema_version; миграции без транзакции выполняются в режиме
+    autocommit, и версия записывается после всех шагов. Пропущенная
+    необязательная миграция записывается с отметкой skipped и
+    повторяется при следующем запуске. На время работы берется
+    advisory-блокировка, поэтому одновременный запуск из нескольких
+    процессов безопасен.
+
+    Args:
+        conn (psycopg2.connection): Подключение к базе данных.
+
+    Returns:
+        list: Тройки (версия, описание, причина пропуска или None)
+        примененных и пропущенных миграций.
+
+    Raises:
+        Exception: При ошибке миграции. Примененные до нее миграции
+            сохраняются.
+    """
+    cur = conn.cursor()
+    applied = []
+    try:
+        cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT now(),
+                skipped BOOLEAN NOT NULL DEFAULT false
+            )
+        """)
+        cur.execute("""
+            ALTER TABLE schema_version
+            ADD COLUMN IF NOT EXISTS skipped BOOLEAN NOT NULL DEFAULT false
+        """)
+        skipped = _skipped_versions(cur)
+        conn.commit()
+
+        version = current_version(conn)
+        for number, description, steps, transactional in MIGRATIONS:
+            if number <= version and number not in skipped:
+                continue
+            if not transactional:
+                conn.autocommit = True
+            try:
+                reason = None
+                try:
+                    for step in steps:
+                        if callable(step):
+                            step(cur)
+                        else:
+                            cur.execute(step)
+                except MigrationSkipped as e:
+                    conn.rollback()
+                    reason = str(e)
+                cur.execute("""
+                    INSERT INTO schema_version (version, description, skipped)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (version) DO UPDATE
+                    SET skipped = EXCLUDED.skipped, applied_at = now()
+                """, (number, description, reason is not None))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise Exception(f"Ошибка в миграции {number}: {str(e)}")
+            finally:
+                if not transactional:
+                    conn.autocommit = False
+            applied.append((number, description, reason))
+
+        return applied
+    finally:
+        conn.rollback()
+        cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+        cur.close()
+
+
+def check_schema_version(conn):
+    """Проверяет, что схема базы не старее ожидаемой кодом.
+
+    Запрос выполняется один раз на процесс, после успешной проверки
+    функция ничего не делает.
+
+    Args:
+        conn (psycopg2.connection): Подключение к базе данных.
+
+    Raises:
+        Exception: Если в базе не применены нужные миграции.
+    """
+    global _checked
+    if _checked:
+        return
+    with _checked_lock:
+        if _checked:
+            return
+        version = current_version(conn)
+        if version < LATEST_VERSION:
+            raise Exception(
+                f"Схема базы данных устарела (версия {version}, нужна "
+                f"{LATEST_VERSION}). Выполните: python main.py migrate"
+            )
+        _checked = True
@@ -0,0 +1,125 @@
+"""
+Модуль для записи паролей в файлы и потоки.
+
+Содержит функции для потоковой записи паролей в форматах lines, csv и jsonl.
+"""
+
+import csv
+from json.encoder import encode_basestring_ascii
+from .utils import score_passwords
+
+# Поддерживаемые форматы вывода
+OUTPUT_FORMATS = ('lines', 'csv', 'jsonl')
+
+# Размер буфера файла при записи (1 МиБ)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def open_output(path):
+    """Открывает файл для потоковой записи с большим буфером.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        io.TextIOWrapper: Открытый на запись файл.
+    """
+    return open(path,
+                'w',
+                encoding='utf-8',
+                newline='',
+                buffering=WRITE_BUFFER_SIZE
+                )
+
+
+def write_passwords(stream, batches, fmt='lines', with_scores=False):
+    """Записывает порции паролей в поток.
+
+    Каждая порция записывается одним вызовом write, поэтому количество
+    системных вызовов не зависит от количества паролей, а память
+    ограничена размером одной порции.
+
+    Args:
+        stream: Текстовый поток для записи.
+        batches (iterable): Итератор порций (списков) паролей.
+        fmt (str): Формат: 'lines', 'csv' или 'jsonl'. По умолчанию 'lines'.
+        with_scores (bool): Добавить энтропию и оценку надежности
+            (score_passwords) к каждому паролю. По умолчанию False.
+
+    Returns:
+        int: Количество записанных паролей.
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+
+    Example:
+        >>> import io
+        >>> buffer = io.StringIO()
+        >>> write_passwords(buffer, [['a1', 'b2']], fmt='jsonl')
+        2
+        >>> buffer.getvalue()
+        '{"password": "a1"}\\n{"password": "b2"}\\n'
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Неизвестный формат вывода: {fmt}")
+
+    if with_scores:
+        return _write_scored(stream, batches, fmt)
+
+    written = 0
+    if fmt == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(['password'])
+        for batch in batches:
+            writer.writerows([password] for password in batch)
+            written += len(batch)
+    elif fmt == 'jsonl':
+        for batch in batches:
+            # Кодируем только строку пароля, без сборки словаря на каждый
+            stream.write(''.join(
+                '{"password": ' + encode_basestring_ascii(password) + '}\n'
+                for password in batch
+            ))
+            written += len(batch)
+    else:
+        for batch in batches:
+            stream.write('\n'.join(batch) + '\n')
+            written += len(batch)
+
+    return written
+
+
+def _write_scored(stream, batches, fmt):
+    """Записывает порции паролей вместе с оценкой надежности.
+
+    Args:
+        stream: Текстовый поток для записи.
+        batches (iterable): Итератор порций паролей.
+        fmt (str): Формат вывода.
+
+    Returns:
+        int: Количество записанных паролей.
+    """
+    written = 0
+    writer = None
+    if fmt == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(['password', 'entropy', 'score'])
+
+    for batch in batches:
+        rows = [(password, round(item['effective_entropy'], 1), item['score'])
+                for password, item in zip(batch, score_passwords(batch))]
+        if writer:
+            writer.writerows(rows)
+        elif fmt == 'jsonl':
+            stream.write(''.join(
+                '{"password": ' + encode_basestring_ascii(password) +
+                f', "entropy": {entropy}, "score": {score}}}\n'
+                for password, entropy, score in rows
+            ))
+        else:
+            stream.write(''.join(f"{password}\t{entropy}\t{score}\n"
+                                 for password, entropy, score in rows))
+        written += len(batch)
+
+    return written
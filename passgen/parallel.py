@@ -0,0 +1,152 @@
+"""
+Модуль для параллельной генерации паролей в нескольких процессах.
+
+Содержит функции для распределения пакетной генерации по пулу процессов.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .dedupe import DedupeFilter, DEFAULT_EXACT_LIMIT, MAX_STALLED_CHUNKS
+from .generator import PasswordGenerator, BATCH_CHUNK_SIZE
+from .policy import get_policy
+
+# Генератор текущего процесса-исполнителя
+_worker_generator = None
+
+
+def _init_worker(backend='python'):
+    """Создает генератор паролей в процессе-исполнителе.
+
+    Каждый процесс получает случайность напрямую из os.urandom, поэтому
+    потоки случайных данных исполнителей независимы и не требуют
+    согласования зерен.
+
+    Args:
+        backend (str): Реализация пакетной генерации.
+    """
+    global _worker_generator
+    _worker_generator = PasswordGenerator(backend=backend)
+
+
+def _generate_chunk(task):
+    """Генерирует одну порцию паролей в процессе-исполнителе.
+
+    Args:
+        task (tuple): Размер порции и политика генерации.
+
+    Returns:
+        str: Пароли порции, разделенные переводом строки.
+    """
+    size, policy = task
+    chunk = _worker_generator.generate_batch(size, policy=policy)
+    # Одна строка сериализуется между процессами намного быстрее списка
+    return '\n'.join(chunk)
+
+
+def iter_batches_parallel(count,
+                          workers=None,
+                          length=12,
+                          use_uppercase=True,
+                          use_digits=True,
+                          use_special=True,
+                          policy=None,
+                          chunk_size=BATCH_CHUNK_SIZE,
+                          backend='python',
+                          unique=False,
+                          exact_limit=DEFAULT_EXACT_LIMIT
+                          ):
+    """Генерирует пароли порциями в пуле процессов.
+
+    Порции возвращаются в порядке отправки. Одновременно в работе
+    находится не больше двух порций на процесс, поэтому потребление
+    памяти не зависит от общего количества паролей. При unique=True
+    повторы отсеиваются в основном процессе и добираются новыми порциями.
+
+    Args:
+        count (int): Общее количество паролей.
+        workers (int): Количество процессов. По умолчанию os.cpu_count().
+        length (int): Длина пароля. По умолчанию 12.
+        use_uppercase (bool): Заглавные буквы. По умолчанию True.
+        use_digits (bool): Цифры. По умолчанию True.
+        use_special (bool): Специальные символы. По умолчанию True.
+        policy (PasswordPolicy): Готовая политика. Если указана,
+            остальные параметры игнорируются.
+        chunk_size (int): Размер порции. По умолчанию BATCH_CHUNK_SIZE.
+        backend (str): Реализация генерации в процессах ('python' или
+            'numpy'). По умолчанию 'python'.
+        unique (bool): Гарантировать отсутствие повторов.
+            По умолчанию False.
+        exact_limit (int): Размер точного множества фильтра повторов.
+
+    Yields:
+        list: Очередная порция паролей.
+
+    Raises:
+        Exception: При некорректных параметрах или ошибках генерации.
+        ValueError: Если при unique новые пароли не появляются
+            MAX_STALLED_CHUNKS порций подряд (пространство исчерпано).
+
+    Example:
+        >>> batches = iter_batches_parallel(100000, workers=4)
+        >>> sum(len(batch) for batch in batches)
+        100000
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise Exception("Количество процессов должно быть не менее 1")
+
+    # Проверяем параметры до запуска пула
+    try:
+        policy = policy or get_policy(length,
+                                      use_uppercase,
+                                      use_digits,
+                                      use_special
+                                      )
+    except ValueError as e:
+        raise Exception(f"Ошибка при пакетной генерации паролей: {str(e)}")
+    if count < 1:
+        raise Exception("Количество паролей должно быть не менее 1")
+    if unique and count > policy.space_size:
+        raise Exception("Уникальных паролей меньше, чем запрошено")
+    chunk_size = max(1, chunk_size)
+    seen = DedupeFilter(exact_limit, capacity=count) if unique else None
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(backend,)
+                             ) as pool:
+        pending = deque()
+        produced = 0
+        in_flight = 0
+        stalled = 0
+        while produced < count:
+            while (len(pending) < workers * 2 and
+                   (seen is not None or produced + in_flight < count)):
+                # При отсеве повторов порции всегда полные, иначе ближе к
+                # исчерпанию пространства новые пароли почти не находятся
+                size = (chunk_size if seen is not None else
+                        min(chunk_size, count - produced - in_flight))
+                pending.append((size, pool.submit(_generate_chunk,
+                                                  (size, policy))))
+                in_flight += size
+
+            size, future = pending.popleft()
+            in_flight -= size
+            chunk = future.result().split('\n')
+            if seen is not None:
+                chunk = seen.filter(chunk)[:count - produced]
+                stalled = 0 if chunk else stalled + 1
+                if stalled >= MAX_STALLED_CHUNKS:
+                    raise ValueError(
+                        "Новые уникальные пароли не появляются "
+                        f"{MAX_STALLED_CHUNKS} порций подряд: получено "
+                        f"{produced} из {count}"
+                    )
+            if chunk:
+                produced += len(chunk)
+                yield chunk
+
+        # Лишние порции при отсеве повторов уже не нужны
+        for _, future in pending:
+            future.cancel()
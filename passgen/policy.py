@@ -0,0 +1,493 @@
+"""
+Модуль с политиками генерации паролей.
+
+Содержит класс PasswordPolicy, который один раз вычисляет все данные,
+нужные для генерации: объединенный алфавит, таблицы перевода байт и
+пороги отбраковки.
+"""
+
+import functools
+import math
+import string
+from .utils import validate_length, min_length_for_entropy
+
+# Наборы символов по умолчанию
+CHAR_SETS = {
+    'lowercase': string.ascii_lowercase,
+    'uppercase': string.ascii_uppercase,
+    'digits': string.digits,
+    'special': '!@#$%^&*()_+-=[]{}|;:,.<>?'
+}
+
+# Символы, которые легко спутать при чтении: 0/O, 1/l/I
+AMBIGUOUS_CHARS = '0O1lI'
+
+# Значение в таблице классов для байт, не входящих в алфавит
+NO_CLASS = 255
+
+
+class PasswordPolicy:
+    """Скомпилированная политика генерации паролей.
+
+    Экземпляры неизменяемы и сравниваются по параметрам. Для получения
+    политики используйте get_policy, которая кэширует одинаковые политики.
+
+    Attributes:
+        length (int): Длина пароля.
+        use_uppercase (bool): Заглавные буквы.
+        use_digits (bool): Цифры.
+        use_special (bool): Специальные символы.
+        custom_alphabet (str): Собственный алфавит вместо классов или None.
+        char_sets (tuple): Пары (имя класса, символы), заменяющие наборы
+            по умолчанию, или None.
+        exclude_ambiguous (bool): Исключены ли похожие символы.
+        classes (tuple): Пары (имя, символы) для используемых классов.
+        min_counts (tuple): Минимальное количество символов каждого класса
+            в порядке classes.
+        free_count (int): Количество позиций без требований к классу.
+        alphabet (str): Объединенный алфавит.
+        class_table (bytes): Номер класса для каждого байта (NO_CLASS,
+            если байт не входит в алфавит).
+        limit (int): Порог отбраковки: байты не меньше limit отбрасываются.
+        translate_table (bytes): Таблица bytes.translate байт -> символ.
+        rejected (bytes): Байты, которые отбрасываются при переводе.
+        class_tables (tuple): Пары (таблица перевода, отбрасываемые байты)
+            для каждого класса.
+        shuffle_tables (tuple): Пары (таблица перевода, отбрасываемые байты)
+            для случайного индекса в диапазоне [0, i] на шаге i
+            перемешивания Фишера-Йетса.
+    """
+
+    __slots__ = ('length', 'use_uppercase', 'use_digits', 'use_special',
+                 'custom_alphabet', 'char_sets', 'exclude_ambiguous',
+                 'classes', 'min_counts', 'free_count', 'alphabet',
+                 'class_table', 'limit', 'translate_table', 'rejected',
+                 'class_tables', 'shuffle_tables', '_space_size')
+
+    def __init__(self,
+                 length=12,
+                 use_uppercase=True,
+                 use_digits=True,
+                 use_special=True,
+                 min_lowercase=0,
+                 min_uppercase=None,
+                 min_digits=None,
+                 min_special=None,
+                 alphabet=None,
+                 char_sets=None,
+                 exclude_ambiguous=False
+                 ):
+        """Проверяет параметры и вычисляет таблицы политики.
+
+        Args:
+            length (int): Длина пароля. По умолчанию 12.
+            use_uppercase (bool): Заглавные буквы. По умолчанию True.
+            use_digits (bool): Цифры. По умолчанию True.
+            use_special (bool): Специальные символы. По умолчанию True.
+            min_lowercase (int): Минимум строчных букв. По умолчанию 0.
+            min_uppercase (int): Минимум заглавных букв. По умолчанию 1,
+                если заглавные буквы включены, иначе 0.
+            min_digits (int): Минимум цифр. По умолчанию как min_uppercase.
+            min_special (int): Минимум спецсимволов. По умолчанию как
+                min_uppercase.
+            alphabet (str): Собственный алфавит. Если указан, заменяет все
+                классы, а минимумы по классам недоступны.
+            char_sets (dict): Наборы символов для отдельных классов,
+                заменяющие CHAR_SETS.
+            exclude_ambiguous (bool): Исключить AMBIGUOUS_CHARS.
+                По умолчанию False.
+
+        Raises:
+            ValueError: Если длина некорректна, минимум задан для
+                выключенного класса, сумма минимумов больше длины или
+                набор символов некорректен.
+        """
+        validate_length(length)
+
+        char_sets = _normalize_char_sets(char_sets)
+        if alphabet is not None:
+            if any((min_lowercase, min_uppercase, min_digits, min_special)):
+                raise ValueError(
+                    "Минимумы по классам недоступны для своего алфавита"
+                )
+            use_uppercase = use_digits = use_special = False
+            min_lowercase = 0
+
+        self.length = length
+        self.use_uppercase = use_uppercase
+        self.use_digits = use_digits
+        self.use_special = use_special
+        self.custom_alphabet = alphabet
+        self.char_sets = char_sets
+        self.exclude_ambiguous = exclude_ambiguous
+
+        classes = _resolve_classes(use_uppercase, use_digits, use_special,
+                                   alphabet, char_sets, exclude_ambiguous)
+        requested = {
+            'lowercase': min_lowercase,
+            'uppercase': min_uppercase,
+            'digits': min_digits,
+            'special': min_special,
+        }
+        enabled = {name for name, _ in classes}
+        for name, minimum in requested.items():
+            if minimum and name not in enabled:
+                raise ValueError(
+                    f"Минимум задан для выключенного класса: {name}"
+                )
+
+        min_counts = []
+        for name, _ in classes:
+            minimum = requested.get(name, 0)
+            if minimum is None:
+                minimum = 1
+            if minimum < 0:
+                raise ValueError("Минимум символов не может быть меньше 0")
+            min_counts.append(minimum)
+
+        if sum(min_counts) > length:
+            raise ValueError("Сумма минимумов по классам превышает длину")
+
+        self.classes = classes
+        self.min_counts = tuple(min_counts)
+        self.free_count = length - sum(min_counts)
+        self.alphabet = ''.join(chars for _, chars in classes)
+
+        class_table = bytearray([NO_CLASS]) * 256
+        for class_id, (_, chars) in enumerate(classes):
+            for char in chars.encode('ascii'):
+                class_table[char] = class_id
+        self.class_table = bytes(class_table)
+
+        self.translate_table, self.rejected = _build_translation(
+            self.alphabet.encode('ascii')
+        )
+        self.limit = 256 - len(self.rejected)
+        self.class_tables = tuple(_build_translation(chars.encode('ascii'))
+                                  for _, chars in classes)
+        self.shuffle_tables = tuple(_build_translation(bytes(range(i + 1)))
+                                    for i in range(length))
+        self._space_size = None
+
+    @property
+    def key(self):
+        """tuple: Параметры, однозначно определяющие политику."""
+        minimums = dict(zip((name for name, _ in self.classes),
+                            self.min_counts))
+        return (self.length,
+                self.use_uppercase,
+                self.use_digits,
+                self.use_special,
+                minimums.get('lowercase', 0),
+                minimums.get('uppercase', 0),
+                minimums.get('digits', 0),
+                minimums.get('special', 0),
+                self.custom_alphabet,
+                self.char_sets,
+                self.exclude_ambiguous
+                )
+
+    @property
+    def space_size(self):
+        """int: Точное количество паролей, удовлетворяющих политике.
+
+        Считается с учетом минимумов по классам: для каждого класса
+        перебирается, сколько позиций он занимает (не меньше минимума),
+        и позиции распределяются между классами сочетаниями. Результат
+        вычисляется один раз.
+
+        Example:
+            >>> get_policy(4, min_uppercase=1, min_digits=1, use_special=False,
+            ...            char_sets={'lowercase': 'a', 'uppercase': 'B',
+            ...                       'digits': '1'}).space_size
+            50
+        """
+        if self._space_size is None:
+            length = self.length
+            # ways[j] - количество строк длины j из уже учтенных классов
+            ways = [1] + [0] * length
+            for (_, chars), minimum in zip(self.classes, self.min_counts):
+                size = len(chars)
+                merged = [0] * (length + 1)
+                for filled, count in enumerate(ways):
+                    if not count:
+                        continue
+                    for taken in range(minimum, length - filled + 1):
+                        merged[filled + taken] += (
+                            count * math.comb(filled + taken, taken) *
+                            size ** taken
+                        )
+                ways = merged
+            self._space_size = ways[length]
+        return self._space_size
+
+    def is_satisfied(self, password):
+        """Проверяет, что пароль содержит минимум символов каждого класса.
+
+        Args:
+            password (bytes): Пароль в кодировке ASCII.
+
+        Returns:
+            bool: True если все минимумы по классам выполнены.
+        """
+        present = password.translate(self.class_table)
+        return all(present.count(class_id) >= minimum
+                   for class_id, minimum in enumerate(self.min_counts)
+                   if minimum)
+
+    def __eq__(self, other):
+        if not isinstance(other, PasswordPolicy):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __reduce__(self):
+        # При передаче в другой процесс политика берется из его кэша
+        return (get_policy, self.key)
+
+    def __repr__(self):
+        return (f"PasswordPolicy(length={self.length}, "
+                f"use_uppercase={self.use_uppercase}, "
+                f"use_digits={self.use_digits}, "
+                f"use_special={self.use_special}, "
+                f"min_counts={self.min_counts}, "
+                f"alphabet={self.alphabet!r})")
+
+
+def compile_alphabet(chars, exclude_ambiguous=False):
+    """Проверяет набор символов и приводит его к виду для генерации.
+
+    Повторы удаляются с сохранением порядка, иначе повторенные символы
+    выпадали бы чаще.
+
+    Args:
+        chars (str): Набор символов.
+        exclude_ambiguous (bool): Исключить AMBIGUOUS_CHARS.
+            По умолчанию False.
+
+    Returns:
+        str: Набор без повторов.
+
+    Raises:
+        ValueError: Если набор пуст или содержит пробельные символы или
+            символы вне печатного ASCII.
+
+    Example:
+        >>> compile_alphabet('aabc01', exclude_ambiguous=True)
+        'abc'
+    """
+    for char in chars:
+        if not ('!' <= char <= '~'):
+            raise ValueError(
+                f"Недопустимый символ в наборе: {char!r} (разрешены только "
+                f"печатные символы ASCII без пробелов)"
+            )
+    if exclude_ambiguous:
+        chars = ''.join(c for c in chars if c not in AMBIGUOUS_CHARS)
+    chars = ''.join(dict.fromkeys(chars))
+    if not chars:
+        raise ValueError("Набор символов пуст")
+    return chars
+
+
+def _normalize_char_sets(char_sets):
+    """Приводит наборы символов классов к виду ключа кэша.
+
+    Args:
+        char_sets (dict): Наборы по именам классов, пары (имя, символы)
+            или None.
+
+    Returns:
+        tuple: Отсортированные пары (имя, символы) или None, если
+        замен нет.
+
+    Raises:
+        ValueError: Если имя класса неизвестно.
+    """
+    if not char_sets:
+        return None
+    items = dict(char_sets)
+    for name in items:
+        if name not in CHAR_SETS:
+            raise ValueError(f"Неизвестный класс символов: {name}")
+    return tuple(sorted(items.items()))
+
+
+def _resolve_classes(use_uppercase, use_digits, use_special, alphabet,
+                     char_sets, exclude_ambiguous):
+    """Возвращает наборы символов включенных классов.
+
+    Args:
+        use_uppercase (bool): Заглавные буквы.
+        use_digits (bool): Цифры.
+        use_special (bool): Специальные символы.
+        alphabet (str): Собственный алфавит или None.
+        char_sets (tuple): Замены наборов классов или None.
+        exclude_ambiguous (bool): Исключить AMBIGUOUS_CHARS.
+
+    Returns:
+        tuple: Пары (имя, символы) для включенных классов.
+
+    Raises:
+        ValueError: Если набор некорректен или классы пересекаются.
+    """
+    if alphabet is not None:
+        return (('custom', compile_alphabet(alphabet, exclude_ambiguous)),)
+
+    sets = dict(CHAR_SETS, **dict(char_sets or ()))
+    enabled = (('lowercase', True),
+               ('uppercase', use_uppercase),
+               ('digits', use_digits),
+               ('special', use_special))
+    classes = tuple((name, compile_alphabet(sets[name], exclude_ambiguous))
+                    for name, use in enabled if use)
+
+    # Общий символ двух классов выпадал бы чаще остальных
+    joined = ''.join(chars for _, chars in classes)
+    if len(set(joined)) != len(joined):
+        raise ValueError("Наборы символов классов пересекаются")
+    return classes
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_translation(alphabet):
+    """Строит таблицу равномерного перевода случайных байт в алфавит.
+
+    Таблицы кэшируются: одинаковые алфавиты и шаги перемешивания разных
+    политик используют одни и те же объекты.
+
+    Args:
+        alphabet (bytes): Алфавит (не больше 256 символов).
+
+    Returns:
+        tuple: Таблица для bytes.translate и байты, которые нужно
+        отбросить, чтобы не было смещения по модулю.
+    """
+    # Последний полный период алфавита в диапазоне байта
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(alphabet[b % len(alphabet)] if b < limit else 0
+                  for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+def get_policy(length=12, use_uppercase=True, use_digits=True,
+               use_special=True, min_lowercase=0, min_uppercase=None,
+               min_digits=None, min_special=None, alphabet=None,
+               char_sets=None, exclude_ambiguous=False):
+    """Возвращает закэшированную политику с заданными параметрами.
+
+    Args:
+        length (int): Длина пароля. По умолчанию 12.
+        use_uppercase (bool): Заглавные буквы. По умолчанию True.
+        use_digits (bool): Цифры. По умолчанию True.
+        use_special (bool): Специальные символы. По умолчанию True.
+        min_lowercase (int): Минимум строчных букв. По умолчанию 0.
+        min_uppercase (int): Минимум заглавных букв. По умолчанию 1,
+            если заглавные буквы включены, иначе 0.
+        min_digits (int): Минимум цифр. По умолчанию как min_uppercase.
+        min_special (int): Минимум спецсимволов. По умолчанию как
+            min_uppercase.
+        alphabet (str): Собственный алфавит вместо классов.
+        char_sets (dict): Наборы символов для отдельных классов.
+        exclude_ambiguous (bool): Исключить AMBIGUOUS_CHARS.
+            По умолчанию False.
+
+    Returns:
+        PasswordPolicy: Политика генерации.
+
+    Raises:
+        ValueError: Если параметры политики некорректны.
+
+    Example:
+        >>> get_policy(16) is get_policy(length=16, min_digits=1)
+        True
+        >>> get_policy(16, min_digits=3, min_special=2).min_counts
+        (0, 1, 3, 2)
+        >>> get_policy(8, alphabet='0123456789abcdef').alphabet
+        '0123456789abcdef'
+    """
+    # Приводим аргументы к одному виду, чтобы ключ кэша не зависел от
+    # способа вызова
+    def resolve(enabled, minimum):
+        if minimum is None:
+            return 1 if enabled else 0
+        return minimum
+
+    if alphabet is not None:
+        # Свой алфавит заменяет все классы
+        use_uppercase = use_digits = use_special = False
+
+    return _cached_policy(length,
+                          bool(use_uppercase),
+                          bool(use_digits),
+                          bool(use_special),
+                          min_lowercase,
+                          resolve(use_uppercase, min_uppercase),
+                          resolve(use_digits, min_digits),
+                          resolve(use_special, min_special),
+                          alphabet,
+                          _normalize_char_sets(char_sets),
+                          bool(exclude_ambiguous)
+                          )
+
+
+def get_policy_for_entropy(bits, use_uppercase=True, use_digits=True,
+                           use_special=True, min_lowercase=0,
+                           min_uppercase=None, min_digits=None,
+                           min_special=None, alphabet=None, char_sets=None,
+                           exclude_ambiguous=False):
+    """Возвращает политику минимальной длины с энтропией не меньше bits.
+
+    Длина подбирается по размеру алфавита выбранных классов и не может
+    быть меньше суммы минимумов по классам.
+
+    Args:
+        bits (float): Требуемая энтропия в битах.
+        use_uppercase (bool): Заглавные буквы. По умолчанию True.
+        use_digits (bool): Цифры. По умолчанию True.
+        use_special (bool): Специальные символы. По умолчанию True.
+        min_lowercase (int): Минимум строчных букв. По умолчанию 0.
+        min_uppercase (int): Минимум заглавных букв.
+        min_digits (int): Минимум цифр.
+        min_special (int): Минимум спецсимволов.
+        alphabet (str): Собственный алфавит вместо классов.
+        char_sets (dict): Наборы символов для отдельных классов.
+        exclude_ambiguous (bool): Исключить AMBIGUOUS_CHARS.
+
+    Returns:
+        PasswordPolicy: Политика генерации.
+
+    Raises:
+        ValueError: Если нужная длина превышает допустимую.
+
+    Example:
+        >>> get_policy_for_entropy(80).length
+        13
+    """
+    if alphabet is not None:
+        use_uppercase = use_digits = use_special = False
+    classes = _resolve_classes(use_uppercase, use_digits, use_special,
+                               alphabet, _normalize_char_sets(char_sets),
+                               exclude_ambiguous)
+    alphabet_size = sum(len(chars) for _, chars in classes)
+
+    enabled = ((use_uppercase, min_uppercase),
+               (use_digits, min_digits),
+               (use_special, min_special))
+    required = min_lowercase or 0
+    for use, minimum in enabled:
+        if use:
+            required += 1 if minimum is None else minimum
+
+    length = min_length_for_entropy(bits, alphabet_size, max(4, required))
+    return get_policy(length, use_uppercase, use_digits, use_special,
+                      min_lowercase, min_uppercase, min_digits, min_special,
+                      alphabet, char_sets, exclude_ambiguous)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_policy(*key):
+    """Создает политику; результат кэшируется по параметрам."""
+    return PasswordPolicy(*key)
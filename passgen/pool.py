@@ -0,0 +1,239 @@
+"""
+Модуль с пулом заранее сгенерированных паролей.
+
+Содержит класс PasswordPool, который держит ограниченный буфер готовых
+паролей для каждой политики и пополняет его в фоновом потоке.
+"""
+
+import threading
+import time
+from collections import deque
+from .generator import PasswordGenerator
+from .policy import get_policy
+
+
+class PasswordPool:
+    """Пул готовых паролей с фоновым пополнением.
+
+    Для каждой политики хранится очередь не больше capacity паролей.
+    Когда в очереди остается low_water паролей или меньше, фоновый поток
+    дополняет ее до capacity. Выдача - это извлечение из очереди, поэтому
+    каждый пароль выдается ровно один раз. Если очередь пуста, пароль
+    генерируется сразу (промах).
+
+    Attributes:
+        capacity (int): Максимальный размер очереди одной политики.
+        low_water (int): Порог, при котором запускается пополнение.
+
+    Example:
+        >>> with PasswordPool(capacity=1000) as pool:
+        ...     password = pool.get(get_policy(16))
+    """
+
+    def __init__(self, capacity=1000, low_water=None, backend='python'):
+        """Создает пул и запускает поток пополнения.
+
+        Args:
+            capacity (int): Размер очереди политики. По умолчанию 1000.
+            low_water (int): Порог пополнения. По умолчанию capacity // 4.
+            backend (str): Реализация генерации для пополнения.
+
+        Raises:
+            ValueError: Если параметры пула некорректны.
+        """
+        if capacity < 1:
+            raise ValueError("Размер пула должен быть не менее 1")
+        if low_water is None:
+            low_water = capacity // 4
+        if not 0 <= low_water < capacity:
+            raise ValueError("Порог пополнения должен быть меньше размера")
+
+        self.capacity = capacity
+        self.low_water = low_water
+
+        self._buffers = {}
+        self._requested = {}
+        self._condition = threading.Condition()
+        # Пополнение идет под отдельной блокировкой, которую get не
+        # берет, поэтому выдача не ждет генерации
+        self._fill_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        # У потока пополнения и у выдачи при промахе свои генераторы,
+        # так как источник случайных данных не потокобезопасен
+        self._refill_generator = PasswordGenerator(backend=backend)
+        self._inline_generator = PasswordGenerator()
+        self._inline_lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._refills = 0
+        self._refill_lag_total = 0.0
+        self._refill_lag_max = 0.0
+        self._refill_errors = 0
+        self._last_refill_error = None
+        # Ошибки фонового пополнения по политикам, их выбрасывает get
+        self._errors = {}
+
+        self._thread = threading.Thread(target=self._refill_loop,
+                                        name='passgen-pool-refill',
+                                        daemon=True
+                                        )
+        self._thread.start()
+
+    def get(self, policy=None):
+        """Выдает пароль для политики.
+
+        Args:
+            policy (PasswordPolicy): Политика. По умолчанию get_policy().
+
+        Returns:
+            str: Пароль, который больше не будет выдан пулом.
+
+        Raises:
+            Exception: Если пул закрыт или фоновое пополнение очереди
+                политики завершилось ошибкой. Ошибка выбрасывается один
+                раз, следующий вызов снова запрашивает пополнение.
+        """
+        if self._closed:
+            raise Exception("Пул паролей закрыт")
+        policy = policy or get_policy()
+
+        with self._condition:
+            error = self._errors.pop(policy, None)
+        if error is not None:
+            raise Exception(f"Ошибка пополнения пула: {error}") from error
+
+        buffer = self._buffers.get(policy)
+        if buffer is None:
+            buffer = self._register(policy)
+
+        try:
+            password = buffer.popleft()
+            hit = True
+        except IndexError:
+            with self._inline_lock:
+                password = self._inline_generator.generate_password(
+                    policy=policy
+                )
+            hit = False
+
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if len(buffer) <= self.low_water:
+            self._request_refill(policy)
+        return password
+
+    def warm(self, policy=None):
+        """Синхронно заполняет очередь политики до capacity.
+
+        Args:
+            policy (PasswordPolicy): Политика. По умолчанию get_policy().
+        """
+        policy = policy or get_policy()
+        if policy not in self._buffers:
+            self._register(policy)
+        self._fill(policy)
+
+    def stats(self):
+        """Возвращает статистику работы пула.
+
+        Returns:
+            dict: hits, misses, hit_rate, refills, средняя и максимальная
+            задержка пополнения в секундах (от запроса до заполнения
+            очереди), количество и текст последней ошибки пополнения
+            и текущие размеры очередей.
+        """
+        with self._stats_lock:
+            total = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0,
+                'refills': self._refills,
+                'refill_lag_avg': (self._refill_lag_total / self._refills
+                                   if self._refills else 0.0),
+                'refill_lag_max': self._refill_lag_max,
+                'refill_errors': self._refill_errors,
+                'last_refill_error': self._last_refill_error,
+                'buffered': {repr(policy): len(buffer)
+                             for policy, buffer in self._buffers.items()}
+            }
+
+    def close(self):
+        """Останавливает поток пополнения и очищает очереди."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._buffers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _register(self, policy):
+        """Создает очередь для новой политики и запрашивает пополнение."""
+        with self._condition:
+            buffer = self._buffers.setdefault(policy, deque())
+        self._request_refill(policy)
+        return buffer
+
+    def _request_refill(self, policy):
+        """Ставит политику в очередь на пополнение."""
+        with self._condition:
+            if policy not in self._requested:
+                self._requested[policy] = time.monotonic()
+                self._condition.notify()
+
+    def _fill(self, policy):
+        """Дополняет очередь политики до capacity."""
+        with self._fill_lock:
+            buffer = self._buffers[policy]
+            missing = self.capacity - len(buffer)
+            if missing > 0:
+                buffer.extend(self._refill_generator.generate_batch(
+                    missing, policy=policy
+                ))
+
+    def _refill_loop(self):
+        """Фоновый цикл пополнения очередей."""
+        while True:
+            with self._condition:
+                while not self._requested and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                policy, requested_at = next(iter(self._requested.items()))
+
+            # Ошибка не должна останавливать поток: она запоминается и
+            # выбрасывается при следующей выдаче для этой политики
+            try:
+                self._fill(policy)
+                error = None
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                del self._requested[policy]
+                if error is not None:
+                    self._errors[policy] = error
+
+            if error is not None:
+                with self._stats_lock:
+                    self._refill_errors += 1
+                    self._last_refill_error = str(error)
+                continue
+
+            lag = time.monotonic() - requested_at
+            with self._stats_lock:
+                self._refills += 1
+                self._refill_lag_total += lag
+                self._refill_lag_max = max(self._refill_lag_max, lag)
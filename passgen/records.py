@@ -0,0 +1,180 @@
+"""
+Модуль для чтения и записи записей хранилища в файлах.
+
+Содержит функции для потокового чтения записей (сервис, пользователь,
+пароль, описание) порциями ограниченного размера и для потоковой
+выгрузки записей хранилища в форматах csv и jsonl.
+"""
+
+import csv
+import json
+from itertools import islice
+
+# Поддерживаемые форматы импорта и экспорта
+RECORD_FORMATS = ('csv', 'jsonl')
+
+# Поля записи при экспорте
+EXPORT_FIELDS = ('id', 'service', 'username', 'description')
+
+# Поля записи; description необязательно
+RECORD_FIELDS = ('service', 'username', 'password', 'description')
+REQUIRED_FIELDS = ('service', 'username', 'password')
+
+# Поля с ограничением длины VARCHAR(255) в таблице passwords
+LIMITED_FIELDS = ('service', 'username')
+MAX_FIELD_LENGTH = 255
+
+# Количество записей в одной порции при импорте
+IMPORT_BATCH_SIZE = 1000
+
+
+def open_input(path):
+    """Открывает файл записей для потокового чтения.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        io.TextIOWrapper: Открытый на чтение файл.
+    """
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _to_record(line_no, item):
+    """Проверяет поля записи и приводит ее к кортежу.
+
+    Args:
+        line_no (int): Номер строки во входном файле.
+        item (dict): Поля записи.
+
+    Returns:
+        tuple: Номер строки, сервис, пользователь, пароль и описание.
+
+    Raises:
+        ValueError: Если обязательное поле отсутствует или пустое, поле
+            не является строкой или длиннее MAX_FIELD_LENGTH.
+    """
+    if not isinstance(item, dict):
+        raise ValueError(f"Строка {line_no}: ожидался объект с полями")
+    for field in REQUIRED_FIELDS:
+        if not item.get(field):
+            raise ValueError(f"Строка {line_no}: не заполнено поле {field}")
+    for field in RECORD_FIELDS:
+        if item.get(field) and not isinstance(item[field], str):
+            raise ValueError(f"Строка {line_no}: поле {field} должно быть "
+                             "строкой")
+    for field in LIMITED_FIELDS:
+        if len(item[field]) > MAX_FIELD_LENGTH:
+            raise ValueError(f"Строка {line_no}: поле {field} длиннее "
+                             f"{MAX_FIELD_LENGTH} символов")
+    return (line_no, item['service'], item['username'], item['password'],
+            item.get('description') or '')
+
+
+def _iter_csv(stream):
+    """Читает записи из CSV с заголовком."""
+    reader = csv.DictReader(stream)
+    missing = set(REQUIRED_FIELDS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError("В заголовке CSV нет полей: "
+                         f"{', '.join(sorted(missing))}")
+    for item in reader:
+        yield _to_record(reader.line_num, item)
+
+
+def _iter_jsonl(stream):
+    """Читает записи из JSONL, пропуская пустые строки."""
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Строка {line_no}: некорректный JSON ({e})")
+        yield _to_record(line_no, item)
+
+
+def iter_record_chunks(stream, fmt='csv', chunk_size=IMPORT_BATCH_SIZE):
+    """Читает записи из потока порциями.
+
+    В памяти одновременно находится не больше одной порции, поэтому
+    размер файла не ограничен.
+
+    Args:
+        stream: Текстовый поток для чтения.
+        fmt (str): Формат: 'csv' (с заголовком service,username,password
+            и необязательным description) или 'jsonl'. По умолчанию 'csv'.
+        chunk_size (int): Размер порции. По умолчанию IMPORT_BATCH_SIZE.
+
+    Yields:
+        list: Кортежи (номер строки, сервис, пользователь, пароль,
+        описание).
+
+    Raises:
+        ValueError: Если формат не поддерживается или запись некорректна.
+
+    Example:
+        >>> import io
+        >>> stream = io.StringIO('{"service": "a", "username": "u", '
+        ...                      '"password": "p"}\\n')
+        >>> list(iter_record_chunks(stream, fmt='jsonl'))
+        [[(1, 'a', 'u', 'p', '')]]
+    """
+    if fmt not in RECORD_FORMATS:
+        raise ValueError(f"Неизвестный формат записей: {fmt}")
+    if chunk_size < 1:
+        raise ValueError("Размер порции должен быть больше 0")
+
+    records = _iter_csv(stream) if fmt == 'csv' else _iter_jsonl(stream)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_records(stream, records, fmt='csv'):
+    """Записывает записи хранилища в поток по мере поступления.
+
+    Записи не накапливаются в памяти, поэтому вместе с итератором
+    PasswordStorage.iter_passwords выгрузка идет с постоянной памятью.
+
+    Args:
+        stream: Текстовый поток для записи.
+        records (iterable): Словари с ключами из EXPORT_FIELDS.
+        fmt (str): Формат: 'csv' или 'jsonl'. По умолчанию 'csv'.
+
+    Returns:
+        int: Количество записанных записей.
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+
+    Example:
+        >>> import io
+        >>> buffer = io.StringIO()
+        >>> write_records(buffer, [{'id': 1, 'service': 'a',
+        ...                         'username': 'u', 'description': ''}])
+        1
+        >>> buffer.getvalue()
+        'id,service,username,description\\n1,a,u,\\n'
+    """
+    if fmt not in RECORD_FORMATS:
+        raise ValueError(f"Неизвестный формат записей: {fmt}")
+
+    written = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, EXPORT_FIELDS, extrasaction='ignore',
+                                lineterminator='\n')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            written += 1
+    else:
+        for record in records:
+            stream.write(json.dumps({field: record[field]
+                                     for field in EXPORT_FIELDS},
+                                    ensure_ascii=False) + '\n')
+            written += 1
+
+    return written
@@ -4,9 +4,56 @@
 Содержит класс PasswordStorage для операций с базой данных.
 """
 
+import csv
+import io
 import psycopg2
-from .database import get_db_connection
-from .utils import hash_password, verify_password
+from .database import borrow_connection, release_connection
+from .kdf import get_kdf, needs_rehash
+from .utils import hash_password, hash_many, verify_password, verify_many
+
+# Размер порции и имя задачи для обхода устаревших хэшей
+REHASH_BATCH_SIZE = 10000
+REHASH_JOB = 'rehash-migrate'
+
+# Причина постановки в rotation_queue для устаревших хэшей
+ROTATION_REASON = 'outdated_hash'
+
+# Количество записей, получаемых с сервера за раз при потоковом чтении
+FETCH_BATCH_SIZE = 1000
+
+# Режимы поиска: точное совпадение, начало строки и подстрока
+MATCH_MODES = ('exact', 'prefix', 'substring')
+
+
+def _escape_like(value):
+    """Экранирует спецсимволы шаблона LIKE (\\, % и _)."""
+    return (value.replace('\\', '\\\\')
+            .replace('%', '\\%')
+            .replace('_', '\\_'))
+
+
+def _match_condition(column, value, match):
+    """Возвращает условие поиска по колонке и его параметр.
+
+    Точное совпадение и поиск по началу строки обслуживает btree-индекс
+    UNIQUE(service, username) (для LIKE - при сортировке "C"), а также
+    триграммные индексы; поиск по подстроке (ILIKE) - триграммные
+    GIN-индексы из миграции 3. Если миграция 3 пропущена (нет pg_trgm),
+    те же условия выполняются без триграммных индексов.
+
+    Args:
+        column (str): Имя колонки.
+        value (str): Искомое значение.
+        match (str): Режим поиска из MATCH_MODES.
+
+    Returns:
+        tuple: SQL-условие и значение параметра.
+    """
+    if match == 'exact':
+        return f" AND {column} = %s", value
+    if match == 'prefix':
+        return f" AND {column} LIKE %s", _escape_like(value) + '%'
+    return f" AND {column} ILIKE %s", f"%{_escape_like(value)}%"
 
 
 class PasswordStorage:
@@ -27,7 +74,7 @@ class PasswordStorage:
         Raises:
             Exception: При ошибках сохранения.
         """
-        conn = get_db_connection()
+        conn = borrow_connection()
         cur = conn.cursor()
 
         try:
@@ -53,51 +100,172 @@ class PasswordStorage:
             raise Exception(f"Ошибка при сохранении: {str(e)}")
         finally:
             cur.close()
-            conn.close()
+            release_connection(conn)
 
-    def find_passwords(self, service=None, username=None):
-        """Ищет пароли по сервису и/или имени пользователя."""
-        conn = get_db_connection()
+    def save_passwords_bulk(self, entries, workers=None):
+        """Сохраняет порцию паролей одной транзакцией.
+
+        Пароли хэшируются параллельно через hash_many, записи загружаются
+        командой COPY во временную таблицу и переносятся в passwords одним
+        INSERT ... ON CONFLICT DO NOTHING. Существующие записи и повторы
+        внутри порции (сохраняется первое вхождение) пропускаются, не
+        прерывая загрузку остальных.
+
+        Args:
+            entries (iterable): Четверки (сервис, пользователь, пароль,
+                описание).
+            workers (int): Количество потоков хэширования. По умолчанию
+                из конфигурации.
+
+        Returns:
+            list: ID сохраненных записей в порядке entries; None для
+            записей, которые уже существуют.
+
+        Raises:
+            Exception: При ошибках сохранения.
+        """
+        entries = list(entries)
+        if not entries:
+            return []
+
+        conn = borrow_connection()
         cur = conn.cursor()
 
+        try:
+            hashes = hash_many([entry[2] for entry in entries], workers)
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, quoting=csv.QUOTE_ALL,
+                                lineterminator='\n')
+            writer.writerows(
+                (ordinal, service, username, password_hash, description or '')
+                for ordinal, ((service, username, _, description),
+                              password_hash)
+                in enumerate(zip(entries, hashes))
+            )
+            buffer.seek(0)
+
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS passwords_import (
+                    ordinal INTEGER NOT NULL,
+                    service VARCHAR(255) NOT NULL,
+                    username VARCHAR(255) NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    description TEXT
+                ) ON COMMIT DELETE ROWS
+            """)
+            cur.copy_expert("""
+                COPY passwords_import
+                (ordinal, service, username, password_hash, description)
+                FROM STDIN WITH (FORMAT csv)
+            """, buffer)
+            cur.execute("""
+                INSERT INTO passwords
+                (service, username, password_hash, description)
+                SELECT DISTINCT ON (service, username)
+                       service, username, password_hash, description
+                FROM passwords_import
+                ORDER BY service, username, ordinal
+                ON CONFLICT (service, username) DO NOTHING
+                RETURNING id, service, username
+            """)
+
+            saved = {(row[1], row[2]): row[0] for row in cur.fetchall()}
+            conn.commit()
+
+            # Повтор ключа внутри порции - тоже дубликат
+            results = []
+            for service, username, _, _ in entries:
+                results.append(saved.pop((service, username), None))
+            return results
+
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Ошибка при массовом сохранении: {str(e)}")
+        finally:
+            cur.close()
+            release_connection(conn)
+
+    def find_passwords(self, service=None, username=None,
+                       match='substring'):
+        """Ищет пароли по сервису и/или имени пользователя."""
+        return list(self.iter_passwords(service, username, match))
+
+    def iter_passwords(self, service=None, username=None, match='substring',
+                       batch_size=FETCH_BATCH_SIZE):
+        """Потоково перебирает пароли по сервису и/или имени пользователя.
+
+        Записи читаются именованным (серверным) курсором порциями по
+        batch_size через fetchmany, поэтому память не зависит от размера
+        таблицы. Подключение занято, пока итератор не исчерпан или не
+        закрыт.
+
+        Args:
+            service (str): Фильтр по сервису. По умолчанию None.
+            username (str): Фильтр по имени пользователя. По умолчанию None.
+            match (str): Режим поиска: 'exact' - точное совпадение,
+                'prefix' - начало строки (с учетом регистра), 'substring' -
+                подстрока без учета регистра. По умолчанию 'substring'.
+            batch_size (int): Размер порции. По умолчанию FETCH_BATCH_SIZE.
+
+        Yields:
+            dict: Запись с ключами id, service, username и description.
+
+        Raises:
+            ValueError: Если режим поиска не поддерживается.
+            Exception: При ошибках поиска.
+        """
+        if match not in MATCH_MODES:
+            raise ValueError(f"Неизвестный режим поиска: {match}")
+
+        conn = borrow_connection()
+        cur = conn.cursor(name='passwords_iter')
+
         try:
             query = '''
             SELECT id, service, username, description FROM passwords WHERE 1=1
             '''
             params = []
 
-            if service:
-                query += " AND service ILIKE %s"
-                params.append(f"%{service}%")
-
-            if username:
-                query += " AND username ILIKE %s"
-                params.append(f"%{username}%")
+            for column, value in (('service', service),
+                                  ('username', username)):
+                if value:
+                    condition, param = _match_condition(column, value, match)
+                    query += condition
+                    params.append(param)
 
             query += " ORDER BY service, username"
 
+            cur.itersize = batch_size
             cur.execute(query, params)
-            results = []
-
-            for row in cur.fetchall():
-                results.append({
-                    'id': row[0],
-                    'service': row[1],
-                    'username': row[2],
-                    'description': row[3] or ''
-                })
 
-            return results
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'id': row[0],
+                        'service': row[1],
+                        'username': row[2],
+                        'description': row[3] or ''
+                    }
 
         except Exception as e:
             raise Exception(f"Ошибка при поиске паролей: {str(e)}")
         finally:
-            cur.close()
-            conn.close()
+            if not conn.closed:
+                cur.close()
+            release_connection(conn)
 
     def verify_password(self, service, username, password):
-        """Проверяет пароль для указанного сервиса и пользователя."""
-        conn = get_db_connection()
+        """Проверяет пароль для указанного сервиса и пользователя.
+
+        Если пароль верный, а хэш создан старым алгоритмом или с
+        устаревшими параметрами, пароль хэшируется заново с текущими
+        параметрами и запись обновляется в том же подключении.
+        """
+        conn = borrow_connection()
         cur = conn.cursor()
 
         try:
@@ -111,17 +279,206 @@ class PasswordStorage:
                 return False
 
             stored_hash = result[0]
-            return verify_password(password, stored_hash)
+            if not verify_password(password, stored_hash):
+                return False
+
+            kdf = get_kdf()
+            if needs_rehash(stored_hash, kdf):
+                self._upgrade_hash(conn, cur, service, username, stored_hash,
+                                   hash_password(password, kdf))
+            return True
 
         except Exception as e:
             raise Exception(f"Ошибка при проверке пароля: {str(e)}")
         finally:
             cur.close()
-            conn.close()
+            release_connection(conn)
+
+    def verify_passwords(self, entries, workers=None):
+        """Проверяет несколько паролей за один запрос к базе.
+
+        Хэши выбираются одним запросом, а проверка выполняется параллельно
+        через verify_many.
+
+        Args:
+            entries (iterable): Тройки (сервис, пользователь, пароль).
+            workers (int): Количество потоков проверки. По умолчанию из
+                конфигурации.
+
+        Returns:
+            list: Результаты проверки (bool) в порядке entries. Для
+            отсутствующих записей - False.
+
+        Raises:
+            Exception: При ошибках проверки.
+        """
+        entries = list(entries)
+        if not entries:
+            return []
+
+        conn = borrow_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute("""
+                SELECT p.service, p.username, p.password_hash
+                FROM passwords p
+                JOIN unnest(%s::text[], %s::text[]) AS k(service, username)
+                  ON p.service = k.service AND p.username = k.username
+            """, ([service for service, _, _ in entries],
+                  [username for _, username, _ in entries]))
+
+            hashes = {(row[0], row[1]): row[2] for row in cur.fetchall()}
+            return verify_many(((password, hashes.get((service, username)))
+                                for service, username, password in entries),
+                               workers
+                               )
+
+        except Exception as e:
+            raise Exception(f"Ошибка при проверке паролей: {str(e)}")
+        finally:
+            cur.close()
+            release_connection(conn)
+
+    def _upgrade_hash(self, conn, cur, service, username, old_hash,
+                      new_hash):
+        """Заменяет устаревший хэш на новый.
+
+        Запись обновляется, только если хэш не изменился с момента чтения.
+        В той же транзакции запись убирается из rotation_queue, если она
+        стояла там из-за устаревшего хэша: смена пароля больше не нужна.
+        Ошибка обновления не влияет на результат проверки пароля.
+        """
+        try:
+            cur.execute("""
+                WITH upgraded AS (
+                    UPDATE passwords SET password_hash = %s
+                    WHERE service = %s AND username = %s
+                      AND password_hash = %s
+                    RETURNING id
+                )
+                DELETE FROM rotation_queue
+                WHERE password_id IN (SELECT id FROM upgraded)
+                  AND reason = %s
+            """, (new_hash, service, username, old_hash, ROTATION_REASON))
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()
+
+    def count_outdated_hashes(self):
+        """Считает записи с хэшами на устаревших параметрах.
+
+        Returns:
+            tuple: Общее количество записей и количество записей, хэш
+            которых создан не текущими алгоритмом и параметрами.
+
+        Raises:
+            Exception: При ошибках запроса.
+        """
+        prefix = get_kdf().prefix
+        conn = borrow_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute("""
+                SELECT count(*),
+                       count(*) FILTER (WHERE left(password_hash, %s) <> %s)
+                FROM passwords
+            """, (len(prefix), prefix))
+            total, outdated = cur.fetchone()
+            return total, outdated
+
+        except Exception as e:
+            raise Exception(f"Ошибка при подсчете хэшей: {str(e)}")
+        finally:
+            cur.close()
+            release_connection(conn)
+
+    def queue_outdated_hashes(self, batch_size=REHASH_BATCH_SIZE,
+                              restart=False):
+        """Ставит записи с устаревшими хэшами в очередь на смену пароля.
+
+        Без пароля хэш обновить нельзя, поэтому такие записи попадают в
+        таблицу rotation_queue. Таблица passwords обходится порциями по
+        возрастанию id (keyset-пагинация), каждая порция выполняется в
+        отдельной транзакции без блокировки всей таблицы. После каждой
+        порции сохраняется контрольная точка, поэтому прерванный обход
+        продолжается с места остановки. Если параметры KDF изменились,
+        обход начинается заново.
+
+        Args:
+            batch_size (int): Размер порции. По умолчанию REHASH_BATCH_SIZE.
+            restart (bool): Начать обход с начала. По умолчанию False.
+
+        Yields:
+            tuple: Последний обработанный id, количество просмотренных
+            и количество поставленных в очередь записей в порции.
+
+        Raises:
+            Exception: При ошибках обхода.
+        """
+        prefix = get_kdf().prefix
+        conn = borrow_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute("""
+                SELECT last_id, target FROM rehash_checkpoint
+                WHERE job = %s
+            """, (REHASH_JOB,))
+            checkpoint = cur.fetchone()
+            last_id = 0
+            if checkpoint and checkpoint[1] == prefix and not restart:
+                last_id = checkpoint[0]
+            conn.commit()
+
+            while True:
+                cur.execute("""
+                    WITH batch AS (
+                        SELECT id, password_hash FROM passwords
+                        WHERE id > %(last_id)s
+                        ORDER BY id
+                        LIMIT %(batch_size)s
+                    ), queued AS (
+                        INSERT INTO rotation_queue (password_id, reason)
+                        SELECT id, %(reason)s FROM batch
+                        WHERE left(password_hash, %(length)s) <> %(prefix)s
+                        ON CONFLICT (password_id) DO NOTHING
+                        RETURNING 1
+                    )
+                    SELECT (SELECT max(id) FROM batch),
+                           (SELECT count(*) FROM batch),
+                           (SELECT count(*) FROM queued)
+                """, {'last_id': last_id, 'batch_size': batch_size,
+                      'length': len(prefix), 'prefix': prefix,
+                      'reason': ROTATION_REASON})
+                batch_last_id, scanned, queued = cur.fetchone()
+                if not scanned:
+                    conn.commit()
+                    break
+
+                last_id = batch_last_id
+                cur.execute("""
+                    INSERT INTO rehash_checkpoint (job, last_id, target)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (job) DO UPDATE
+                    SET last_id = EXCLUDED.last_id,
+                        target = EXCLUDED.target,
+                        updated_at = now()
+                """, (REHASH_JOB, last_id, prefix))
+                conn.commit()
+                yield last_id, scanned, queued
+
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Ошибка при обходе хэшей: {str(e)}")
+        finally:
+            cur.close()
+            release_connection(conn)
 
     def delete_password(self, service, username):
         """Удаляет пароль для указанного сервиса и пользователя."""
-        conn = get_db_connection()
+        conn = borrow_connection()
         cur = conn.cursor()
 
         try:
@@ -140,8 +497,19 @@ class PasswordStorage:
             raise Exception(f"Ошибка при удалении пароля: {str(e)}")
         finally:
             cur.close()
-            conn.close()
+            release_connection(conn)
 
     def list_all(self):
         """Возвращает список всех сохраненных паролей."""
         return self.find_passwords()
+
+    def iter_all(self, batch_size=FETCH_BATCH_SIZE):
+        """Потоково перебирает все сохраненные пароли.
+
+        Args:
+            batch_size (int): Размер порции. По умолчанию FETCH_BATCH_SIZE.
+
+        Yields:
+            dict: Запись с ключами id, service, username и description.
+        """
+        return self.iter_passwords(batch_size=batch_size)
@@ -0,0 +1,98 @@
+"""
+Модуль для кодирования секретных токенов.
+
+Содержит функции для кодирования случайных байт в hex, base32,
+base64url и Z85 без посимвольного выбора из алфавита.
+"""
+
+import base64
+
+# Поддерживаемые кодировки токенов
+TOKEN_ENCODINGS = ('hex', 'base32', 'base64url', 'z85')
+
+# Перевод алфавита base85 (RFC 1924) в алфавит Z85 (ZeroMQ RFC 32):
+# порядок групп и значения одинаковы, отличаются только символы
+_B85_ALPHABET = (b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                 b'abcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{|}~')
+_Z85_ALPHABET = (b'0123456789abcdefghijklmnopqrstuvwxyz'
+                 b'ABCDEFGHIJKLMNOPQRSTUVWXYZ.-:+=^!/*?&<>()[]{}@%$#')
+_B85_TO_Z85 = bytes.maketrans(_B85_ALPHABET, _Z85_ALPHABET)
+
+# Размер группы байт, которая кодируется целым числом символов
+_GROUPS = {'hex': (1, 2), 'base32': (5, 8), 'base64url': (3, 4), 'z85': (4, 5)}
+
+
+def z85encode(data):
+    """Кодирует байты в Z85.
+
+    Args:
+        data (bytes): Байты, длина кратна 4.
+
+    Returns:
+        bytes: Закодированные данные.
+
+    Raises:
+        ValueError: Если длина не кратна 4.
+    """
+    if len(data) % 4:
+        raise ValueError("Длина данных для Z85 должна быть кратна 4")
+    return base64.b85encode(data).translate(_B85_TO_Z85)
+
+
+def encode_token(data, encoding='base64url'):
+    """Кодирует случайные байты в строку токена.
+
+    Дополнение '=' в base32 и base64url не добавляется.
+
+    Args:
+        data (bytes): Случайные байты.
+        encoding (str): Кодировка из TOKEN_ENCODINGS.
+
+    Returns:
+        str: Токен.
+
+    Raises:
+        ValueError: Если кодировка неизвестна.
+
+    Example:
+        >>> encode_token(bytes(range(4)), 'hex')
+        '00010203'
+    """
+    if encoding == 'hex':
+        return data.hex()
+    if encoding == 'base32':
+        return base64.b32encode(data).decode('ascii').rstrip('=')
+    if encoding == 'base64url':
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+    if encoding == 'z85':
+        return z85encode(data).decode('ascii')
+    raise ValueError(f"Неизвестная кодировка токена: {encoding}")
+
+
+def encode_tokens(data, nbytes, encoding='base64url'):
+    """Кодирует подряд идущие токены одного размера.
+
+    Если nbytes кратен группе кодировки, весь блок кодируется одним
+    вызовом и затем режется на строки; иначе каждый токен кодируется
+    отдельно.
+
+    Args:
+        data (bytes): Случайные байты, длина кратна nbytes.
+        nbytes (int): Размер одного токена в байтах.
+        encoding (str): Кодировка из TOKEN_ENCODINGS.
+
+    Returns:
+        list: Токены.
+    """
+    if encoding not in _GROUPS:
+        raise ValueError(f"Неизвестная кодировка токена: {encoding}")
+
+    group, chars = _GROUPS[encoding]
+    if nbytes % group == 0:
+        encoded = encode_token(data, encoding)
+        width = nbytes // group * chars
+        return [encoded[start:start + width]
+                for start in range(0, len(encoded), width)]
+
+    return [encode_token(data[start:start + nbytes], encoding)
+            for start in range(0, len(data), nbytes)]
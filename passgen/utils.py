@@ -4,9 +4,64 @@
 Содержит функции для хэширования, проверки паролей и валидации.
 """
 
-import hashlib
-import base64
+import math
 import os
+import string
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import eq
+from .kdf import get_kdf, parse_hash, verify_legacy
+
+# Размеры пулов символов для оценки энтропии
+LOWERCASE_POOL = frozenset(string.ascii_lowercase)
+UPPERCASE_POOL = frozenset(string.ascii_uppercase)
+DIGITS_POOL = frozenset(string.digits)
+SPECIAL_POOL = frozenset(string.punctuation + ' ')
+CHARACTER_POOLS = (LOWERCASE_POOL, UPPERCASE_POOL, DIGITS_POOL, SPECIAL_POOL)
+ASCII_POOL = frozenset().union(*CHARACTER_POOLS)
+
+# Условный размер пула для символов вне ASCII
+OTHER_POOL_SIZE = 128
+
+# log2 для всех возможных размеров пула (таблица вместо вызова math.log2)
+_LOG2 = [0.0] + [math.log2(size) for size in range(1, 512)]
+
+# Пороги оценки надежности 0-4 по эффективной энтропии в битах
+SCORE_THRESHOLDS = (28, 36, 60, 128)
+
+# Допустимая длина секретных токенов в байтах
+MIN_TOKEN_BYTES = 16
+MAX_TOKEN_BYTES = 65536
+
+
+def _trigrams(rows):
+    """Строит множество троек подряд идущих символов в обе стороны.
+
+    Args:
+        rows (iterable): Строки, соседние символы которых образуют
+            последовательность.
+
+    Returns:
+        frozenset: Тройки символов (кортежи).
+    """
+    result = set()
+    for row in rows:
+        for line in (row, row[::-1]):
+            result.update(zip(line, line[1:], line[2:]))
+    return frozenset(result)
+
+
+# Алфавитные и цифровые последовательности (abc, 321, XYZ)
+SEQUENCE_TRIGRAMS = _trigrams((string.ascii_lowercase,
+                               string.ascii_uppercase,
+                               string.digits
+                               ))
+
+# Прогулки по раскладке QWERTY (qwe, asd, 789, !@#)
+KEYBOARD_TRIGRAMS = _trigrams(('1234567890-=', 'qwertyuiop[]', "asdfghjkl;'",
+                               'zxcvbnm,./', '!@#$%^&*()_+', 'QWERTYUIOP',
+                               'ASDFGHJKL', 'ZXCVBNM', 'qaz', 'wsx', 'edc',
+                               'rfv', 'tgb', 'yhn', 'ujm'))
 
 
 def validate_length(length):
@@ -34,29 +89,169 @@ def validate_length(length):
     return True
 
 
-def hash_password(password):
-    """Хэширует пароль с использованием PBKDF2 и salt.
+def validate_token_length(nbytes):
+    """Проверяет корректность длины секретного токена в байтах.
+
+    У токенов отдельный предел, так как они не проходят через посимвольный
+    выбор и могут быть намного длиннее паролей.
+
+    Args:
+        nbytes (int): Длина токена в байтах.
+
+    Returns:
+        bool: True если длина корректна.
+
+    Raises:
+        ValueError: Если длина меньше MIN_TOKEN_BYTES или больше
+            MAX_TOKEN_BYTES.
+
+    Example:
+        >>> validate_token_length(256)
+        True
+    """
+    if nbytes < MIN_TOKEN_BYTES:
+        raise ValueError(
+            f"Длина токена должна быть не менее {MIN_TOKEN_BYTES} байт"
+        )
+    if nbytes > MAX_TOKEN_BYTES:
+        raise ValueError(
+            f"Длина токена не должна превышать {MAX_TOKEN_BYTES} байт"
+        )
+    return True
+
+
+def estimate_entropy(length, pool_size):
+    """Оценивает энтропию случайного пароля в битах.
+
+    Args:
+        length (int): Длина пароля.
+        pool_size (int): Размер алфавита.
+
+    Returns:
+        float: Энтропия в битах.
+
+    Example:
+        >>> round(estimate_entropy(12, 88), 1)
+        77.5
+    """
+    if pool_size < 2:
+        return 0.0
+    return length * math.log2(pool_size)
+
+
+def min_length_for_entropy(bits, pool_size, min_length=4):
+    """Находит минимальную длину пароля с энтропией не меньше bits.
+
+    Args:
+        bits (float): Требуемая энтропия в битах.
+        pool_size (int): Размер алфавита.
+        min_length (int): Нижняя граница длины. По умолчанию 4.
+
+    Returns:
+        int: Минимальная допустимая длина.
+
+    Raises:
+        ValueError: Если такая длина превышает допустимую.
+
+    Example:
+        >>> min_length_for_entropy(80, 88)
+        13
+    """
+    if pool_size < 2:
+        raise ValueError("Алфавит должен содержать не менее двух символов")
+    length = max(min_length, math.ceil(bits / math.log2(pool_size)))
+    validate_length(length)
+    return length
+
+
+def score_passwords(passwords):
+    """Оценивает надежность паролей пакетом.
+
+    Все проверки используют заранее построенные таблицы: пулы символов,
+    множества троек для последовательностей и раскладки, таблицу log2.
+    На каждый пароль приходится несколько проходов на уровне C без
+    регулярных выражений, поэтому миллион паролей оценивается за секунды.
+
+    Для каждого пароля возвращается словарь с ключами:
+        entropy - энтропия по размеру пула использованных классов;
+        classes - количество использованных классов символов;
+        repeats - количество повторов подряд (aa);
+        sequences - количество троек-последовательностей (abc, 321);
+        keyboard_walks - количество троек-прогулок по клавиатуре (qwe);
+        effective_entropy - энтропия за вычетом символов в шаблонах;
+        score - оценка от 0 до 4 по SCORE_THRESHOLDS.
+
+    Args:
+        passwords (iterable): Пароли для оценки.
+
+    Returns:
+        list: Список словарей с оценками в порядке паролей.
+
+    Example:
+        >>> score_passwords(['qwerty123'])[0]['keyboard_walks']
+        5
+    """
+    results = []
+    for password in passwords:
+        length = len(password)
+        chars = frozenset(password)
+
+        pool_size = 0
+        classes = 0
+        for pool in CHARACTER_POOLS:
+            if not pool.isdisjoint(chars):
+                pool_size += len(pool)
+                classes += 1
+        if not chars <= ASCII_POOL:
+            pool_size += OTHER_POOL_SIZE
+            classes += 1
+
+        bits_per_char = _LOG2[pool_size] if pool_size > 1 else 0.0
+        repeats = sum(map(eq, password, password[1:]))
+        triples = list(zip(password, password[1:], password[2:]))
+        sequences = sum(map(SEQUENCE_TRIGRAMS.__contains__, triples))
+        walks = sum(map(KEYBOARD_TRIGRAMS.__contains__, triples))
+
+        entropy = length * bits_per_char
+        patterned = min(length, repeats + sequences + walks)
+        effective = (length - patterned) * bits_per_char
+
+        score = 0
+        for threshold in SCORE_THRESHOLDS:
+            if effective >= threshold:
+                score += 1
+
+        results.append({
+            'entropy': entropy,
+            'classes': classes,
+            'repeats': repeats,
+            'sequences': sequences,
+            'keyboard_walks': walks,
+            'effective_entropy': effective,
+            'score': score
+        })
+
+    return results
+
+
+def hash_password(password, kdf=None):
+    """Хэширует пароль с использованием KDF и случайной соли.
 
     Args:
         password (str): Пароль для хэширования.
+        kdf (KDF): Функция формирования ключа. По умолчанию из
+            конфигурации (см. passgen.kdf.get_kdf).
 
     Returns:
-        str: Хэшированный пароль в формате "salt$hash".
+        str: Хэш в формате PHC, например
+        "$pbkdf2-sha256$i=100000$<соль>$<хэш>".
 
     Raises:
         Exception: При ошибках хэширования.
     """
     try:
-        # Генерируем случайную соль
-        salt = base64.b64encode(os.urandom(16)).decode('utf-8')
-
-        hashed = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            100000
-        )
-        return f"{salt}${base64.b64encode(hashed).decode('utf-8')}"
+        kdf = kdf or get_kdf()
+        return kdf.hash(password)
     except Exception as e:
         raise Exception(f"Ошибка при хэшировании пароля: {str(e)}")
 
@@ -64,6 +259,9 @@ def hash_password(password):
 def verify_password(password, hash_passw):
     """Проверяет пароль против хэша.
 
+    Алгоритм и параметры берутся из самого хэша. Хэши старого формата
+    "salt$hash" (PBKDF2-SHA256, 100000 итераций) тоже принимаются.
+
     Args:
         password (str): Пароль для проверки.
         hashed_password (str): Хэшированный пароль для сравнения.
@@ -83,24 +281,74 @@ def verify_password(password, hash_passw):
                                          str) or '$' not in hash_passw):
         return False
     try:
-        parts = hash_passw.split('$')
+        if not hash_passw.startswith('$'):
+            return verify_legacy(password, hash_passw)
 
-        # Проверяем что есть обе части (соль и хэш)
-        if len(parts) != 2:
-            return False
+        kdf, salt, digest = parse_hash(hash_passw)
+        return kdf.verify(password, salt, digest)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return False
 
-        salt, stored_hash = parts
 
-        # Проверяем что обе части не пустые
-        if not salt or not stored_hash:
-            return False
+def hash_many(passwords, workers=None, kdf=None):
+    """Хэширует несколько паролей в пуле потоков.
 
-        new_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            100000
-        )
-        return base64.b64encode(new_hash).decode('utf-8') == stored_hash
-    except (ValueError, TypeError, UnicodeDecodeError):
-        return False
+    hashlib освобождает GIL на время вычисления KDF, поэтому потоки
+    хэшируют параллельно. Порядок результатов совпадает с порядком паролей.
+
+    Args:
+        passwords (iterable): Пароли для хэширования.
+        workers (int): Количество потоков. По умолчанию PASSGEN_HASH_WORKERS
+            из конфигурации или число ядер.
+        kdf (KDF): Функция формирования ключа. По умолчанию из
+            конфигурации.
+
+    Returns:
+        list: Хэши в порядке паролей.
+
+    Raises:
+        Exception: При ошибках хэширования.
+
+    Example:
+        >>> hashes = hash_many(['one', 'two'], workers=2)
+        >>> verify_many(zip(['one', 'two'], hashes))
+        [True, True]
+    """
+    # Конфигурация читается один раз на весь пакет
+    kdf = kdf or get_kdf()
+    return _map_threads(partial(hash_password, kdf=kdf), passwords, workers)
+
+
+def verify_many(pairs, workers=None):
+    """Проверяет несколько паролей в пуле потоков.
+
+    Args:
+        pairs (iterable): Пары (пароль, хэш).
+        workers (int): Количество потоков. По умолчанию PASSGEN_HASH_WORKERS
+            из конфигурации или число ядер.
+
+    Returns:
+        list: Результаты проверки (bool) в порядке пар.
+    """
+    return _map_threads(lambda pair: verify_password(*pair), pairs, workers)
+
+
+def _map_threads(func, items, workers):
+    """Применяет функцию к элементам в пуле потоков с сохранением порядка.
+
+    Args:
+        func (callable): Функция одного аргумента.
+        items (iterable): Элементы.
+        workers (int): Количество потоков или None.
+
+    Returns:
+        list: Результаты в порядке элементов.
+    """
+    items = list(items)
+    workers = (workers or int(os.getenv('PASSGEN_HASH_WORKERS', 0))
+               or os.cpu_count() or 1)
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
@@ -0,0 +1,189 @@
+"""
+Модуль для работы со словарями для парольных фраз (diceware).
+
+Словарь один раз компилируется в компактный бинарный файл с таблицей
+смещений и затем отображается в память, поэтому выбор слова - это
+чтение одного среза без загрузки всего словаря.
+
+Формат скомпилированного файла:
+    8 байт   - сигнатура WORDLIST_MAGIC
+    4 байта  - количество слов N (little-endian)
+    4*(N+1)  - смещения начала слов относительно начала данных
+    данные   - слова в UTF-8 подряд, без разделителей
+"""
+
+import functools
+import hashlib
+import mmap
+import os
+import struct
+from .markov import cache_dir
+
+# Сигнатура скомпилированного словаря
+WORDLIST_MAGIC = b'PGWLIST1'
+
+# Расширение скомпилированного словаря
+COMPILED_SUFFIX = '.idx'
+
+_HEADER = struct.Struct('<8sI')
+_OFFSET = struct.Struct('<I')
+_OFFSET_PAIR = struct.Struct('<II')
+
+
+def compile_wordlist(source_path, compiled_path=None):
+    """Компилирует текстовый словарь в индексированный бинарный файл.
+
+    Из каждой непустой строки берется последнее слово, поэтому
+    поддерживаются как простые списки, так и списки diceware вида
+    "11111<TAB>abacus". Повторяющиеся слова пропускаются.
+
+    Args:
+        source_path (str): Путь к текстовому словарю.
+        compiled_path (str): Путь к результату. По умолчанию рядом со
+            словарем с расширением COMPILED_SUFFIX.
+
+    Returns:
+        str: Путь к скомпилированному файлу.
+
+    Raises:
+        ValueError: Если в словаре меньше двух слов.
+    """
+    compiled_path = compiled_path or source_path + COMPILED_SUFFIX
+
+    words = []
+    seen = set()
+    with open(source_path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[-1] not in seen:
+                seen.add(parts[-1])
+                words.append(parts[-1].encode('utf-8'))
+
+    if len(words) < 2:
+        raise ValueError("Словарь должен содержать не менее двух слов")
+
+    offsets = [0]
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+
+    # Пишем во временный файл, чтобы параллельный запуск не увидел
+    # недописанный индекс
+    tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(WORDLIST_MAGIC, len(words)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(b''.join(words))
+    os.replace(tmp_path, compiled_path)
+
+    return compiled_path
+
+
+class Wordlist:
+    """Словарь, отображенный в память.
+
+    Attributes:
+        path (str): Путь к скомпилированному файлу.
+    """
+
+    def __init__(self, compiled_path):
+        """Открывает скомпилированный словарь.
+
+        Args:
+            compiled_path (str): Путь к скомпилированному файлу.
+
+        Raises:
+            ValueError: Если файл не является скомпилированным словарем.
+        """
+        self.path = compiled_path
+        with open(compiled_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != WORDLIST_MAGIC:
+            self._map.close()
+            raise ValueError(f"Неверный формат словаря: {compiled_path}")
+        self._data_start = _HEADER.size + _OFFSET.size * (self._count + 1)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """Возвращает слово по номеру за O(1).
+
+        Args:
+            index (int): Номер слова.
+
+        Returns:
+            str: Слово.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError("Номер слова вне словаря")
+        start, end = _OFFSET_PAIR.unpack_from(
+            self._map, _HEADER.size + _OFFSET.size * index
+        )
+        return self._map[self._data_start + start:
+                         self._data_start + end].decode('utf-8')
+
+    def close(self):
+        """Закрывает отображение файла."""
+        self._map.close()
+
+
+def _cached_path(path):
+    """Возвращает путь индекса в кэше для словаря в закрытом каталоге.
+
+    Время изменения входит в имя, поэтому измененный словарь получает
+    новый индекс.
+    """
+    key = f"{os.path.abspath(path)}:{os.stat(path).st_mtime_ns}"
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir(), f'wordlist-{digest}{COMPILED_SUFFIX}')
+
+
+@functools.lru_cache(maxsize=8)
+def _open_compiled(compiled_path, mtime):
+    """Открывает словарь; результат кэшируется по пути и времени."""
+    return Wordlist(compiled_path)
+
+
+def load_wordlist(path):
+    """Возвращает словарь, при необходимости компилируя его.
+
+    Если передан текстовый словарь, рядом с ним ищется скомпилированный
+    файл; он пересобирается, если отсутствует или старше исходника.
+    Если каталог словаря недоступен для записи (например,
+    /usr/share/dict), индекс хранится в cache_dir() под именем из хэша
+    пути и времени изменения словаря.
+
+    Args:
+        path (str): Путь к текстовому или скомпилированному словарю.
+
+    Returns:
+        Wordlist: Словарь, отображенный в память.
+
+    Raises:
+        ValueError: Если словарь некорректен.
+        OSError: Если файл не найден.
+
+    Example:
+        >>> words = load_wordlist('eff_large_wordlist.txt')
+        >>> len(words)
+        7776
+    """
+    with open(path, 'rb') as f:
+        is_compiled = f.read(len(WORDLIST_MAGIC)) == WORDLIST_MAGIC
+
+    compiled_path = path
+    if not is_compiled:
+        compiled_path = path + COMPILED_SUFFIX
+        stale = (not os.path.exists(compiled_path) or
+                 os.path.getmtime(compiled_path) < os.path.getmtime(path))
+        if stale and not os.access(os.path.dirname(os.path.abspath(path)),
+                                   os.W_OK):
+            compiled_path = _cached_path(path)
+            stale = not os.path.exists(compiled_path)
+            os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        if stale:
+            compile_wordlist(path, compiled_path)
+
+    return _open_compiled(compiled_path, os.path.getmtime(compiled_path))
@@ -0,0 +1,71 @@
+"""
+Тесты для подбора параметров хэширования.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from passgen.calibrate import (
+    calibrate_pbkdf2,
+    calibrate_scrypt,
+    throughput,
+    update_env_file,
+    MIN_SCRYPT_LN
+)
+from passgen.kdf import Pbkdf2KDF, MAX_PBKDF2_ITERATIONS
+
+
+def _fake_measure(kdf, rounds=3):
+    """Время, пропорциональное стоимости KDF: 1 мкс на единицу."""
+    if isinstance(kdf, Pbkdf2KDF):
+        return kdf.iterations * 1e-6
+    return (1 << kdf.ln) * 1e-6
+
+
+class TestCalibrate(unittest.TestCase):
+    """Тесты для модуля calibrate."""
+
+    @patch('passgen.calibrate.measure', side_effect=_fake_measure)
+    def test_calibrate_pbkdf2(self, mock_measure):
+        """Тестирует подбор итераций PBKDF2 по линейной оценке."""
+        self.assertEqual(calibrate_pbkdf2(0.05).iterations, 50000)
+        self.assertEqual(calibrate_pbkdf2(0.0001).iterations, 10000)
+
+    @patch('passgen.calibrate.measure', side_effect=_fake_measure)
+    def test_calibrate_pbkdf2_capped(self, mock_measure):
+        """Тестирует ограничение итераций PBKDF2 сверху."""
+        kdf = calibrate_pbkdf2(1000)
+
+        self.assertEqual(kdf.iterations, MAX_PBKDF2_ITERATIONS)
+
+    @patch('passgen.calibrate.measure', side_effect=_fake_measure)
+    def test_calibrate_scrypt(self, mock_measure):
+        """Тестирует выбор наибольшего ln в пределах целевого времени."""
+        # 2 ** 15 мкс = 32.8 мс, 2 ** 16 мкс = 65.5 мс
+        self.assertEqual(calibrate_scrypt(0.05).ln, 15)
+        self.assertEqual(calibrate_scrypt(0.0001).ln, MIN_SCRYPT_LN)
+
+    def test_throughput(self):
+        """Тестирует замер пропускной способности."""
+        self.assertGreater(throughput(Pbkdf2KDF(1000), threads=2, count=4), 0)
+
+    def test_update_env_file(self):
+        """Тестирует обновление файла .env с сохранением других строк."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, '.env')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('DB_HOST=localhost\nPASSGEN_KDF=scrypt\n')
+
+            update_env_file(path, Pbkdf2KDF(120000).to_config())
+
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), [
+                    'DB_HOST=localhost',
+                    'PASSGEN_KDF=pbkdf2',
+                    'PASSGEN_PBKDF2_ITERATIONS=120000'
+                ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,9 @@
 Тесты для команд CLI.
 """
 
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from passgen.commands import (
@@ -9,8 +12,16 @@ from passgen.commands import (
     handle_find,
     handle_list,
     handle_verify,
-    handle_delete
+    handle_delete,
+    handle_stats,
+    handle_rehash_migrate,
+    handle_migrate,
+    handle_import,
+    handle_export,
+    handle_calibrate
 )
+from passgen.kdf import Pbkdf2KDF, MAX_PBKDF2_ITERATIONS
+from passgen.policy import get_policy
 
 
 class TestCommands(unittest.TestCase):
@@ -19,6 +30,47 @@ class TestCommands(unittest.TestCase):
     def setUp(self):
         """Настройка перед каждым тестом."""
         self.mock_args = MagicMock()
+        self.mock_args.length = 12
+        self.mock_args.uppercase = True
+        self.mock_args.digits = True
+        self.mock_args.special = True
+        self.mock_args.count = 1
+        self.mock_args.output = None
+        self.mock_args.output_format = 'lines'
+        self.mock_args.workers = 1
+        self.mock_args.min_lowercase = None
+        self.mock_args.min_uppercase = None
+        self.mock_args.min_digits = None
+        self.mock_args.min_special = None
+        self.mock_args.passphrase = False
+        self.mock_args.min_entropy = None
+        self.mock_args.score = False
+        self.mock_args.pronounceable = False
+        self.mock_args.backend = 'python'
+        self.mock_args.unique = False
+        self.mock_args.exact_limit = 1000000
+        self.mock_args.token = None
+        self.mock_args.alphabet = None
+        self.mock_args.lowercase_chars = None
+        self.mock_args.uppercase_chars = None
+        self.mock_args.digit_chars = None
+        self.mock_args.special_chars = None
+        self.mock_args.exclude_ambiguous = False
+        self.mock_args.pattern = None
+
+    @patch('passgen.commands.PasswordGenerator')
+    @patch('passgen.commands.print')
+    def test_handle_generate_invalid_count(self, mock_print, mock_generator):
+        """Тестирует ошибку при количестве паролей меньше 1."""
+        for count in (0, -5):
+            self.mock_args.count = count
+            handle_generate(self.mock_args)
+
+            mock_print.assert_called_with(
+                "Ошибка при генерации: Количество паролей должно быть не "
+                "менее 1"
+            )
+        mock_generator.return_value.generate_password.assert_not_called()
 
     @patch('passgen.commands.PasswordGenerator')
     @patch('passgen.commands.print')
@@ -44,7 +96,7 @@ class TestCommands(unittest.TestCase):
         # Проверяем вызовы
         mock_generator.assert_called_once()
         mock_gen_instance.generate_password.assert_called_once_with(
-            length=12, use_uppercase=True, use_digits=True, use_special=True
+            policy=get_policy(12, True, True, True)
         )
         mock_print.assert_called_with("Сгенерирован пароль: test_password_123")
 
@@ -82,26 +134,145 @@ class TestCommands(unittest.TestCase):
         )
         mock_print.assert_any_call("Пароль сохранен в базу данных (ID: 1)")
 
+    @patch('passgen.commands.PasswordGenerator')
+    @patch('passgen.commands.sys')
+    def test_handle_generate_count(self, mock_sys, mock_generator):
+        """Тестирует пакетную генерацию паролей в stdout."""
+        mock_gen_instance = mock_generator.return_value
+        mock_gen_instance.iter_batches.return_value = iter([
+            ["pass1", "pass2"]
+        ])
+
+        self.mock_args.count = 2
+        self.mock_args.length = 12
+        self.mock_args.uppercase = True
+        self.mock_args.digits = True
+        self.mock_args.special = True
+        self.mock_args.save = False
+
+        handle_generate(self.mock_args)
+
+        mock_gen_instance.iter_batches.assert_called_once_with(
+            2, policy=get_policy(12, True, True, True)
+        )
+        mock_sys.stdout.write.assert_called_once_with("pass1\npass2\n")
+
+    @patch('passgen.commands.PasswordGenerator')
+    @patch('passgen.commands.print')
+    def test_handle_generate_min_entropy(self, mock_print, mock_generator):
+        """Тестирует подбор длины по минимальной энтропии."""
+        mock_gen_instance = mock_generator.return_value
+        mock_gen_instance.generate_password.return_value = "test_password"
+
+        self.mock_args.save = False
+        self.mock_args.min_entropy = 80
+        self.mock_args.score = True
+
+        handle_generate(self.mock_args)
+
+        policy = mock_gen_instance.generate_password.call_args.kwargs['policy']
+        self.assertEqual(policy.length, 13)
+        mock_print.assert_any_call("Сгенерирован пароль: test_password")
+
+    @patch('passgen.commands.print')
+    def test_handle_generate_token_zero(self, mock_print):
+        """Тестирует что --token 0 отклоняется, а не дает обычный пароль."""
+        self.mock_args.token = 0
+        self.mock_args.encoding = 'hex'
+        self.mock_args.save = False
+
+        handle_generate(self.mock_args)
+
+        mock_print.assert_called_once_with(
+            "Ошибка при генерации: Ошибка при генерации токена: Длина "
+            "токена должна быть не менее 16 байт"
+        )
+
+    @patch('passgen.commands.PasswordGenerator')
+    @patch('passgen.commands.print')
+    def test_handle_generate_workers_special_mode(self,
+                                                  mock_print,
+                                                  mock_generator
+                                                  ):
+        """Тестирует отказ от --workers вне режима обычных паролей."""
+        self.mock_args.count = 2
+        self.mock_args.workers = 4
+        self.mock_args.save = False
+        self.mock_args.pattern = 'dddd'
+
+        handle_generate(self.mock_args)
+
+        mock_print.assert_called_once_with(
+            "--workers доступен только для обычных паролей"
+        )
+        mock_generator.return_value.iter_pattern_batches.assert_not_called()
+
+    @patch('passgen.commands.PasswordGenerator')
+    @patch('passgen.commands.print')
+    def test_handle_generate_pronounceable_min_entropy(self,
+                                                       mock_print,
+                                                       mock_generator
+                                                       ):
+        """Тестирует отказ от --min-entropy для произносимых паролей."""
+        self.mock_args.pronounceable = True
+        self.mock_args.min_entropy = 80
+        self.mock_args.save = False
+
+        handle_generate(self.mock_args)
+
+        mock_print.assert_called_once_with(
+            "--min-entropy недоступен для произносимых паролей"
+        )
+        mock_generator.return_value.generate_pronounceable.assert_not_called()
+
+    @patch('passgen.commands.print')
+    def test_handle_generate_output_file(self, mock_print):
+        """Тестирует потоковую запись паролей в файл."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'passwords.jsonl')
+
+            self.mock_args.count = 25
+            self.mock_args.length = 10
+            self.mock_args.uppercase = True
+            self.mock_args.digits = True
+            self.mock_args.special = False
+            self.mock_args.save = False
+            self.mock_args.output = path
+            self.mock_args.output_format = 'jsonl'
+
+            handle_generate(self.mock_args)
+
+            with open(path, encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f]
+
+        self.assertEqual(len(rows), 25)
+        self.assertTrue(all(len(row['password']) == 10 for row in rows))
+        mock_print.assert_called_with(f"Записано паролей: 25 в {path}")
+
     @patch('passgen.commands.PasswordStorage')
     @patch('passgen.commands.print')
     def test_handle_find_with_results(self, mock_print, mock_storage):
         """Тестирует поиск с результатами."""
         # Настраиваем моки
         mock_storage_instance = mock_storage.return_value
-        mock_storage_instance.find_passwords.return_value = [
+        mock_storage_instance.iter_passwords.return_value = iter([
             {
                 'service': 'gmail',
                 'username': 'user1',
                 'description': 'test description'
             }
-        ]
+        ])
 
         # Настраиваем аргументы
         self.mock_args.service = "gmail"
         self.mock_args.username = None
+        self.mock_args.match = 'prefix'
 
         # Вызываем функцию
         handle_find(self.mock_args)
+        mock_storage_instance.iter_passwords.assert_called_once_with(
+            "gmail", None, 'prefix'
+        )
 
         # Проверяем вывод
         mock_print.assert_any_call("Найдено записей: 1")
@@ -115,7 +286,7 @@ class TestCommands(unittest.TestCase):
         """Тестирует поиск без результатов."""
         # Настраиваем моки
         mock_storage_instance = mock_storage.return_value
-        mock_storage_instance.find_passwords.return_value = []
+        mock_storage_instance.iter_passwords.return_value = iter([])
 
         # Вызываем функцию
         handle_find(self.mock_args)
@@ -123,6 +294,34 @@ class TestCommands(unittest.TestCase):
         # Проверяем вывод
         mock_print.assert_called_with("Пароли не найдены")
 
+    @patch('passgen.commands.PasswordStorage')
+    @patch('passgen.commands.print')
+    def test_handle_export(self, mock_print, mock_storage):
+        """Тестирует выгрузку записей в файл JSONL."""
+        mock_storage.return_value.iter_passwords.return_value = iter([
+            {'id': 1, 'service': 'gmail', 'username': 'user1',
+             'description': ''},
+            {'id': 2, 'service': 'mail', 'username': 'user2',
+             'description': 'work'}
+        ])
+        self.mock_args.service = None
+        self.mock_args.username = None
+        self.mock_args.output_format = 'jsonl'
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.mock_args.output = os.path.join(tmpdir, 'accounts.jsonl')
+            handle_export(self.mock_args)
+
+            with open(self.mock_args.output, encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f]
+
+        self.assertEqual([row['username'] for row in rows],
+                         ['user1', 'user2'])
+        self.assertEqual(rows[1]['description'], 'work')
+        mock_print.assert_called_with(
+            f"Выгружено записей: 2 в {self.mock_args.output}"
+        )
+
     @patch('passgen.commands.handle_find')
     def test_handle_list(self, mock_handle_find):
         """Тестирует команду list."""
@@ -206,6 +405,115 @@ class TestCommands(unittest.TestCase):
         # Проверяем вывод
         mock_print.assert_called_with("Пароль для gmail/user1 не найден")
 
+    @patch('passgen.commands.PasswordStorage')
+    @patch('passgen.commands.print')
+    def test_handle_stats(self, mock_print, mock_storage):
+        """Тестирует вывод количества устаревших хэшей."""
+        mock_storage.return_value.count_outdated_hashes.return_value = (10, 3)
+
+        handle_stats(self.mock_args)
+
+        mock_print.assert_any_call("Всего записей: 10")
+        printed = ' '.join(str(call) for call in mock_print.call_args_list)
+        self.assertIn("устаревших параметрах: 3", printed)
+
+    @patch('passgen.commands.PasswordStorage')
+    @patch('passgen.commands.print')
+    def test_handle_rehash_migrate(self, mock_print, mock_storage):
+        """Тестирует вывод хода обхода устаревших хэшей."""
+        mock_queue = mock_storage.return_value.queue_outdated_hashes
+        mock_queue.return_value = iter([(100, 100, 7), (150, 50, 3)])
+        self.mock_args.batch_size = 100
+        self.mock_args.restart = False
+
+        handle_rehash_migrate(self.mock_args)
+
+        mock_queue.assert_called_once_with(batch_size=100, restart=False)
+        mock_print.assert_called_with(
+            "Обход завершен: просмотрено 150, поставлено в очередь 10"
+        )
+
+    @patch('passgen.commands.PasswordStorage')
+    @patch('passgen.commands.print')
+    def test_handle_import(self, mock_print, mock_storage):
+        """Тестирует импорт порциями с отчетом о дубликатах."""
+        mock_bulk = mock_storage.return_value.save_passwords_bulk
+        mock_bulk.side_effect = [[1, None], [3]]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'accounts.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('service,username,password\n'
+                        'a,u1,p1\nb,u2,p2\nc,u3,p3\n')
+            self.mock_args.file = path
+            self.mock_args.input_format = 'csv'
+            self.mock_args.batch_size = 2
+            self.mock_args.workers = None
+
+            handle_import(self.mock_args)
+
+        self.assertEqual(mock_bulk.call_count, 2)
+        first_chunk = list(mock_bulk.call_args_list[0].args[0])
+        self.assertEqual(first_chunk, [('a', 'u1', 'p1', ''),
+                                       ('b', 'u2', 'p2', '')])
+        mock_print.assert_any_call(
+            "Строка 3: запись b/u2 уже существует, пропущена"
+        )
+        mock_print.assert_called_with(
+            "Импортировано записей: 2, пропущено: 1"
+        )
+
+    @patch('passgen.commands.apply_migrations')
+    @patch('passgen.commands.get_db_connection')
+    @patch('passgen.commands.print')
+    def test_handle_migrate(self, mock_print, mock_conn, mock_apply):
+        """Тестирует вывод примененных миграций."""
+        mock_apply.return_value = [(1, 'Первая', None),
+                                   (2, 'Вторая', 'Нет расширения')]
+        self.mock_args.status = False
+
+        handle_migrate(self.mock_args)
+
+        mock_apply.assert_called_once_with(mock_conn.return_value)
+        mock_print.assert_any_call("Применена миграция 1: Первая")
+        mock_print.assert_any_call(
+            "Пропущена миграция 2: Вторая. Нет расширения"
+        )
+        mock_conn.return_value.close.assert_called_once()
+
+    @patch('passgen.commands.apply_migrations')
+    @patch('passgen.commands.get_db_connection')
+    @patch('passgen.commands.print')
+    def test_handle_migrate_up_to_date(self, mock_print, mock_conn,
+                                       mock_apply):
+        """Тестирует вывод при актуальной схеме."""
+        mock_apply.return_value = []
+        self.mock_args.status = False
+
+        handle_migrate(self.mock_args)
+
+        printed = ' '.join(str(call) for call in mock_print.call_args_list)
+        self.assertIn("Схема актуальна", printed)
+
+    @patch('passgen.commands.throughput', return_value=1.0)
+    @patch('passgen.commands.measure', return_value=1.0)
+    @patch('passgen.commands.print')
+    def test_handle_calibrate_capped(self, mock_print, mock_measure,
+                                     mock_throughput):
+        """Тестирует предупреждение о пределе итераций PBKDF2."""
+        args = MagicMock(target_ms=10 ** 7, kdf='pbkdf2', threads=1,
+                         write=False)
+        capped = Pbkdf2KDF(MAX_PBKDF2_ITERATIONS)
+
+        with patch.dict('passgen.commands.CALIBRATORS',
+                        {'pbkdf2': lambda target: capped}):
+            handle_calibrate(args)
+
+        mock_print.assert_any_call(
+            f"  Внимание: достигнут предел {MAX_PBKDF2_ITERATIONS} "
+            "итераций, целевое время не достигнуто"
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,9 +2,16 @@
 Тесты для модуля базы данных.
 """
 
+import threading
 import unittest
+from unittest.mock import patch
 import psycopg2
-from passgen.database import get_db_connection
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS
+)
+from passgen.database import ConnectionPool, get_db_connection
+from passgen.migrations import apply_migrations
 
 
 class TestDatabase(unittest.TestCase):
@@ -22,9 +29,10 @@ class TestDatabase(unittest.TestCase):
             self.fail(f"Неожиданная ошибка при подключении к БД: {e}")
 
     def test_table_creation(self):
-        """Тестирует создание таблицы при подключении."""
+        """Тестирует создание таблицы миграциями."""
         try:
             conn = get_db_connection()
+            apply_migrations(conn)
             cur = conn.cursor()
 
             # Проверяем что таблица существует
@@ -64,5 +72,123 @@ class TestDatabase(unittest.TestCase):
             self.fail(f"Неожиданная ошибка при проверке таблицы: {e}")
 
 
+class FakeCursor:
+    """Курсор-заглушка для проверки подключения."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query):
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection")
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Подключение-заглушка для тестов пула."""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Тесты для пула подключений без реальной базы данных."""
+
+    def setUp(self):
+        """Настройка перед каждым тестом."""
+        self.created = []
+
+        def connect():
+            conn = FakeConnection()
+            self.created.append(conn)
+            return conn
+
+        self.pool = ConnectionPool(minconn=1, maxconn=2, idle_timeout=60,
+                                   timeout=0.1, connect=connect)
+
+    def test_reuses_connections(self):
+        """Тестирует повторное использование возвращенного подключения."""
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+
+        self.assertIs(self.pool.getconn(), conn)
+        self.assertEqual(len(self.created), 1)
+
+    def test_max_size(self):
+        """Тестирует ожидание и ошибку при исчерпании пула."""
+        first = self.pool.getconn()
+        self.pool.getconn()
+        with self.assertRaises(Exception):
+            self.pool.getconn()
+
+        # Возврат подключения будит ожидающий поток
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(
+            self.pool.getconn()
+        ))
+        self.pool.timeout = 5
+        waiter.start()
+        self.pool.putconn(first)
+        waiter.join()
+        self.assertEqual(result, [first])
+        self.assertEqual(self.pool.stats()['size'], 2)
+
+    def test_rollback_on_return(self):
+        """Тестирует откат незавершенной транзакции при возврате."""
+        conn = self.pool.getconn()
+        conn.status = TRANSACTION_STATUS_INTRANS
+        self.pool.putconn(conn)
+
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertEqual(self.pool.stats()['idle'], 1)
+
+    def test_discards_closed_and_broken(self):
+        """Тестирует отбраковку закрытых и неотвечающих подключений."""
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+        conn.closed = 2
+        self.assertIsNot(self.pool.getconn(), conn)
+
+        stale = self.created[-1]
+        self.pool.putconn(stale)
+        stale.broken = True
+        with patch('passgen.database.HEALTH_CHECK_INTERVAL', 0):
+            fresh = self.pool.getconn()
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+        self.assertEqual(self.pool.stats(), {'size': 1, 'idle': 0,
+                                             'in_use': 1})
+
+    def test_idle_eviction(self):
+        """Тестирует закрытие лишних простаивающих подключений."""
+        first, second = self.pool.getconn(), self.pool.getconn()
+        self.pool.putconn(first)
+        self.pool.putconn(second)
+        self.pool.idle_timeout = 0
+
+        self.pool.getconn()
+        # Одно подключение закрыто по простою, минимум сохранен
+        self.assertTrue(first.closed)
+        self.assertEqual(self.pool.stats()['size'], 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,152 @@
+"""
+Тесты для отсева повторяющихся паролей.
+"""
+
+import unittest
+from unittest.mock import PropertyMock, patch
+from passgen.dedupe import (
+    BloomFilter,
+    ScalableBloomFilter,
+    DedupeFilter,
+    bloom_parameters,
+    collision_probability,
+    expected_duplicates
+)
+from passgen.generator import PasswordGenerator
+from passgen.parallel import iter_batches_parallel
+from passgen.policy import PasswordPolicy, get_policy
+
+
+class TestDedupe(unittest.TestCase):
+    """Тесты для модуля dedupe."""
+
+    def test_collision_probability(self):
+        """Тестирует оценку вероятности коллизии."""
+        self.assertEqual(collision_probability(1, 10), 0.0)
+        self.assertEqual(collision_probability(11, 10), 1.0)
+        self.assertAlmostEqual(collision_probability(23, 365), 0.5, places=1)
+        self.assertAlmostEqual(expected_duplicates(1000, 10 ** 6), 0.4995)
+
+    def test_bloom_parameters(self):
+        """Тестирует расчет размера фильтра Блума."""
+        bits, hashes = bloom_parameters(1000, 0.01)
+
+        self.assertAlmostEqual(bits / 1000, 9.585, places=2)
+        self.assertEqual(hashes, 7)
+
+    def test_bloom_filter_no_false_negatives(self):
+        """Тестирует что добавленные элементы всегда находятся."""
+        bloom = BloomFilter(1000, 0.001)
+        items = [f"item{i}" for i in range(1000)]
+
+        self.assertTrue(all(bloom.add(item) for item in items))
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertFalse(bloom.add("item5"))
+
+    def test_scalable_bloom_filter_grows(self):
+        """Тестирует добавление слоев при заполнении."""
+        bloom = ScalableBloomFilter(100, 0.001)
+        for i in range(1000):
+            bloom.add(f"item{i}")
+
+        self.assertGreater(len(bloom._filters), 1)
+        self.assertIn("item999", bloom)
+        self.assertFalse(bloom.add("item0"))
+
+    def test_scalable_bloom_filter_batch(self):
+        """Тестирует пакетный отсев: совпадает с add и растит слои."""
+        bloom = ScalableBloomFilter(100, 1e-9)
+        items = [f"item{i}" for i in range(1000)]
+
+        self.assertEqual(bloom.filter(items + ["item3"]), items)
+        self.assertGreater(len(bloom._filters), 1)
+        self.assertEqual(len(bloom), 1000)
+        self.assertEqual(bloom.filter(items), [])
+        self.assertFalse(bloom.add("item999"))
+
+    def test_dedupe_filter_capacity(self):
+        """Тестирует создание фильтра Блума сразу на ожидаемый объем."""
+        seen = DedupeFilter(exact_limit=10, capacity=1000)
+        seen.filter([f"p{i}" for i in range(1000)])
+
+        self.assertFalse(seen.is_exact)
+        self.assertEqual(len(seen._bloom._filters), 1)
+
+    def test_dedupe_filter_switches_to_bloom(self):
+        """Тестирует переход с точного множества на фильтр Блума."""
+        seen = DedupeFilter(exact_limit=10)
+        first = seen.filter([f"p{i}" for i in range(10)])
+
+        self.assertEqual(len(first), 10)
+        self.assertTrue(seen.is_exact)
+
+        seen.filter(["p10", "p11"])
+        self.assertFalse(seen.is_exact)
+        self.assertEqual(seen.filter(["p1", "p11", "p12"]), ["p12"])
+
+    def test_generate_batch_unique(self):
+        """Тестирует уникальность пакета в узком пространстве."""
+        policy = get_policy(4, False, False, False)
+        passwords = PasswordGenerator().generate_batch(20000,
+                                                       policy=policy,
+                                                       unique=True
+                                                       )
+
+        self.assertEqual(len(passwords), 20000)
+        self.assertEqual(len(set(passwords)), 20000)
+
+    def test_generate_batch_unique_exhausted(self):
+        """Тестирует ошибку, если пространство меньше запроса."""
+        policy = get_policy(4, False, False, False)
+        with self.assertRaises(Exception):
+            PasswordGenerator().generate_batch(26 ** 4 + 1,
+                                               policy=policy,
+                                               unique=True
+                                               )
+
+    def test_generate_batch_unique_exhausted_by_minimums(self):
+        """Тестирует учет минимумов по классам в размере пространства."""
+        policy = get_policy(4, use_special=False, min_uppercase=1,
+                            min_digits=1,
+                            char_sets={'lowercase': 'a', 'uppercase': 'B',
+                                       'digits': '1'})
+        generator = PasswordGenerator()
+
+        self.assertEqual(policy.space_size, 50)
+        self.assertEqual(len(set(generator.generate_batch(
+            50, policy=policy, unique=True
+        ))), 50)
+        with self.assertRaises(Exception):
+            generator.generate_batch(51, policy=policy, unique=True)
+
+    def test_generate_batch_unique_stalls(self):
+        """Тестирует остановку, если новые пароли перестали появляться."""
+        policy = get_policy(4, False, False, False,
+                            char_sets={'lowercase': 'ab'})
+        with patch.object(PasswordPolicy, 'space_size',
+                          new_callable=PropertyMock, return_value=100):
+            with self.assertRaises(ValueError):
+                list(PasswordGenerator().iter_batches(17,
+                                                      policy=policy,
+                                                      chunk_size=4,
+                                                      unique=True
+                                                      ))
+
+    def test_parallel_unique(self):
+        """Тестирует уникальность при генерации в процессах."""
+        policy = get_policy(4, False, False, False)
+        batches = iter_batches_parallel(5000,
+                                        workers=2,
+                                        policy=policy,
+                                        chunk_size=1000,
+                                        unique=True,
+                                        exact_limit=100
+                                        )
+        passwords = [password for batch in batches for password in batch]
+
+        self.assertEqual(len(passwords), 5000)
+        self.assertEqual(len(set(passwords)), 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
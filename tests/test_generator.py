@@ -4,7 +4,9 @@
 
 import unittest
 import string
-from passgen.generator import PasswordGenerator
+from passgen.generator import PasswordGenerator, compile_pattern
+from passgen.policy import get_policy
+from passgen.random_source import SeededRandomSource
 
 
 class TestPasswordGenerator(unittest.TestCase):
@@ -112,128 +114,146 @@ class TestPasswordGenerator(unittest.TestCase):
         # Пароли должны быть разными (из-за случайности)
         self.assertNotEqual(password1, password2)
 
-    def test_ensure_character_types_adds_missing_uppercase(self):
-        """Тестирует добавление заглавных букв если их нет."""
-        # Пароль без заглавных букв
-        original_password = "abc123!@#"
-        result = self.generator._ensure_character_types(
-            password=original_password,
-            use_uppercase=True,
-            use_digits=False,  # Цифры уже есть
-            use_special=False  # Спецсимволы уже есть
-        )
-
-        # Проверяем что добавилась хотя бы одна заглавная буква
-        has_uppercase = any(c in string.ascii_uppercase for c in result)
-        self.assertTrue(has_uppercase, "Должна быть добавлена заглавная буква")
-
-        # Длина не должна измениться
-        self.assertEqual(len(result), len(original_password))
-
-    def test_ensure_character_types_adds_missing_digits(self):
-        """Тестирует добавление цифр если их нет."""
-        # Пароль без цифр
-        original_password = "ABCdef!@#"
-        result = self.generator._ensure_character_types(
-            password=original_password,
-            use_uppercase=False,  # Заглавные уже есть
-            use_digits=True,
-            use_special=False     # Спецсимволы уже есть
-        )
-
-        # Проверяем что добавилась хотя бы одна цифра
-        has_digits = any(c in string.digits for c in result)
-        self.assertTrue(has_digits, "Должна быть добавлена цифра")
-        self.assertEqual(len(result), len(original_password))
-
-    def test_ensure_character_types_adds_missing_special(self):
-        """Тестирует добавление спецсимволов если их нет."""
-        # Пароль без спецсимволов
-        original_password = "ABCdef123"
-        result = self.generator._ensure_character_types(
-            password=original_password,
-            use_uppercase=False,  # Заглавные уже есть
-            use_digits=False,     # Цифры уже есть
-            use_special=True
-        )
-
-        # Проверяем что добавился хотя бы один спецсимвол
+    def test_generate_password_min_counts(self):
+        """Тестирует минимальное количество символов каждого класса."""
+        policy = get_policy(10, min_digits=3, min_special=2)
+
+        for _ in range(200):
+            password = self.generator.generate_password(policy=policy)
+            self.assertEqual(len(password), 10)
+            self.assertGreaterEqual(sum(c in string.digits
+                                        for c in password), 3)
+            self.assertGreaterEqual(sum(c in '!@#$%^&*()_+-=[]{}|;:,.<>?'
+                                        for c in password), 2)
+            self.assertGreaterEqual(sum(c in string.ascii_uppercase
+                                        for c in password), 1)
+
+    def test_generate_password_min_counts_fill_length(self):
+        """Тестирует политику, где минимумы занимают всю длину."""
+        policy = get_policy(4, min_lowercase=1)
+
+        password = self.generator.generate_password(policy=policy)
+        present = policy.class_table
+        classes = {present[ord(c)] for c in password}
+
+        self.assertEqual(classes, {0, 1, 2, 3})
+
+    def test_generate_batch_min_counts_shuffled(self):
+        """Тестирует что обязательные символы стоят на разных позициях."""
+        policy = get_policy(8, False, True, False, min_digits=1)
+        passwords = self.generator.generate_batch(500, policy=policy)
+
+        # Первая позиция не должна быть всегда цифрой
+        positions = {next(i for i, c in enumerate(password)
+                          if c in string.digits)
+                     for password in passwords}
+        self.assertGreater(len(positions), 1)
+        for password in passwords:
+            self.assertTrue(any(c in string.digits for c in password))
+
+    def test_generate_password_min_counts_too_large(self):
+        """Тестирует ошибку, если минимумы не помещаются в длину."""
+        with self.assertRaises(Exception):
+            self.generator.generate_password(
+                policy=get_policy(6, min_digits=4, min_special=4)
+            )
+
+    def test_generate_batch_count_and_length(self):
+        """Тестирует количество и длину паролей в пакете."""
+        passwords = self.generator.generate_batch(500, length=16)
+
+        self.assertEqual(len(passwords), 500)
+        for password in passwords:
+            self.assertEqual(len(password), 16)
+
+    def test_generate_batch_character_types(self):
+        """Тестирует что каждый пароль пакета содержит выбранные типы."""
         special_chars = '!@#$%^&*()_+-=[]{}|;:,.<>?'
-        has_special = any(c in special_chars for c in result)
-        self.assertTrue(has_special, "Должен быть добавлен спецсимвол")
-        self.assertEqual(len(result), len(original_password))
-
-    def test_ensure_character_types_preserves_good_password(self):
-        """Тестирует что хороший пароль не изменяется."""
-        # Пароль уже содержит все типы символов
-        good_password = "Abc123!@#"
-        result = self.generator._ensure_character_types(
-            password=good_password,
-            use_uppercase=True,
-            use_digits=True,
-            use_special=True
-        )
+        passwords = self.generator.generate_batch(200, length=6)
 
-        # Пароль не должен измениться
-        self.assertEqual(result, good_password)
+        for password in passwords:
+            self.assertTrue(any(c in string.ascii_uppercase for c in password))
+            self.assertTrue(any(c in string.digits for c in password))
+            self.assertTrue(any(c in special_chars for c in password))
 
-    def test_ensure_character_types_adds_multiple_missing_types(self):
-        """Тестирует добавление нескольких отсутствующих типов символов."""
-        # Пароль только из строчных букв
-        original_password = "abcdefghjk"
-        result = self.generator._ensure_character_types(
-            password=original_password,
-            use_uppercase=True,
-            use_digits=True,
-            use_special=True
-        )
-
-        # Проверяем что добавились все недостающие типы
-        has_uppercase = any(c in string.ascii_uppercase for c in result)
-        has_digits = any(c in string.digits for c in result)
-        has_special = any(c in '!@#$%^&*()_+-=[]{}|;:,.<>?' for c in result)
-
-        self.assertTrue(has_uppercase, "Должны быть заглавные буквы")
-        self.assertTrue(has_digits, "Должны быть цифры")
-        self.assertTrue(has_special, "Должны быть спецсимволы")
-        self.assertEqual(len(result), len(original_password))
-
-    def test_ensure_character_types_disabled_types(self):
-        """Тестирует что отключенные типы символов не добавляются."""
-        # Пароль только из строчных букв
-        original_password = "abcdefgh"
-        result = self.generator._ensure_character_types(
-            password=original_password,
-            use_uppercase=False,  # Отключены
-            use_digits=False,     # Отключены
-            use_special=False     # Отключены
-        )
-
-        # Пароль не должен измениться
-        self.assertEqual(result, original_password)
-
-        # Проверяем что нет лишних символов
-        has_only_lowercase = all(c in string.ascii_lowercase for c in result)
-        self.assertTrue(has_only_lowercase)
-
-    def test_ensure_character_types_edge_case_single_character(self):
-        """Тестирует обработку пароля из одного символа."""
-        original_password = "a"
-        result = self.generator._ensure_character_types(
-            password=original_password,
-            use_uppercase=True,
-            use_digits=True,
-            use_special=True
+    def test_generate_batch_only_lowercase(self):
+        """Тестирует пакет только из строчных букв."""
+        passwords = self.generator.generate_batch(
+            100,
+            length=10,
+            use_uppercase=False,
+            use_digits=False,
+            use_special=False
         )
 
-        # Должен остаться один символ, но теперь это может быть любой тип
-        self.assertEqual(len(result), 1)
-        self.assertIn(result[0],
-                      string.ascii_lowercase +
-                      string.ascii_uppercase +
-                      string.digits +
-                      '!@#$%^&*()_+-=[]{}|;:,.<>?'
-                      )
+        for password in passwords:
+            self.assertTrue(all(c in string.ascii_lowercase
+                                for c in password))
+
+    def test_generate_with_policy(self):
+        """Тестирует генерацию по готовой политике."""
+        policy = get_policy(9, use_special=False)
+
+        password = self.generator.generate_password(policy=policy)
+        passwords = self.generator.generate_batch(50, policy=policy)
+
+        self.assertEqual(len(password), 9)
+        for item in passwords + [password]:
+            self.assertTrue(all(c in policy.alphabet for c in item))
+
+    def test_generate_batch_seeded_source(self):
+        """Тестирует воспроизводимость при детерминированном источнике."""
+        first = PasswordGenerator(source=SeededRandomSource(42))
+        second = PasswordGenerator(source=SeededRandomSource(42))
+
+        self.assertEqual(first.generate_batch(20), second.generate_batch(20))
+
+    def test_generate_batch_invalid_count(self):
+        """Тестирует ошибку при некорректном количестве паролей."""
+        with self.assertRaises(Exception):
+            self.generator.generate_batch(0)
+
+    def test_compile_pattern(self):
+        """Тестирует разбор шаблона в план."""
+        plan = compile_pattern('Cvcc-dddd-s{2}')
+
+        self.assertEqual([count for _, count in plan], [1, 1, 2, 1, 4, 1, 2])
+        self.assertEqual(plan[3], ('-', 1))
+        self.assertEqual(plan[4], (string.digits, 4))
+        self.assertIs(compile_pattern('Cvcc-dddd-s{2}'), plan)
+        # Экранированный заполнитель выводится как есть
+        self.assertEqual(compile_pattern('\\dddd')[0], ('d', 1))
+
+    def test_compile_pattern_invalid(self):
+        """Тестирует ошибки разбора шаблона."""
+        for pattern in ('d{x}', 'd{2', 'dd\\', 'd{101}', 'dd', 'a b'):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(ValueError):
+                    compile_pattern(pattern)
+
+    def test_generate_from_pattern(self):
+        """Тестирует генерацию по шаблону."""
+        generator = PasswordGenerator(source=SeededRandomSource(11))
+        consonants = set(string.ascii_lowercase) - set('aeiouy')
+
+        for batch in generator.iter_pattern_batches(30, 'Cvcc-dddd',
+                                                    chunk_size=7):
+            for password in batch:
+                self.assertEqual(len(password), 9)
+                self.assertTrue(password[0].isupper())
+                self.assertIn(password[1], 'aeiouy')
+                self.assertTrue(set(password[2:4]) <= consonants)
+                self.assertEqual(password[4], '-')
+                self.assertTrue(password[5:].isdigit())
+
+    def test_generate_from_pattern_ambiguous(self):
+        """Тестирует шаблон без похожих символов."""
+        generator = PasswordGenerator(exclude_ambiguous=True)
+        password = generator.generate_from_pattern('d{100}')
+
+        self.assertFalse(set(password) & set('01'))
+        with self.assertRaises(Exception):
+            generator.generate_from_pattern('d{2}')
 
 
 if __name__ == '__main__':
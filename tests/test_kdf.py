@@ -0,0 +1,86 @@
+"""
+Тесты для функций формирования ключа.
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+from passgen.kdf import (
+    Pbkdf2KDF,
+    ScryptKDF,
+    get_kdf,
+    needs_rehash,
+    parse_hash
+)
+from passgen.utils import hash_password, verify_password
+
+
+class TestKDF(unittest.TestCase):
+    """Тесты для модуля kdf."""
+
+    def test_pbkdf2_format(self):
+        """Тестирует формат хэша PBKDF2."""
+        hashed = Pbkdf2KDF(1000).hash('secret')
+        kdf, salt, digest = parse_hash(hashed)
+
+        self.assertTrue(hashed.startswith('$pbkdf2-sha256$i=1000$'))
+        self.assertNotIn('=', hashed.split('$', 3)[3])
+        self.assertEqual(kdf, Pbkdf2KDF(1000))
+        self.assertEqual((len(salt), len(digest)), (16, 32))
+
+    def test_scrypt_roundtrip(self):
+        """Тестирует хэширование и проверку через scrypt."""
+        hashed = hash_password('secret', ScryptKDF(ln=10, r=8, p=1))
+
+        self.assertTrue(hashed.startswith('$scrypt$ln=10,r=8,p=1$'))
+        self.assertTrue(verify_password('secret', hashed))
+        self.assertFalse(verify_password('Secret', hashed))
+
+    def test_pbkdf2_sha512_roundtrip(self):
+        """Тестирует PBKDF2 с SHA-512."""
+        hashed = hash_password('secret', Pbkdf2KDF(1000, 'sha512'))
+
+        self.assertTrue(hashed.startswith('$pbkdf2-sha512$'))
+        self.assertTrue(verify_password('secret', hashed))
+
+    def test_get_kdf_from_config(self):
+        """Тестирует выбор алгоритма и параметров из окружения."""
+        config = {'PASSGEN_KDF': 'scrypt', 'PASSGEN_SCRYPT_LN': '12'}
+        with patch.dict(os.environ, config):
+            self.assertEqual(get_kdf(), ScryptKDF(ln=12))
+        with patch.dict(os.environ, {'PASSGEN_PBKDF2_ITERATIONS': '5000'}):
+            self.assertEqual(get_kdf('pbkdf2'), Pbkdf2KDF(5000))
+        with self.assertRaises(ValueError):
+            get_kdf('md5')
+
+    def test_parse_hash_invalid(self):
+        """Тестирует отказ для поврежденных и опасных хэшей."""
+        invalid = (
+            '$pbkdf2-sha256$i=1000$c2FsdA',
+            '$md5$i=1$c2FsdA$aGFzaA',
+            '$pbkdf2-sha256$n=1000$c2FsdA$aGFzaA',
+            '$pbkdf2-sha256$i=1000$$aGFzaA',
+            '$pbkdf2-sha256$i=1000$!!!$aGFzaA',
+            '$pbkdf2-sha256$i=999999999999$c2FsdA$aGFzaA',
+            '$scrypt$ln=40,r=8,p=1$c2FsdA$aGFzaA',
+        )
+        for encoded in invalid:
+            with self.subTest(encoded=encoded):
+                with self.assertRaises(ValueError):
+                    parse_hash(encoded)
+                self.assertFalse(verify_password('secret', encoded))
+
+    def test_needs_rehash(self):
+        """Тестирует определение устаревших хэшей."""
+        current = Pbkdf2KDF(2000)
+
+        self.assertFalse(needs_rehash(current.hash('secret'), current))
+        self.assertTrue(needs_rehash(Pbkdf2KDF(1000).hash('secret'),
+                                     current))
+        self.assertTrue(needs_rehash(ScryptKDF(ln=10).hash('secret'),
+                                     current))
+        self.assertTrue(needs_rehash('c2FsdA==$aGFzaA==', current))
+
+
+if __name__ == '__main__':
+    unittest.main()
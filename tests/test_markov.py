@@ -0,0 +1,93 @@
+"""
+Тесты для произносимых паролей.
+"""
+
+import os
+import string
+import tempfile
+import unittest
+from unittest.mock import patch
+from passgen.generator import PasswordGenerator
+from passgen.markov import MarkovModel, load_markov_model, START, END
+from passgen.policy import get_policy
+from passgen.random_source import SeededRandomSource
+
+
+class TestMarkov(unittest.TestCase):
+    """Тесты для модуля markov."""
+
+    def setUp(self):
+        """Настройка перед каждым тестом."""
+        self.generator = PasswordGenerator(source=SeededRandomSource(5))
+
+    def test_train_cumulative_tables(self):
+        """Тестирует накопленные частоты переходов."""
+        model = MarkovModel.train(['abc', 'abd', 'abd'])
+
+        self.assertEqual(model.transitions[START * 2], ('a', [3]))
+        self.assertEqual(model.transitions['ab'], ('cd', [1, 3]))
+        self.assertEqual(model.transitions['bd'], (END, [2]))
+
+    def test_generate_length(self):
+        """Тестирует длину строки с переходом через конец слова."""
+        model = MarkovModel.train(['ab'])
+        self.assertEqual(model.generate(7, SeededRandomSource(1)), 'abababa')
+
+    def test_json_roundtrip(self):
+        """Тестирует сохранение модели в JSON."""
+        model = MarkovModel.train(['hello', 'help'])
+        restored = MarkovModel.from_json(model.to_json())
+
+        self.assertEqual(restored.transitions, model.transitions)
+
+    def test_load_markov_model_disk_cache(self):
+        """Тестирует создание кэша модели на диске."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {'PASSGEN_CACHE_DIR': tmpdir}):
+                model = load_markov_model('alpha beta gamma')
+                files = os.listdir(tmpdir)
+                load_markov_model.cache_clear()
+                cached = load_markov_model('alpha beta gamma')
+
+        self.assertEqual(len(files), 1)
+        self.assertEqual(cached.transitions, model.transitions)
+
+    def test_generate_pronounceable_policy(self):
+        """Тестирует соблюдение флагов и минимумов политики."""
+        policy = get_policy(14, min_digits=2, min_special=1)
+
+        for _ in range(50):
+            password = self.generator.generate_pronounceable(policy=policy)
+            self.assertEqual(len(password), 14)
+            self.assertGreaterEqual(sum(c in string.digits
+                                        for c in password), 2)
+            self.assertTrue(any(c in string.ascii_uppercase
+                                for c in password))
+            self.assertTrue(password[:11].isalpha())
+
+    def test_generate_pronounceable_lowercase_only(self):
+        """Тестирует произносимый пароль только из строчных букв."""
+        password = self.generator.generate_pronounceable(
+            10, use_uppercase=False, use_digits=False, use_special=False
+        )
+
+        self.assertEqual(len(password), 10)
+        self.assertTrue(all(c in string.ascii_lowercase for c in password))
+
+    def test_generate_pronounceable_rejects_custom_sets(self):
+        """Тестирует отказ при своих наборах и исключении похожих."""
+        generators = (PasswordGenerator(exclude_ambiguous=True),
+                      PasswordGenerator(char_sets={'digits': '01'}))
+        for generator in generators:
+            with self.assertRaises(ValueError):
+                generator.generate_pronounceable(12)
+            with self.assertRaises(ValueError):
+                next(generator.iter_pronounceable_batches(5))
+
+        policy = get_policy(12, exclude_ambiguous=True)
+        with self.assertRaises(ValueError):
+            self.generator.generate_pronounceable(policy=policy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Тесты для миграций схемы базы данных.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import passgen.migrations as migrations
+from passgen.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    apply_migrations,
+    check_schema_version
+)
+
+
+class TestMigrations(unittest.TestCase):
+    """Тесты для модуля migrations."""
+
+    def setUp(self):
+        """Сбрасывает кэш проверки версии."""
+        migrations._checked = False
+        self.conn = MagicMock()
+        self.cur = self.conn.cursor.return_value
+
+    def tearDown(self):
+        """Сбрасывает кэш проверки версии."""
+        migrations._checked = False
+
+    def _recorded_versions(self):
+        """Возвращает версии, записанные в schema_version."""
+        return [call.args[1][0]
+                for call in self.cur.execute.call_args_list
+                if 'INSERT INTO schema_version' in call.args[0]]
+
+    def _skipped_flags(self):
+        """Возвращает отметки skipped, записанные в schema_version."""
+        return [call.args[1][2]
+                for call in self.cur.execute.call_args_list
+                if 'INSERT INTO schema_version' in call.args[0]]
+
+    def test_versions_in_order(self):
+        """Тестирует, что версии миграций идут по порядку без пропусков."""
+        versions = [number for number, _, _, _ in MIGRATIONS]
+        self.assertEqual(versions, list(range(1, len(MIGRATIONS) + 1)))
+        self.assertEqual(LATEST_VERSION, versions[-1])
+
+    @patch('passgen.migrations.current_version', return_value=0)
+    def test_apply_all(self, _):
+        """Тестирует применение всех миграций на пустой базе."""
+        applied = apply_migrations(self.conn)
+
+        self.assertEqual([number for number, _, _ in applied],
+                         [number for number, _, _, _ in MIGRATIONS])
+        self.assertEqual(self._recorded_versions(),
+                         [number for number, _, _, _ in MIGRATIONS])
+
+    @patch('passgen.migrations.current_version', return_value=1)
+    def test_skip_applied(self, _):
+        """Тестирует пропуск уже примененных миграций."""
+        applied = apply_migrations(self.conn)
+
+        self.assertNotIn(1, [number for number, _, _ in applied])
+        self.assertEqual(self._recorded_versions(),
+                         list(range(2, LATEST_VERSION + 1)))
+
+    @patch('passgen.migrations.current_version', return_value=LATEST_VERSION)
+    def test_lock_released(self, _):
+        """Тестирует снятие блокировки после миграций."""
+        apply_migrations(self.conn)
+
+        last_query = self.cur.execute.call_args_list[-1].args[0]
+        self.assertIn('pg_advisory_unlock', last_query)
+
+    @patch('passgen.migrations.current_version', return_value=2)
+    def test_concurrent_index_outside_transaction(self, _):
+        """Тестирует построение индексов без транзакции (CONCURRENTLY)."""
+        modes = []
+        self.cur.fetchone.return_value = (1,)
+        self.cur.execute.side_effect = (
+            lambda query, *args: modes.append((query, self.conn.autocommit))
+        )
+        self.conn.autocommit = False
+
+        apply_migrations(self.conn)
+
+        concurrent = [autocommit for query, autocommit in modes
+                      if 'CREATE INDEX CONCURRENTLY' in query]
+        self.assertEqual(concurrent, [True, True])
+        self.assertFalse(self.conn.autocommit)
+
+    @patch('passgen.migrations.current_version', return_value=2)
+    def test_trgm_extension_unavailable(self, _):
+        """Тестирует пропуск триграммной миграции без pg_trgm."""
+        self.cur.fetchone.return_value = None
+
+        applied = apply_migrations(self.conn)
+
+        self.assertEqual(len(applied), 1)
+        number, _, reason = applied[0]
+        self.assertEqual(number, 3)
+        self.assertIn("pg_trgm недоступно", reason)
+        self.assertEqual(self._recorded_versions(), [3])
+        self.assertEqual(self._skipped_flags(), [True])
+        queries = [call.args[0] for call in self.cur.execute.call_args_list]
+        self.assertFalse(any('CREATE INDEX' in query for query in queries))
+        self.assertFalse(self.conn.autocommit)
+
+    @patch('passgen.migrations.current_version', return_value=3)
+    def test_retry_skipped(self, _):
+        """Тестирует повтор пропущенной миграции при следующем запуске."""
+        self.cur.fetchall.return_value = [(3,)]
+        self.cur.fetchone.return_value = (1,)
+
+        applied = apply_migrations(self.conn)
+
+        self.assertEqual(applied, [(3, MIGRATIONS[2][1], None)])
+        self.assertEqual(self._skipped_flags(), [False])
+
+    @patch('passgen.migrations.current_version', return_value=0)
+    def test_check_schema_version_outdated(self, _):
+        """Тестирует ошибку при устаревшей схеме."""
+        with self.assertRaises(Exception) as context:
+            check_schema_version(self.conn)
+
+        self.assertIn("migrate", str(context.exception))
+        self.assertFalse(migrations._checked)
+
+    @patch('passgen.migrations.current_version', return_value=LATEST_VERSION)
+    def test_check_schema_version_cached(self, mock_version):
+        """Тестирует, что версия проверяется один раз на процесс."""
+        check_schema_version(self.conn)
+        check_schema_version(self.conn)
+
+        mock_version.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
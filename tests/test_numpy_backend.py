@@ -0,0 +1,81 @@
+"""
+Тесты для векторизованной генерации на NumPy.
+"""
+
+import string
+import unittest
+from unittest.mock import patch
+from passgen import numpy_backend
+from passgen.generator import PasswordGenerator
+from passgen.policy import get_policy
+from passgen.random_source import SeededRandomSource
+
+
+@unittest.skipUnless(numpy_backend.is_available(), "NumPy не установлен")
+class TestNumpyBackend(unittest.TestCase):
+    """Тесты для модуля numpy_backend."""
+
+    def setUp(self):
+        """Настройка перед каждым тестом."""
+        self.generator = PasswordGenerator(source=SeededRandomSource(3),
+                                           backend='numpy'
+                                           )
+
+    def test_generate_batch_count_and_alphabet(self):
+        """Тестирует количество, длину и алфавит паролей."""
+        policy = get_policy(16)
+        passwords = self.generator.generate_batch(1000, policy=policy)
+
+        self.assertEqual(len(passwords), 1000)
+        for password in passwords:
+            self.assertEqual(len(password), 16)
+            self.assertTrue(all(c in policy.alphabet for c in password))
+
+    def test_generate_batch_min_counts(self):
+        """Тестирует соблюдение минимумов по классам."""
+        policy = get_policy(10, min_digits=3, min_special=2)
+        passwords = self.generator.generate_batch(500, policy=policy)
+
+        for password in passwords:
+            self.assertTrue(policy.is_satisfied(password.encode('ascii')))
+
+    def test_generate_batch_shuffled(self):
+        """Тестирует что обязательные символы перемешаны."""
+        policy = get_policy(8, False, True, False)
+        passwords = self.generator.generate_batch(500, policy=policy)
+
+        positions = {next(i for i, c in enumerate(password)
+                          if c in string.digits)
+                     for password in passwords}
+        self.assertGreater(len(positions), 1)
+
+    def test_generate_batch_without_required_classes(self):
+        """Тестирует политику без обязательных классов."""
+        policy = get_policy(12, False, False, False)
+        passwords = self.generator.generate_batch(100, policy=policy)
+
+        for password in passwords:
+            self.assertTrue(all(c in string.ascii_lowercase
+                                for c in password))
+
+
+class TestNumpyFallback(unittest.TestCase):
+    """Тесты для выбора реализации генерации."""
+
+    def test_fallback_without_numpy(self):
+        """Тестирует переход на Python, если NumPy не установлен."""
+        with patch('passgen.generator.numpy_backend.is_available',
+                   return_value=False):
+            generator = PasswordGenerator(backend='numpy')
+
+        self.assertEqual(generator.backend, 'python')
+        self.assertEqual(len(generator.generate_batch(5)), 5)
+
+    def test_unknown_backend(self):
+        """Тестирует ошибку для неизвестной реализации."""
+        with self.assertRaises(ValueError):
+            PasswordGenerator(backend='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
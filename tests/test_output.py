@@ -0,0 +1,62 @@
+"""
+Тесты для модуля записи паролей.
+"""
+
+import csv
+import io
+import json
+import unittest
+from passgen.output import write_passwords
+
+
+class TestOutput(unittest.TestCase):
+    """Тесты для модуля output."""
+
+    def setUp(self):
+        """Настройка перед каждым тестом."""
+        self.batches = [['abc', 'd,e'], ['f"g']]
+
+    def test_write_lines(self):
+        """Тестирует запись паролей построчно."""
+        stream = io.StringIO()
+        written = write_passwords(stream, self.batches)
+
+        self.assertEqual(written, 3)
+        self.assertEqual(stream.getvalue(), 'abc\nd,e\nf"g\n')
+
+    def test_write_csv(self):
+        """Тестирует запись паролей в CSV с экранированием."""
+        stream = io.StringIO()
+        written = write_passwords(stream, self.batches, fmt='csv')
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(written, 3)
+        self.assertEqual(rows, [['password'], ['abc'], ['d,e'], ['f"g']])
+
+    def test_write_jsonl(self):
+        """Тестирует запись паролей в JSONL."""
+        stream = io.StringIO()
+        write_passwords(stream, self.batches, fmt='jsonl')
+
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([row['password'] for row in rows],
+                         ['abc', 'd,e', 'f"g'])
+
+    def test_write_with_scores(self):
+        """Тестирует запись паролей с оценкой надежности."""
+        stream = io.StringIO()
+        write_passwords(stream, [['qwerty', 'xK#9mP2!vL']],
+                        fmt='jsonl', with_scores=True)
+
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(set(rows[0]), {'password', 'entropy', 'score'})
+        self.assertLess(rows[0]['score'], rows[1]['score'])
+
+    def test_write_unknown_format(self):
+        """Тестирует ошибку при неизвестном формате."""
+        with self.assertRaises(ValueError):
+            write_passwords(io.StringIO(), self.batches, fmt='xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Тесты для параллельной генерации паролей.
+"""
+
+import string
+import unittest
+from passgen.parallel import iter_batches_parallel
+
+
+class TestParallel(unittest.TestCase):
+    """Тесты для модуля parallel."""
+
+    def test_iter_batches_parallel_count(self):
+        """Тестирует количество и порядок размеров порций."""
+        batches = list(iter_batches_parallel(2500,
+                                             workers=2,
+                                             length=10,
+                                             chunk_size=1000
+                                             ))
+
+        self.assertEqual([len(batch) for batch in batches], [1000, 1000, 500])
+        for batch in batches:
+            for password in batch:
+                self.assertEqual(len(password), 10)
+
+    def test_iter_batches_parallel_options(self):
+        """Тестирует передачу параметров генерации в процессы."""
+        batches = iter_batches_parallel(100,
+                                        workers=2,
+                                        use_uppercase=False,
+                                        use_digits=False,
+                                        use_special=False
+                                        )
+
+        for batch in batches:
+            for password in batch:
+                self.assertTrue(all(c in string.ascii_lowercase
+                                    for c in password))
+
+    def test_iter_batches_parallel_invalid_length(self):
+        """Тестирует ошибку при некорректной длине."""
+        with self.assertRaises(Exception):
+            list(iter_batches_parallel(10, workers=2, length=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
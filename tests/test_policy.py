@@ -0,0 +1,170 @@
+"""
+Тесты для политик генерации паролей.
+"""
+
+import pickle
+import unittest
+from passgen.policy import (
+    PasswordPolicy,
+    get_policy,
+    get_policy_for_entropy,
+    compile_alphabet,
+    AMBIGUOUS_CHARS,
+    NO_CLASS
+)
+from passgen.generator import PasswordGenerator
+from passgen.random_source import SeededRandomSource
+
+
+class TestPasswordPolicy(unittest.TestCase):
+    """Тесты для модуля policy."""
+
+    def test_get_policy_memoized(self):
+        """Тестирует что одинаковые политики берутся из кэша."""
+        self.assertIs(get_policy(16), get_policy(length=16))
+        self.assertIs(get_policy(16, use_digits=1), get_policy(16))
+        self.assertIsNot(get_policy(16), get_policy(16, use_special=False))
+
+    def test_alphabet(self):
+        """Тестирует сборку алфавита из выбранных классов."""
+        policy = get_policy(8, use_uppercase=False, use_special=False)
+
+        self.assertEqual(policy.alphabet,
+                         'abcdefghijklmnopqrstuvwxyz0123456789')
+        self.assertEqual(len(policy.classes), 2)
+
+    def test_class_table(self):
+        """Тестирует таблицу классов символов."""
+        policy = get_policy(12)
+
+        self.assertEqual(policy.class_table[ord('a')], 0)
+        self.assertEqual(policy.class_table[ord('Z')], 1)
+        self.assertEqual(policy.class_table[ord('5')], 2)
+        self.assertEqual(policy.class_table[ord('!')], 3)
+        self.assertEqual(policy.class_table[ord(' ')], NO_CLASS)
+
+    def test_rejection_threshold(self):
+        """Тестирует порог отбраковки для равномерного распределения."""
+        policy = get_policy(12)
+        size = len(policy.alphabet)
+
+        self.assertEqual(policy.limit % size, 0)
+        self.assertLess(256 - policy.limit, size)
+        self.assertEqual(len(policy.rejected), 256 - policy.limit)
+
+    def test_is_satisfied(self):
+        """Тестирует проверку обязательных классов."""
+        policy = get_policy(8)
+
+        self.assertTrue(policy.is_satisfied(b'aB3!aaaa'))
+        self.assertFalse(policy.is_satisfied(b'aB3aaaaa'))
+        self.assertTrue(get_policy(8, False, False, False)
+                        .is_satisfied(b'aaaaaaaa'))
+
+    def test_min_counts(self):
+        """Тестирует минимумы по классам и свободные позиции."""
+        policy = get_policy(12, min_digits=3, min_special=2)
+
+        self.assertEqual(policy.min_counts, (0, 1, 3, 2))
+        self.assertEqual(policy.free_count, 6)
+        self.assertTrue(policy.is_satisfied(b'aB123!!aaaaa'))
+        self.assertFalse(policy.is_satisfied(b'aB12!!!aaaaa'))
+
+    def test_min_counts_validation(self):
+        """Тестирует ошибки при некорректных минимумах."""
+        with self.assertRaises(ValueError):
+            PasswordPolicy(8, use_digits=False, min_digits=2)
+        with self.assertRaises(ValueError):
+            PasswordPolicy(8, min_uppercase=5, min_digits=4)
+        with self.assertRaises(ValueError):
+            PasswordPolicy(8, min_special=-1)
+
+    def test_shuffle_tables(self):
+        """Тестирует таблицы индексов для перемешивания."""
+        policy = get_policy(10)
+
+        self.assertEqual(len(policy.shuffle_tables), 10)
+        for i, (table, rejected) in enumerate(policy.shuffle_tables):
+            allowed = table[:256 - len(rejected)]
+            self.assertEqual(set(allowed), set(range(i + 1)))
+
+    def test_get_policy_for_entropy(self):
+        """Тестирует подбор длины политики по энтропии."""
+        policy = get_policy_for_entropy(80)
+        lowercase = get_policy_for_entropy(
+            40, False, False, False, min_lowercase=12
+        )
+
+        self.assertEqual(policy.length, 13)
+        self.assertIs(policy, get_policy(13))
+        self.assertEqual(lowercase.length, 12)
+
+    def test_invalid_length(self):
+        """Тестирует ошибку при некорректной длине."""
+        with self.assertRaises(ValueError):
+            PasswordPolicy(length=3)
+
+    def test_pickle_uses_cache(self):
+        """Тестирует что при десериализации политика берется из кэша."""
+        policy = get_policy(20)
+        self.assertIs(pickle.loads(pickle.dumps(policy)), policy)
+
+        custom = get_policy(20, alphabet='abcdef0123')
+        self.assertIs(pickle.loads(pickle.dumps(custom)), custom)
+
+    def test_compile_alphabet(self):
+        """Тестирует проверку и очистку набора символов."""
+        self.assertEqual(compile_alphabet('abca'), 'abc')
+        self.assertEqual(compile_alphabet('a0O1lIb', True), 'ab')
+        for chars in ('', 'ab c', 'ab\n', 'абв', '0O1lI'):
+            with self.assertRaises(ValueError):
+                compile_alphabet(chars, exclude_ambiguous=True)
+
+    def test_custom_alphabet(self):
+        """Тестирует собственный алфавит размера, не равного 2**n."""
+        policy = get_policy(16, alphabet='0123456789')
+
+        self.assertEqual(policy.classes, (('custom', '0123456789'),))
+        self.assertEqual(policy.min_counts, (0,))
+        self.assertEqual(policy.limit, 250)
+        self.assertIs(policy, get_policy(16, False, alphabet='0123456789'))
+        with self.assertRaises(ValueError):
+            get_policy(16, alphabet='0123456789', min_digits=2)
+
+    def test_exclude_ambiguous(self):
+        """Тестирует исключение похожих символов."""
+        policy = get_policy(12, exclude_ambiguous=True)
+
+        for char in AMBIGUOUS_CHARS:
+            self.assertNotIn(char, policy.alphabet)
+            self.assertEqual(policy.class_table[ord(char)], NO_CLASS)
+        self.assertEqual(len(policy.alphabet), 88 - len(AMBIGUOUS_CHARS))
+
+    def test_custom_char_sets(self):
+        """Тестирует замену наборов отдельных классов."""
+        policy = get_policy(12, char_sets={'special': '#$%'},
+                            min_special=4)
+        generator = PasswordGenerator(source=SeededRandomSource(3))
+
+        for password in generator.generate_batch(50, policy=policy):
+            self.assertGreaterEqual(sum(c in '#$%' for c in password), 4)
+            self.assertFalse(set(password) & set('!@^&*'))
+        with self.assertRaises(ValueError):
+            get_policy(12, char_sets={'special': '#a'})
+        with self.assertRaises(ValueError):
+            get_policy(12, char_sets={'symbols': '#'})
+
+    def test_generator_char_sets(self):
+        """Тестирует наборы символов, заданные в генераторе."""
+        generator = PasswordGenerator(source=SeededRandomSource(5),
+                                      char_sets={'digits': '2345'},
+                                      exclude_ambiguous=True)
+
+        password = generator.generate_password(40)
+        self.assertFalse(set(password) & set(AMBIGUOUS_CHARS + '016789'))
+        with self.assertRaises(ValueError):
+            PasswordGenerator(char_sets={'digits': ''})
+
+
+if __name__ == '__main__':
+    unittest.main()
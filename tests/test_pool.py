@@ -0,0 +1,122 @@
+"""
+Тесты для пула готовых паролей.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from passgen.policy import get_policy
+from passgen.pool import PasswordPool
+
+
+class TestPasswordPool(unittest.TestCase):
+    """Тесты для модуля pool."""
+
+    def setUp(self):
+        """Настройка перед каждым тестом."""
+        self.pool = PasswordPool(capacity=200, low_water=50)
+
+    def tearDown(self):
+        """Останавливает пул после каждого теста."""
+        self.pool.close()
+
+    def wait_for_refill(self, policy, size):
+        """Ждет, пока очередь политики не заполнится до size."""
+        deadline = time.monotonic() + 5
+        while len(self.pool._buffers.get(policy, ())) < size:
+            if time.monotonic() > deadline:
+                self.fail("Пул не пополнился за 5 секунд")
+            time.sleep(0.01)
+
+    def test_get_returns_policy_password(self):
+        """Тестирует выдачу пароля по политике."""
+        policy = get_policy(20, min_digits=3)
+        password = self.pool.get(policy)
+
+        self.assertEqual(len(password), 20)
+        self.assertTrue(policy.is_satisfied(password.encode('ascii')))
+
+    def test_warm_and_hit_rate(self):
+        """Тестирует выдачу из заполненной очереди."""
+        policy = get_policy(12)
+        self.pool.warm(policy)
+
+        for _ in range(100):
+            self.pool.get(policy)
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['hits'], 100)
+        self.assertEqual(stats['hit_rate'], 1.0)
+
+    def test_background_refill(self):
+        """Тестирует пополнение после опускания ниже порога."""
+        policy = get_policy(12)
+        self.pool.warm(policy)
+
+        for _ in range(160):
+            self.pool.get(policy)
+        self.wait_for_refill(policy, 200)
+
+        self.assertGreaterEqual(self.pool.stats()['refills'], 1)
+
+    def test_passwords_issued_once(self):
+        """Тестирует что пароли не повторяются при выдаче из потоков."""
+        policy = get_policy(16)
+        self.pool.warm(policy)
+        issued = []
+        lock = threading.Lock()
+
+        def worker():
+            local = [self.pool.get(policy) for _ in range(250)]
+            with lock:
+                issued.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(issued), 1000)
+        self.assertEqual(len(set(issued)), 1000)
+
+    def test_refill_error_is_raised(self):
+        """Тестирует выдачу ошибки фонового пополнения вызывающему."""
+        policy = get_policy(12)
+        with patch.object(self.pool, '_fill',
+                          side_effect=ValueError("сбой генерации")):
+            self.pool.get(policy)
+            deadline = time.monotonic() + 5
+            while (self.pool._requested
+                   or not self.pool.stats()['refill_errors']):
+                if time.monotonic() > deadline:
+                    self.fail("Ошибка пополнения не записана за 5 секунд")
+                time.sleep(0.01)
+
+            stats = self.pool.stats()
+            self.assertIn("сбой генерации", stats['last_refill_error'])
+            with self.assertRaises(Exception):
+                self.pool.get(policy)
+
+        # Поток пополнения жив: следующий запрос снова заполняет очередь
+        self.pool.get(policy)
+        self.wait_for_refill(policy, 200)
+        self.assertGreaterEqual(self.pool.stats()['refills'], 1)
+
+    def test_closed_pool(self):
+        """Тестирует ошибку при выдаче из закрытого пула."""
+        self.pool.close()
+        with self.assertRaises(Exception):
+            self.pool.get()
+
+    def test_invalid_parameters(self):
+        """Тестирует ошибки при некорректных параметрах пула."""
+        with self.assertRaises(ValueError):
+            PasswordPool(capacity=0)
+        with self.assertRaises(ValueError):
+            PasswordPool(capacity=10, low_water=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Тесты для источников случайных данных.
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+from passgen.random_source import SystemRandomSource, SeededRandomSource
+
+
+class TestRandomSource(unittest.TestCase):
+    """Тесты для модуля random_source."""
+
+    def test_read_buffered(self):
+        """Тестирует что байты читаются из os.urandom блоками."""
+        source = SystemRandomSource(buffer_size=1024)
+
+        with patch('passgen.random_source.os.urandom',
+                   side_effect=os.urandom) as mock_urandom:
+            chunks = [source.read(10) for _ in range(100)]
+
+        self.assertEqual(mock_urandom.call_count, 1)
+        self.assertTrue(all(len(chunk) == 10 for chunk in chunks))
+
+    def test_read_larger_than_buffer(self):
+        """Тестирует чтение блока больше размера буфера."""
+        source = SystemRandomSource(buffer_size=16)
+        self.assertEqual(len(source.read(100)), 100)
+
+    def test_seeded_deterministic(self):
+        """Тестирует воспроизводимость детерминированного источника."""
+        first = SeededRandomSource(7)
+        second = SeededRandomSource(7)
+
+        self.assertEqual(first.read(100), second.read(100))
+        self.assertNotEqual(SeededRandomSource(8).read(100),
+                            SeededRandomSource(7).read(100))
+
+    def test_sample_uses_only_accepted_bytes(self):
+        """Тестирует отбраковку байт за порогом."""
+        table = bytes(b % 3 for b in range(256))
+        rejected = bytes(range(255, 256))
+        chars = SeededRandomSource(1).sample(3000, table, rejected)
+
+        self.assertEqual(len(chars), 3000)
+        self.assertEqual(set(chars), {0, 1, 2})
+
+    def test_randbelow_range(self):
+        """Тестирует диапазон randbelow."""
+        source = SeededRandomSource(3)
+
+        values = {source.randbelow(5) for _ in range(500)}
+        self.assertEqual(values, {0, 1, 2, 3, 4})
+        self.assertLess(source.randbelow(10 ** 6), 10 ** 6)
+        self.assertEqual(source.randbelow(1), 0)
+
+    def test_randbelow_invalid(self):
+        """Тестирует ошибку при некорректной границе."""
+        with self.assertRaises(ValueError):
+            SeededRandomSource(0).randbelow(0)
+
+    def test_system_source_resets_after_fork(self):
+        """Тестирует сброс буфера при смене процесса."""
+        source = SystemRandomSource()
+        source.read(1)
+
+        with patch('passgen.random_source.os.getpid', return_value=-1):
+            source.read(1)
+
+        self.assertEqual(source._pid, -1)
+        self.assertEqual(source._offset, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Тесты для модуля чтения записей.
+"""
+
+import csv
+import io
+import json
+import unittest
+from passgen.records import iter_record_chunks, write_records
+
+
+class TestRecords(unittest.TestCase):
+    """Тесты для модуля records."""
+
+    def test_csv_chunks(self):
+        """Тестирует чтение CSV порциями с номерами строк."""
+        stream = io.StringIO(
+            'service,username,password,description\n'
+            'a,u1,p1,\n'
+            'b,u2,"p,2",desc\n'
+            'c,u3,p3,\n'
+        )
+        chunks = list(iter_record_chunks(stream, 'csv', chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(chunks[0][1], (3, 'b', 'u2', 'p,2', 'desc'))
+        self.assertEqual(chunks[1][0], (4, 'c', 'u3', 'p3', ''))
+
+    def test_csv_without_description(self):
+        """Тестирует CSV без необязательного поля description."""
+        stream = io.StringIO('service,username,password\na,u,p\n')
+        chunks = list(iter_record_chunks(stream, 'csv'))
+
+        self.assertEqual(chunks, [[(2, 'a', 'u', 'p', '')]])
+
+    def test_csv_missing_column(self):
+        """Тестирует ошибку при отсутствии обязательной колонки."""
+        stream = io.StringIO('service,username\na,u\n')
+        with self.assertRaises(ValueError):
+            list(iter_record_chunks(stream, 'csv'))
+
+    def test_jsonl(self):
+        """Тестирует чтение JSONL с пропуском пустых строк."""
+        lines = [json.dumps({'service': 'a', 'username': 'u',
+                             'password': 'p', 'description': 'd'}),
+                 '',
+                 json.dumps({'service': 'b', 'username': 'v',
+                             'password': 'q'})]
+        stream = io.StringIO('\n'.join(lines) + '\n')
+        chunks = list(iter_record_chunks(stream, 'jsonl'))
+
+        self.assertEqual(chunks, [[(1, 'a', 'u', 'p', 'd'),
+                                   (3, 'b', 'v', 'q', '')]])
+
+    def test_invalid_record_reports_line(self):
+        """Тестирует номер строки в ошибке некорректной записи."""
+        stream = io.StringIO('{"service": "a", "username": "u", '
+                             '"password": "p"}\n{"service": "b"}\n')
+        with self.assertRaises(ValueError) as context:
+            list(iter_record_chunks(stream, 'jsonl'))
+
+        self.assertIn("Строка 2", str(context.exception))
+
+    def test_non_string_field(self):
+        """Тестирует отказ для нестрокового значения поля."""
+        stream = io.StringIO('{"service": "a", "username": "u", '
+                             '"password": 12345}\n')
+        with self.assertRaises(ValueError) as context:
+            list(iter_record_chunks(stream, 'jsonl'))
+
+        self.assertEqual(str(context.exception),
+                         "Строка 1: поле password должно быть строкой")
+
+    def test_too_long_field(self):
+        """Тестирует отказ для сервиса длиннее VARCHAR(255)."""
+        stream = io.StringIO('service,username,password\n'
+                             f'{"s" * 256},u,p\n'
+                             f'{"s" * 255},u,p\n')
+        with self.assertRaises(ValueError) as context:
+            list(iter_record_chunks(stream, 'csv'))
+
+        self.assertEqual(str(context.exception),
+                         "Строка 2: поле service длиннее 255 символов")
+
+    def test_invalid_format(self):
+        """Тестирует ошибку для неизвестного формата."""
+        with self.assertRaises(ValueError):
+            list(iter_record_chunks(io.StringIO(''), 'xml'))
+
+    def test_write_csv(self):
+        """Тестирует выгрузку записей в CSV с экранированием."""
+        stream = io.StringIO()
+        written = write_records(stream, iter([
+            {'id': 1, 'service': 'a,b', 'username': 'u',
+             'description': 'd"e'}
+        ]))
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(written, 1)
+        self.assertEqual(rows, [['id', 'service', 'username', 'description'],
+                                ['1', 'a,b', 'u', 'd"e']])
+
+    def test_write_jsonl_unicode(self):
+        """Тестирует выгрузку записей в JSONL без экранирования кириллицы."""
+        stream = io.StringIO()
+        write_records(stream, [{'id': 1, 'service': 'почта',
+                                'username': 'u', 'description': ''}],
+                      fmt='jsonl')
+
+        self.assertIn('почта', stream.getvalue())
+        self.assertEqual(json.loads(stream.getvalue())['service'], 'почта')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,14 +2,33 @@
 Тесты для хранилища паролей.
 """
 
+import os
 import unittest
-from passgen.storage import PasswordStorage
+from unittest.mock import MagicMock, patch
+import psycopg2
+from passgen.database import get_db_connection
+from passgen.kdf import get_kdf
+from passgen.migrations import apply_migrations
+from passgen.storage import (
+    PasswordStorage,
+    ROTATION_REASON,
+    _match_condition
+)
 from passgen.utils import verify_password
 
 
 class TestPasswordStorage(unittest.TestCase):
     """Тесты для хранилища паролей."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Применяет миграции схемы перед тестами."""
+        conn = get_db_connection()
+        try:
+            apply_migrations(conn)
+        finally:
+            conn.close()
+
     def setUp(self):
         """Настройка перед каждым тестом."""
         self.storage = PasswordStorage()
@@ -57,6 +76,26 @@ class TestPasswordStorage(unittest.TestCase):
 
         self.assertIn("уже существует", str(context.exception))
 
+    def test_save_passwords_bulk(self):
+        """Тестирует массовое сохранение с отчетом о дубликатах."""
+        self.storage.save_password(self.test_service, self.test_username,
+                                   self.test_password)
+        try:
+            ids = self.storage.save_passwords_bulk([
+                (self.test_service, self.test_username, 'other', ''),
+                (self.test_service, 'bulk_user', 'bulk_pass', 'bulk'),
+                (self.test_service, 'bulk_user', 'again', ''),
+            ])
+
+            self.assertIsNone(ids[0])
+            self.assertIsInstance(ids[1], int)
+            self.assertIsNone(ids[2])
+            self.assertTrue(self.storage.verify_password(
+                self.test_service, 'bulk_user', 'bulk_pass'
+            ))
+        finally:
+            self.storage.delete_password(self.test_service, 'bulk_user')
+
     def test_find_passwords_by_service(self):
         """Тестирует поиск по сервису."""
         # Сохраняем тестовые данные
@@ -90,6 +129,39 @@ class TestPasswordStorage(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['username'], self.test_username)
 
+    def test_iter_passwords_batches(self):
+        """Тестирует потоковое чтение порциями меньше числа записей."""
+        self.storage.save_passwords_bulk([
+            (self.test_service, f"iter_user_{i}", 'pass', '')
+            for i in range(5)
+        ])
+        try:
+            found = list(self.storage.iter_passwords(
+                self.test_service, 'iter_user_', batch_size=2
+            ))
+            self.assertEqual([item['username'] for item in found],
+                             [f"iter_user_{i}" for i in range(5)])
+        finally:
+            for i in range(5):
+                self.storage.delete_password(self.test_service,
+                                             f"iter_user_{i}")
+
+    def test_find_passwords_match_modes(self):
+        """Тестирует точный поиск и поиск по началу строки."""
+        self.storage.save_password(self.test_service, self.test_username,
+                                   self.test_password)
+
+        exact = self.storage.find_passwords(self.test_service,
+                                            self.test_username, 'exact')
+        prefix = self.storage.find_passwords('test_serv', match='prefix')
+        missed = self.storage.find_passwords('est_serv', match='prefix')
+
+        self.assertEqual(len(exact), 1)
+        self.assertIn(self.test_username,
+                      [item['username'] for item in prefix])
+        self.assertNotIn(self.test_username,
+                         [item['username'] for item in missed])
+
     def test_find_passwords_no_results(self):
         """Тестирует поиск когда нет результатов."""
         results = self.storage.find_passwords(service="non_existent_service")
@@ -137,6 +209,22 @@ class TestPasswordStorage(unittest.TestCase):
 
         self.assertFalse(is_valid)
 
+    def test_verify_passwords_bulk(self):
+        """Тестирует пакетную проверку паролей."""
+        self.storage.save_password(
+            self.test_service,
+            self.test_username,
+            self.test_password
+        )
+
+        results = self.storage.verify_passwords([
+            (self.test_service, self.test_username, self.test_password),
+            (self.test_service, self.test_username, "wrong_password"),
+            ("nonexistent_service", "nonexistent_user", "any_password"),
+        ])
+
+        self.assertEqual(results, [True, False, False])
+
     def test_delete_password(self):
         """Тестирует удаление пароля."""
         # Сначала сохраняем
@@ -253,6 +341,149 @@ class TestPasswordStorage(unittest.TestCase):
         cur.close()
         conn.close()
 
+    def _stored_hash(self):
+        """Возвращает сохраненный хэш тестовой записи."""
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT password_hash FROM passwords
+            WHERE service = %s AND username = %s
+            """,
+            (self.test_service, self.test_username)
+        )
+        stored_hash = cur.fetchone()[0]
+        cur.close()
+        conn.close()
+        return stored_hash
+
+    def test_verify_password_rehashes_outdated(self):
+        """Тестирует обновление устаревшего хэша при успешной проверке."""
+        with patch.dict(os.environ, {'PASSGEN_PBKDF2_ITERATIONS': '1000'}):
+            self.storage.save_password(
+                self.test_service,
+                self.test_username,
+                self.test_password
+            )
+        old_hash = self._stored_hash()
+        total, outdated = self.storage.count_outdated_hashes()
+        self.assertGreaterEqual(outdated, 1)
+
+        # Неверный пароль не должен обновлять хэш
+        self.assertFalse(self.storage.verify_password(
+            self.test_service, self.test_username, "wrong_password"
+        ))
+        self.assertEqual(self._stored_hash(), old_hash)
+
+        self.assertTrue(self.storage.verify_password(
+            self.test_service, self.test_username, self.test_password
+        ))
+        new_hash = self._stored_hash()
+        self.assertTrue(new_hash.startswith(get_kdf().prefix))
+        self.assertTrue(verify_password(self.test_password, new_hash))
+        self.assertEqual(self.storage.count_outdated_hashes(),
+                         (total, outdated - 1))
+
+    def test_queue_outdated_hashes(self):
+        """Тестирует постановку устаревших хэшей в очередь и продолжение."""
+        with patch.dict(os.environ, {'PASSGEN_PBKDF2_ITERATIONS': '1000'}):
+            record_id = self.storage.save_password(
+                self.test_service,
+                self.test_username,
+                self.test_password
+            )
+
+        progress = list(self.storage.queue_outdated_hashes(batch_size=2,
+                                                           restart=True))
+        self.assertTrue(progress)
+        self.assertGreaterEqual(sum(queued for _, _, queued in progress), 1)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT reason FROM rotation_queue WHERE password_id = %s",
+                    (record_id,))
+        self.assertEqual(cur.fetchone()[0], 'outdated_hash')
+        cur.close()
+        conn.close()
+
+        # Повторный запуск продолжает с контрольной точки
+        self.assertEqual(list(self.storage.queue_outdated_hashes()), [])
+
+    def test_rehash_removes_from_rotation_queue(self):
+        """Тестирует снятие записи с очереди при обновлении хэша."""
+        with patch.dict(os.environ, {'PASSGEN_PBKDF2_ITERATIONS': '1000'}):
+            record_id = self.storage.save_password(
+                self.test_service,
+                self.test_username,
+                self.test_password
+            )
+        list(self.storage.queue_outdated_hashes(restart=True))
+
+        self.assertTrue(self.storage.verify_password(
+            self.test_service, self.test_username, self.test_password
+        ))
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM rotation_queue WHERE password_id = %s",
+                    (record_id,))
+        self.assertIsNone(cur.fetchone())
+        cur.close()
+        conn.close()
+
+
+class TestUpgradeHash(unittest.TestCase):
+    """Тесты обновления хэша без подключения к базе."""
+
+    def test_upgrade_clears_rotation_queue_in_same_transaction(self):
+        """Тестирует, что обновление хэша и снятие с очереди - один запрос."""
+        conn = MagicMock()
+        cur = conn.cursor.return_value
+
+        PasswordStorage()._upgrade_hash(conn, cur, 'svc', 'user',
+                                        'old', 'new')
+
+        cur.execute.assert_called_once()
+        query, params = cur.execute.call_args.args
+        self.assertIn("UPDATE passwords", query)
+        self.assertIn("DELETE FROM rotation_queue", query)
+        self.assertEqual(params,
+                         ('new', 'svc', 'user', 'old', ROTATION_REASON))
+        conn.commit.assert_called_once()
+
+    def test_upgrade_error_rolls_back(self):
+        """Тестирует откат при ошибке обновления."""
+        conn = MagicMock()
+        cur = conn.cursor.return_value
+        cur.execute.side_effect = psycopg2.Error("conflict")
+
+        PasswordStorage()._upgrade_hash(conn, cur, 'svc', 'user',
+                                        'old', 'new')
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+
+class TestMatchCondition(unittest.TestCase):
+    """Тесты для условий поиска."""
+
+    def test_exact(self):
+        """Тестирует условие точного совпадения."""
+        self.assertEqual(_match_condition('service', 'gmail', 'exact'),
+                         (" AND service = %s", 'gmail'))
+
+    def test_prefix_escapes_wildcards(self):
+        """Тестирует экранирование % и _ при поиске по началу строки."""
+        condition, param = _match_condition('service', 'a_b%', 'prefix')
+
+        self.assertIn("LIKE", condition)
+        self.assertEqual(param, 'a\\_b\\%%')
+
+    def test_substring(self):
+        """Тестирует условие поиска по подстроке."""
+        self.assertEqual(_match_condition('username', 'user', 'substring'),
+                         (" AND username ILIKE %s", '%user%'))
+
 
 if __name__ == '__main__':
     unittest.main()
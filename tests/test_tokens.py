@@ -0,0 +1,94 @@
+"""
+Тесты для секретных токенов.
+"""
+
+import base64
+import binascii
+import unittest
+from passgen.generator import PasswordGenerator
+from passgen.random_source import SeededRandomSource
+from passgen.tokens import encode_token, encode_tokens, z85encode
+
+
+class TestTokens(unittest.TestCase):
+    """Тесты для модуля tokens и генерации токенов."""
+
+    def setUp(self):
+        """Настройка перед каждым тестом."""
+        self.generator = PasswordGenerator(source=SeededRandomSource(7))
+
+    def test_z85_reference_vector(self):
+        """Тестирует Z85 на примере из спецификации ZeroMQ."""
+        data = bytes([0x86, 0x4F, 0xD2, 0x6F, 0xB5, 0x59, 0xF7, 0x5B])
+        self.assertEqual(z85encode(data), b'HelloWorld')
+
+    def test_z85_requires_multiple_of_four(self):
+        """Тестирует отказ Z85 для длины, не кратной 4."""
+        with self.assertRaises(ValueError):
+            z85encode(b'abc')
+
+    def test_encode_token_roundtrip(self):
+        """Тестирует обратимость кодировок без дополнения."""
+        data = bytes(range(23))
+        self.assertEqual(bytes.fromhex(encode_token(data, 'hex')), data)
+
+        token = encode_token(data, 'base64url')
+        self.assertNotIn('=', token)
+        padded = token + '=' * (-len(token) % 4)
+        self.assertEqual(base64.urlsafe_b64decode(padded), data)
+
+        token = encode_token(data, 'base32')
+        self.assertNotIn('=', token)
+        padded = token + '=' * (-len(token) % 8)
+        self.assertEqual(base64.b32decode(padded), data)
+
+    def test_encode_token_unknown_encoding(self):
+        """Тестирует ошибку для неизвестной кодировки."""
+        with self.assertRaises(ValueError):
+            encode_token(b'0000', 'base58')
+
+    def test_encode_tokens_matches_single(self):
+        """Тестирует совпадение блочного и поштучного кодирования."""
+        data = bytes(range(240))
+        for nbytes in (16, 20, 24, 30):
+            for encoding in ('hex', 'base32', 'base64url', 'z85'):
+                if encoding == 'z85' and nbytes % 4:
+                    continue
+                expected = [encode_token(data[i:i + nbytes], encoding)
+                            for i in range(0, len(data), nbytes)]
+                self.assertEqual(encode_tokens(data, nbytes, encoding),
+                                 expected)
+
+    def test_generate_token_length(self):
+        """Тестирует длину токена в разных кодировках."""
+        self.assertEqual(len(self.generator.generate_token(32, 'hex')), 64)
+        self.assertEqual(
+            len(self.generator.generate_token(32, 'base64url')), 43
+        )
+        self.assertEqual(len(self.generator.generate_token(20, 'base32')), 32)
+        self.assertEqual(len(self.generator.generate_token(256, 'z85')), 320)
+
+    def test_generate_token_invalid_length(self):
+        """Тестирует пределы длины токена."""
+        with self.assertRaises(Exception):
+            self.generator.generate_token(8)
+        with self.assertRaises(Exception):
+            self.generator.generate_token(65537)
+        with self.assertRaises(Exception):
+            self.generator.generate_token(18, 'z85')
+
+    def test_iter_token_batches(self):
+        """Тестирует порционную генерацию токенов."""
+        batches = list(self.generator.iter_token_batches(25,
+                                                         nbytes=16,
+                                                         encoding='hex',
+                                                         chunk_size=10
+                                                         ))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        for batch in batches:
+            for token in batch:
+                self.assertEqual(len(binascii.unhexlify(token)), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,18 @@
 """
 
 import unittest
-from passgen.utils import validate_length, hash_password, verify_password
+from passgen.utils import (
+    validate_length,
+    validate_token_length,
+    hash_password,
+    verify_password,
+    estimate_entropy,
+    min_length_for_entropy,
+    score_passwords,
+    hash_many,
+    verify_many
+)
+from passgen.kdf import Pbkdf2KDF
 
 
 class TestUtils(unittest.TestCase):
@@ -27,6 +38,15 @@ class TestUtils(unittest.TestCase):
             validate_length(101)
         self.assertIn("не должна превышать 100", str(context.exception))
 
+    def test_validate_token_length(self):
+        """Тестирует отдельный предел длины токенов."""
+        self.assertTrue(validate_token_length(16))
+        self.assertTrue(validate_token_length(65536))
+        with self.assertRaises(ValueError):
+            validate_token_length(15)
+        with self.assertRaises(ValueError):
+            validate_token_length(65537)
+
     def test_validate_length_edge_cases(self):
         """Тестирует граничные случаи длины."""
         # Минимальная допустимая длина
@@ -43,14 +63,22 @@ class TestUtils(unittest.TestCase):
         # Проверяем что хэш не равен исходному паролю
         self.assertNotEqual(hashed, password)
 
-        # Проверяем формат хэша (соль$хэш)
-        self.assertIn('$', hashed)
+        # Проверяем формат хэша ($алгоритм$параметры$соль$хэш)
+        self.assertTrue(hashed.startswith('$'))
         parts = hashed.split('$')
-        self.assertEqual(len(parts), 2)
+        self.assertEqual(len(parts), 5)
 
         # Проверяем что соль и хэш не пустые
-        self.assertTrue(len(parts[0]) > 0)  # соль
-        self.assertTrue(len(parts[1]) > 0)  # хэш
+        self.assertTrue(len(parts[3]) > 0)  # соль
+        self.assertTrue(len(parts[4]) > 0)  # хэш
+
+    def test_verify_password_legacy_format(self):
+        """Тестирует проверку хэша старого формата "salt$hash"."""
+        legacy = ('c2FsdHNhbHRzYWx0c2FsdA==$'
+                  'hXh7GC6nSircm0LsYdJeBRdPi9WQaQAw9zLNPxBdL8M=')
+
+        self.assertTrue(verify_password('password', legacy))
+        self.assertFalse(verify_password('wrong', legacy))
 
     def test_hash_password_different_results(self):
         """Тестирует что одинаковые пароли дают разные хэши из-за соли."""
@@ -127,6 +155,66 @@ class TestUtils(unittest.TestCase):
                 self.assertTrue(verify_password(password, hashed))
                 self.assertFalse(verify_password(password + "wrong", hashed))
 
+    def test_estimate_entropy(self):
+        """Тестирует оценку энтропии по длине и размеру алфавита."""
+        self.assertAlmostEqual(estimate_entropy(10, 32), 50.0)
+        self.assertEqual(estimate_entropy(10, 1), 0.0)
+
+    def test_min_length_for_entropy(self):
+        """Тестирует подбор минимальной длины."""
+        self.assertEqual(min_length_for_entropy(50, 32), 10)
+        self.assertEqual(min_length_for_entropy(51, 32), 11)
+        self.assertEqual(min_length_for_entropy(1, 32), 4)
+        with self.assertRaises(ValueError):
+            min_length_for_entropy(1000, 10)
+
+    def test_score_passwords_patterns(self):
+        """Тестирует поиск повторов, последовательностей и прогулок."""
+        weak, repeated, strong = score_passwords(['qwerty', 'aaab',
+                                                  'xK#9mP2!vL'])
+
+        self.assertEqual(weak['keyboard_walks'], 4)
+        self.assertEqual(weak['classes'], 1)
+        self.assertEqual(repeated['repeats'], 2)
+        self.assertEqual(score_passwords(['abc987'])[0]['sequences'], 2)
+        self.assertEqual(strong['classes'], 4)
+        self.assertEqual(strong['effective_entropy'], strong['entropy'])
+        self.assertLess(weak['score'], strong['score'])
+
+    def test_score_passwords_non_ascii(self):
+        """Тестирует учет символов вне ASCII."""
+        result = score_passwords(['пароль'])[0]
+
+        self.assertEqual(result['classes'], 1)
+        self.assertGreater(result['entropy'], 0)
+
+    def test_score_passwords_empty(self):
+        """Тестирует оценку пустого пароля и пустого пакета."""
+        self.assertEqual(score_passwords([]), [])
+        self.assertEqual(score_passwords([''])[0]['score'], 0)
+
+    def test_hash_many_order(self):
+        """Тестирует пакетное хэширование с сохранением порядка."""
+        passwords = [f"password_{i}" for i in range(12)]
+        kdf = Pbkdf2KDF(1000)
+
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                hashes = hash_many(passwords, workers=workers, kdf=kdf)
+                self.assertEqual(len(hashes), len(passwords))
+                for password, hashed in zip(passwords, hashes):
+                    self.assertTrue(verify_password(password, hashed))
+
+    def test_verify_many(self):
+        """Тестирует пакетную проверку с сохранением порядка."""
+        hashes = hash_many(['one', 'two'], kdf=Pbkdf2KDF(1000))
+        pairs = [('one', hashes[0]), ('one', hashes[1]),
+                 ('two', hashes[1]), ('two', None)]
+
+        self.assertEqual(verify_many(pairs, workers=3),
+                         [True, False, True, False])
+        self.assertEqual(verify_many([]), [])
+
 
 if __name__ == '__main__':
     unittest.main()
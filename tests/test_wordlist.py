@@ -0,0 +1,119 @@
+"""
+Тесты для словарей парольных фраз.
+"""
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+from passgen.generator import PasswordGenerator
+from passgen.random_source import SeededRandomSource
+from passgen.wordlist import (
+    compile_wordlist,
+    load_wordlist,
+    Wordlist,
+    COMPILED_SUFFIX
+)
+
+
+class TestWordlist(unittest.TestCase):
+    """Тесты для модуля wordlist."""
+
+    def setUp(self):
+        """Создает временный словарь в формате diceware."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'words.txt')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("11111\tabacus\n11112\tёлка\n\n11113\tzebra\n"
+                    "11114\tabacus\n")
+
+    def tearDown(self):
+        """Удаляет временные файлы."""
+        self.tmpdir.cleanup()
+
+    def test_compile_and_read(self):
+        """Тестирует компиляцию и чтение слов по номеру."""
+        compiled = compile_wordlist(self.path)
+        wordlist = Wordlist(compiled)
+
+        self.assertEqual(compiled, self.path + COMPILED_SUFFIX)
+        self.assertEqual(len(wordlist), 3)
+        self.assertEqual([wordlist[i] for i in range(3)],
+                         ['abacus', 'ёлка', 'zebra'])
+        with self.assertRaises(IndexError):
+            wordlist[3]
+        wordlist.close()
+
+    def test_load_wordlist_compiles_once(self):
+        """Тестирует что словарь компилируется рядом с исходником."""
+        first = load_wordlist(self.path)
+        second = load_wordlist(self.path)
+
+        self.assertTrue(os.path.exists(self.path + COMPILED_SUFFIX))
+        self.assertIs(first, second)
+
+    def test_load_wordlist_read_only_dir(self):
+        """Тестирует индекс в кэше для словаря в закрытом каталоге."""
+        read_only = os.path.join(self.tmpdir.name, 'dict')
+        cache = os.path.join(self.tmpdir.name, 'cache')
+        os.mkdir(read_only)
+        path = os.path.join(read_only, 'words.txt')
+        os.replace(self.path, path)
+        # root пишет в каталог независимо от прав, поэтому для него
+        # закрытый каталог имитируется через os.access
+        access = os.access if os.geteuid() else (lambda *args: False)
+
+        os.chmod(read_only, stat.S_IRUSR | stat.S_IXUSR)
+        try:
+            with patch.dict(os.environ, {'PASSGEN_CACHE_DIR': cache}), \
+                    patch('passgen.wordlist.os.access', side_effect=access):
+                wordlist = load_wordlist(path)
+        finally:
+            os.chmod(read_only, stat.S_IRWXU)
+
+        self.assertEqual(len(wordlist), 3)
+        self.assertEqual(os.path.dirname(wordlist.path), cache)
+        self.assertFalse(os.path.exists(path + COMPILED_SUFFIX))
+
+    def test_load_compiled_directly(self):
+        """Тестирует загрузку уже скомпилированного файла."""
+        compiled = compile_wordlist(self.path)
+        self.assertEqual(len(load_wordlist(compiled)), 3)
+
+    def test_invalid_wordlist(self):
+        """Тестирует ошибку для словаря из одного слова."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("single\n")
+        with self.assertRaises(ValueError):
+            compile_wordlist(self.path)
+
+    def test_generate_passphrase(self):
+        """Тестирует генерацию парольной фразы."""
+        generator = PasswordGenerator(source=SeededRandomSource(1))
+        phrase = generator.generate_passphrase(5, self.path, separator=' ')
+
+        words = phrase.split(' ')
+        self.assertEqual(len(words), 5)
+        self.assertTrue(set(words) <= {'abacus', 'ёлка', 'zebra'})
+
+    def test_generate_passphrase_invalid_words(self):
+        """Тестирует ошибку при некорректном количестве слов."""
+        generator = PasswordGenerator()
+        with self.assertRaises(Exception):
+            generator.generate_passphrase(1, self.path)
+        with self.assertRaises(Exception):
+            generator.generate_passphrase(6)
+
+    def test_iter_passphrase_batches(self):
+        """Тестирует генерацию фраз порциями."""
+        generator = PasswordGenerator()
+        batches = list(generator.iter_passphrase_batches(
+            5, words=3, wordlist=self.path, chunk_size=2
+        ))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()